@@ -0,0 +1,111 @@
+"""Проверка точности режима single (complex64) относительно double
+
+Одни и те же испытания (сигналы и шум сгенерированы в double) обрабатываются
+коррелятором в complex128 и в complex64, поэтому различия вызваны только
+точностью, а не разными случайными числами. Для каждой модуляции и SNR
+выводятся:
+
+    max_err  - максимальная абсолютная ошибка нормированной корреляции
+    flips    - доля испытаний, в которых решение об обнаружении изменилось
+    dp       - разность вероятностей обнаружения single - double
+
+Код завершения 1, если max_err или |dp| превышают допуски.
+
+    python benchmarks/precision.py [--n-runs 1000] [--max-error 1e-4] [--max-dp 0.005]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from processing.correlator import Correlator  # noqa: E402
+from processing.generator import MODULATION_NAMES, SignalGenerator, add_noise, shift_signal_batch  # noqa: E402
+from processing.sweep import snr_grid  # noqa: E402
+
+# Параметры исследования по умолчанию (как в режиме исследования)
+PARAMS = {"fd": 20.0, "f": 10.0, "n": 100, "vel": 10.0, "snr_static": 10.0, "sigSize": 30.0}
+
+# Испытаний в одном блоке
+BLOCK_SIZE = 100
+
+
+def compare_point(params, signal_type, snr2, n_runs, rng):
+    """Сравнение single и double на n_runs общих испытаниях одной точки"""
+    generator = SignalGenerator(params, signal_type, rng)
+    num_samples = generator.num_samples
+    shifted_size = int(params["sigSize"] / 100. * num_samples)
+    correlators = {dtype: Correlator(dtype=dtype) for dtype in (np.complex128, np.complex64)}
+
+    max_err = 0.
+    flips = 0
+    detections = {dtype: 0 for dtype in correlators}
+
+    for start in range(0, n_runs, BLOCK_SIZE):
+        n_trials = min(BLOCK_SIZE, n_runs - start)
+        first_signal = generator.generate_batch(n_trials)
+        dt = ((num_samples - shifted_size) * rng.random(n_trials)).astype(np.int64)
+        second_signal = shift_signal_batch(first_signal, shifted_size, dt)
+        first_signal = add_noise(first_signal, params["snr_static"], rng)
+        second_signal = add_noise(second_signal, snr2, rng)
+
+        corr = {}
+        detected = {}
+        for dtype, correlator in correlators.items():
+            corr[dtype] = correlator.find_correlation(first_signal, second_signal)
+            detected[dtype] = np.abs(np.argmax(corr[dtype], axis=-1) - dt) < generator.samples_per_bit
+            detections[dtype] += int(np.count_nonzero(detected[dtype]))
+
+        max_err = max(max_err, float(np.max(np.abs(corr[np.complex64] - corr[np.complex128]))))
+        flips += int(np.count_nonzero(detected[np.complex64] != detected[np.complex128]))
+
+    return {
+        "modulation": MODULATION_NAMES[signal_type],
+        "snr": float(snr2),
+        "max_err": max_err,
+        "flips": flips / n_runs,
+        "dp": (detections[np.complex64] - detections[np.complex128]) / n_runs,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-runs", type=int, default=1000, help="испытаний на точку")
+    parser.add_argument("--snr-min", type=float, default=-10.)
+    parser.add_argument("--snr-max", type=float, default=10.)
+    parser.add_argument("--n-points", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-error", type=float, default=1e-4, help="допуск ошибки корреляции")
+    parser.add_argument("--max-dp", type=float, default=0.005, help="допуск разности вероятностей")
+    parser.add_argument("--json", help="сохранить результаты в JSON")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    results = []
+    failed = False
+
+    print(f"{'точка':<12} {'max_err':>10} {'flips':>8} {'dp':>8}")
+    for snr2 in snr_grid(args.snr_min, args.snr_max, args.n_points):
+        for signal_type in MODULATION_NAMES:
+            result = compare_point(PARAMS, signal_type, snr2, args.n_runs, rng)
+            results.append(result)
+
+            bad = result["max_err"] > args.max_error or abs(result["dp"]) > args.max_dp
+            failed |= bad
+            print(f"{result['modulation']} {snr2:>+7.2f}   {result['max_err']:>10.2e} "
+                  f"{result['flips']:>8.4f} {result['dp']:>+8.4f}{'  ПРЕВЫШЕН ДОПУСК' if bad else ''}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"params": PARAMS, "n_runs": args.n_runs, "points": results}, file, indent=1)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Бенчмарк времени запуска точек входа
+
+Каждая точка входа импортируется в новом процессе интерпретатора с
+-X importtime; суммарное время импорта модулей верхнего уровня
+сравнивается с бюджетом. Код завершения 1 - бюджет превышен.
+
+    python benchmarks/startup.py [--repeat 7] [--json startup.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Точка входа -> (импортируемый код, бюджет времени импорта в мс)
+ENTRY_POINTS = {
+    "gui": ("import gui", 1200.),
+    "compute": ("import processing.cli", 400.),
+    "loader": ("import processing.fileio", 250.),
+}
+
+
+def import_time_ms(stderr):
+    """Суммарное время импорта модулей верхнего уровня из вывода -X importtime"""
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        parts = line.split("|")
+        if len(parts) != 3 or parts[2].startswith("  "):
+            continue  # заголовок или вложенный импорт
+
+        try:
+            total_us += int(parts[1])
+        except ValueError:
+            continue
+
+    return total_us / 1000.
+
+
+def measure(code, repeat):
+    """Время импорта и полное время процесса (мс) для repeat запусков"""
+    import_times = []
+    wall_times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                                cwd=ROOT_DIR, capture_output=True, text=True)
+        wall_times.append((time.perf_counter() - start) * 1000.)
+
+        if result.returncode != 0:
+            raise RuntimeError(f"'{code}' failed:\n{result.stderr}")
+
+        import_times.append(import_time_ms(result.stderr))
+
+    return import_times, wall_times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7, help="число запусков каждой точки входа")
+    parser.add_argument("--json", help="сохранить результаты в JSON файл")
+    parser.add_argument("--scale", type=float, default=1.,
+                        help="множитель бюджетов для медленных машин")
+    args = parser.parse_args(argv)
+
+    results = {}
+    failed = []
+
+    print(f"{'entry':<10}{'import min':>12}{'import med':>12}{'wall med':>10}{'budget':>10}")
+    for name, (code, budget) in ENTRY_POINTS.items():
+        import_times, wall_times = measure(code, args.repeat)
+        budget *= args.scale
+        median = statistics.median(import_times)
+
+        results[name] = {
+            "code": code,
+            "import_min_ms": min(import_times),
+            "import_median_ms": median,
+            "wall_median_ms": statistics.median(wall_times),
+            "budget_ms": budget,
+        }
+
+        mark = "" if median <= budget else "  REGRESSION"
+        if mark:
+            failed.append(name)
+        print(f"{name:<10}{min(import_times):>12.1f}{median:>12.1f}"
+              f"{statistics.median(wall_times):>10.1f}{budget:>10.0f}{mark}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=1)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
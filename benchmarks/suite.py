@@ -0,0 +1,301 @@
+"""Набор бенчмарков: разбор файлов, корреляция, генерация сигналов, исследование
+
+    python benchmarks/suite.py run [--filter corr] [--save baseline.json]
+    python benchmarks/suite.py compare baseline.json [--tolerance 0.2]
+
+Кейсы utility_point/* (запуск утилиты на точку против постоянного процесса
+--serve) добавляются, если в --build-dir есть собранная data_processing.
+
+compare запускает тот же набор и помечает случаи, ставшие медленнее
+базового более чем на tolerance; код завершения 1 при регрессиях.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from processing.correlator import Correlator, TemplateCache  # noqa: E402
+from processing.filterbank import FilterBank  # noqa: E402
+from processing.fileio import parse_complex_text, parse_real_text  # noqa: E402
+from processing.generator import MODULATION_NAMES, NoiseInjector, SignalGenerator  # noqa: E402
+from processing.pipeline import ExternalProcessor  # noqa: E402
+from processing.realtime import RealtimeDetector  # noqa: E402
+from processing.streaming import stream_search  # noqa: E402
+from processing.sweep import SweepScheduler, snr_grid  # noqa: E402
+from processing.utility import UtilityWorker  # noqa: E402
+
+# Параметры сигнала по умолчанию (как в демо режиме)
+SIGNAL_PARAMS = {"fd": 20.0, "f": 10.0, "n": 100, "vel": 10.0, "sigSize": 30.0}
+
+# Длины принимаемого сигнала и размеры искомого фрагмента в процентах
+CORRELATION_SIZES = [4096, 65536, 1048576]
+CORRELATION_RATIOS = [10., 30., 50.]
+
+# Количество значений в текстовых файлах
+TEXT_SIZES = [100000, 1000000]
+
+# Кейсы: имя -> функция подготовки, возвращающая замеряемую функцию
+CASES = {}
+
+# Освобождение ресурсов кейсов (процессы утилиты и т.п.) до удаления временной директории
+CLEANUPS = []
+
+
+def benchmark(name):
+    """Регистрация кейса бенчмарка"""
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def write_complex_text(filename, size, rng):
+    """Текстовый файл в формате Utils::write: (re,im), (re,im), ..."""
+    data = rng.standard_normal((size, 2))
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write(", ".join(f"({re:g},{im:g})" for re, im in data))
+        file.write("\n")
+
+
+def write_real_text(filename, size, rng):
+    data = rng.standard_normal(size)
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write(", ".join(f"{value:g}" for value in data))
+        file.write("\n")
+
+
+def register_cases(tmp_dir, build_dir=None):
+    rng = np.random.default_rng(0)
+
+    for size in TEXT_SIZES:
+        complex_file = os.path.join(tmp_dir, f"complex_{size}.txt")
+        real_file = os.path.join(tmp_dir, f"real_{size}.txt")
+
+        @benchmark(f"parse_complex_text/{size}")
+        def _(complex_file=complex_file, size=size):
+            write_complex_text(complex_file, size, rng)
+            return lambda: parse_complex_text(complex_file)
+
+        @benchmark(f"parse_real_text/{size}")
+        def _(real_file=real_file, size=size):
+            write_real_text(real_file, size, rng)
+            return lambda: parse_real_text(real_file)
+
+    for size in CORRELATION_SIZES:
+        for ratio in CORRELATION_RATIOS:
+            @benchmark(f"correlate/{size}/{ratio:g}%")
+            def _(size=size, ratio=ratio):
+                data_a = rng.standard_normal(size) + 1j * rng.standard_normal(size)
+                data_b = data_a[:int(size * ratio / 100.)].copy()
+                correlator = Correlator()
+                return lambda: correlator.correlate(data_a, data_b)
+
+            @benchmark(f"correlate_single/{size}/{ratio:g}%")
+            def _(size=size, ratio=ratio):
+                data_a = (rng.standard_normal(size) + 1j * rng.standard_normal(size)).astype(np.complex64)
+                data_b = data_a[:int(size * ratio / 100.)].copy()
+                correlator = Correlator(dtype=np.complex64)
+                return lambda: correlator.correlate(data_a, data_b)
+
+            @benchmark(f"correlate_prepared/{size}/{ratio:g}%")
+            def _(size=size, ratio=ratio):
+                data_a = rng.standard_normal(size) + 1j * rng.standard_normal(size)
+                data_b = data_a[:int(size * ratio / 100.)].copy()
+                correlator = Correlator(TemplateCache())
+                template = correlator.prepare(data_b, size)
+                return lambda: correlator.correlate(data_a, template)
+
+    @benchmark("filter_bank/65536/8x3000")
+    def _():
+        received = rng.standard_normal(65536) + 1j * rng.standard_normal(65536)
+        bank = FilterBank([rng.standard_normal(3000) + 1j * rng.standard_normal(3000) for _ in range(8)])
+        return lambda: bank.correlate(received)
+
+    @benchmark("stream_search/4194304")
+    def _():
+        data = rng.standard_normal(4194304) + 1j * rng.standard_normal(4194304)
+        template = data[1000000:1010000].copy()
+        return lambda: stream_search(data, template)
+
+    @benchmark("realtime/1048576x4096")
+    def _():
+        # Пропускная способность детектора: кадры по 4096 отсчетов без ожидания источника
+        data = rng.standard_normal(1048576) + 1j * rng.standard_normal(1048576)
+        template = data[500000:501000].copy()
+
+        def run():
+            detector = RealtimeDetector(template, threshold=0.5)
+            for start in range(0, len(data), 4096):
+                detector.push(start, data[start:start + 4096], 0.)
+            detector.finish()
+        return run
+
+    for signal_type, mod_name in MODULATION_NAMES.items():
+        @benchmark(f"generate/{mod_name}")
+        def _(signal_type=signal_type):
+            generator = SignalGenerator(SIGNAL_PARAMS, signal_type, 0)
+            return lambda: generator.generate_batch(100)
+
+    @benchmark("add_noise/100x20000")
+    def _():
+        data = SignalGenerator(SIGNAL_PARAMS, 0, 0).generate_batch(100)
+        noise = NoiseInjector(0)
+        return lambda: noise.add_noise(data, 10.)
+
+    @benchmark("sweep/end_to_end")
+    def _():
+        params = dict(SIGNAL_PARAMS, n=20, snr_static=10., snr_min=0., snr_max=10.,
+                      n_points=5, n_runs=200, seed=0, tolerance=0.)
+        snr_values = snr_grid(params["snr_min"], params["snr_max"], params["n_points"])
+        scheduler = SweepScheduler(seed=0)
+        return lambda: scheduler.run(params, snr_values)
+
+    @benchmark("sweep/end_to_end_single")
+    def _():
+        params = dict(SIGNAL_PARAMS, n=20, snr_static=10., snr_min=0., snr_max=10.,
+                      n_points=5, n_runs=200, seed=0, tolerance=0., precision="single")
+        snr_values = snr_grid(params["snr_min"], params["snr_max"], params["n_points"])
+        scheduler = SweepScheduler(seed=0)
+        return lambda: scheduler.run(params, snr_values)
+
+    processor = ExternalProcessor(build_dir or os.path.join(ROOT_DIR, "build"))
+    CLEANUPS.append(processor.close)
+    if os.path.exists(processor.app_path()):
+        # Одно испытание короткого сигнала: замеряются накладные расходы точки
+        point_params = dict(SIGNAL_PARAMS, n=10, snr_static=10., n_runs=1)
+        point_args = processor.research_args(point_params, 5.)
+
+        @benchmark("utility_point/spawn")
+        def _():
+            cwd = ExternalProcessor.point_workspace(tmp_dir, "spawn")
+            return lambda: subprocess.run([processor.app_path()] + point_args[1:], cwd=cwd,
+                                          stdout=subprocess.DEVNULL, check=True)
+
+        @benchmark("utility_point/serve")
+        def _():
+            worker = UtilityWorker(processor.app_path(), ExternalProcessor.point_workspace(tmp_dir, "serve"))
+            CLEANUPS.append(worker.close)
+            return lambda: worker.run_point(point_params, 5.)
+
+
+def time_case(func, repeat, min_time):
+    """Минимальное время одного вызова (с) по repeat сериям длительностью >= min_time"""
+    func()  # прогрев: импорт БПФ, планы, кэши
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+
+    return best
+
+
+def run_suite(name_filter=None, repeat=5, min_time=0.2, build_dir=None):
+    """Запуск набора, {имя кейса: время вызова в секундах}"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        CASES.clear()
+        CLEANUPS.clear()
+        try:
+            register_cases(tmp_dir, build_dir)
+
+            for name, setup in CASES.items():
+                if name_filter and name_filter not in name:
+                    continue
+
+                results[name] = time_case(setup(), repeat, min_time)
+                print(f"{name:<32}{results[name] * 1000.:>12.3f} ms", flush=True)
+        finally:
+            for cleanup in reversed(CLEANUPS):
+                cleanup()
+
+    return results
+
+
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(baseline, results, tolerance):
+    """Сравнение с базовыми результатами, список регрессий"""
+    regressions = []
+    print(f"\n{'case':<32}{'baseline':>12}{'current':>12}{'ratio':>8}")
+
+    for name, current in results.items():
+        if name not in baseline:
+            print(f"{name:<32}{'-':>12}{current * 1000.:>12.3f}{'new':>8}")
+            continue
+
+        ratio = current / baseline[name]
+        mark = ""
+        if ratio > 1. + tolerance:
+            mark = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<32}{baseline[name] * 1000.:>12.3f}{current * 1000.:>12.3f}{ratio:>8.2f}{mark}")
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", help="запускать только кейсы, имя которых содержит строку")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="минимальная длительность серии, с")
+    parser.add_argument("--build-dir", default=None, help="директория утилиты data_processing (по умолчанию build)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="запуск и сохранение результатов")
+    run.add_argument("--save", help="JSON файл для базовых результатов")
+
+    cmp = subparsers.add_parser("compare", help="сравнение с базовыми результатами")
+    cmp.add_argument("baseline", help="JSON файл, сохраненный командой run --save")
+    cmp.add_argument("--tolerance", type=float, default=0.2, help="допустимое замедление (0.2 = 20%%)")
+
+    args = parser.parse_args(argv)
+    results = run_suite(args.filter, args.repeat, args.min_time, args.build_dir)
+
+    if args.command == "run":
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as file:
+                json.dump({"machine": machine_info(), "results": results}, file, indent=1)
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+
+    if baseline.get("machine") != machine_info():
+        print("Предупреждение: базовые результаты сняты на другой машине или версиях", file=sys.stderr)
+
+    regressions = compare(baseline["results"], results, args.tolerance)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,12 +8,26 @@ std::mutex Correlator::fftwMutex;
 // Destructor
 Correlator::~Correlator()
 {
+    destroyPlans();
+}
+
+// Destroy FFT plans, next call plans for the new sizes
+void Correlator::destroyPlans()
+{
+    std::lock_guard<std::mutex> lock(fftwMutex);
+
     if (plan_forward_a)
         fftw_destroy_plan(plan_forward_a);
     if (plan_forward_b)
         fftw_destroy_plan(plan_forward_b);
     if (plan_backward)
         fftw_destroy_plan(plan_backward);
+
+    plan_forward_a = nullptr;
+    plan_forward_b = nullptr;
+    plan_backward  = nullptr;
+    n_fft = 1;
+    init  = true;
 }
 
 // Calculate correlation
@@ -28,7 +42,12 @@ void Correlator::findCorrelation(const std::vector<std::complex<double>>& data_a
     uint32_t size_b = data_b.size();
     size_t size_out = size_a + size_b - 1;
 
-    if (init)
+    // Plans and buffers are kept between calls (long-lived --serve mode)
+    // until the signal sizes change
+    if (!init && (size_a != a_centered.size() || size_b != b_centered.size()))
+        destroyPlans();
+
+    if (corr_out.size() != size_out)
         corr_out.resize(size_out);
 
     std::complex<double> mean_a = std::accumulate(
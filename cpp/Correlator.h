@@ -18,13 +18,16 @@ private: // variables
     std::vector<std::complex<double>> a_fft;
     std::vector<std::complex<double>> b_fft;
     std::vector<std::complex<double>> corr_fft;
-    fftw_plan plan_forward_a;
-    fftw_plan plan_forward_b;
-    fftw_plan plan_backward;
+    fftw_plan plan_forward_a = nullptr;
+    fftw_plan plan_forward_b = nullptr;
+    fftw_plan plan_backward  = nullptr;
     bool init = true;
     uint32_t n_fft = 1;
 private: // functions
 
+// Destroy FFT plans, next call plans for the new sizes
+void destroyPlans();
+
 // Calculate correlation
 //! [in]  data_a        - First signal to correlate
 //! [in]  data_b        - Second signal to correlate
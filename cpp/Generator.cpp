@@ -33,6 +33,50 @@ void write(std::vector<T> data, std::string name)
     outFile.close();
 }
 
+// Type descriptor of the .npy header
+template <typename T>
+struct NpyDescr;
+
+template <>
+struct NpyDescr<double> { static constexpr const char* value = "<f8"; };
+
+template <>
+struct NpyDescr<std::complex<double>> { static constexpr const char* value = "<c16"; };
+
+// Write data in binary .npy format (version 1.0, little-endian host)
+// Python side opens it with np.load(..., mmap_mode='r') without parsing
+//! [in] data - Data to write
+//! [in] name - Output file name
+template <typename T>
+void writeNpy(const std::vector<T>& data, std::string name)
+{
+    std::ofstream outFile;
+    outFile.open(name, std::ios::binary);
+
+    if (!outFile.is_open())
+        throw std::runtime_error("Cannot open file: " + name);
+
+    std::string header = std::string("{'descr': '") + NpyDescr<T>::value +
+                         "', 'fortran_order': False, 'shape': (" +
+                         std::to_string(data.size()) + ",), }";
+
+    // magic (6) + version (2) + header len (2) + header + '\n' must be aligned to 64
+    size_t total = 10 + header.size() + 1;
+    header.append((64 - total % 64) % 64, ' ');
+    header.push_back('\n');
+
+    uint16_t header_len = static_cast<uint16_t>(header.size());
+    char     preamble[10] = {'\x93', 'N', 'U', 'M', 'P', 'Y', 1, 0,
+                             static_cast<char>(header_len & 0xFF),
+                             static_cast<char>(header_len >> 8)};
+
+    outFile.write(preamble, sizeof(preamble));
+    outFile.write(header.data(), header.size());
+    outFile.write(reinterpret_cast<const char*>(data.data()), data.size() * sizeof(T));
+
+    outFile.close();
+}
+
 void writeBer(double val, std::string name)
 {
     std::ofstream outFile;
@@ -151,7 +195,7 @@ double SignalGenerator::generateShiftedSignal(double sample_freq, uint32_t shift
                                  std::to_string(size) + std::string(", fd: ") + std::to_string(sample_freq) +
                                  std::string(", d_t: ") + std::to_string(dt));
 
-    if (data_out.empty())
+    if (data_out.size() != shifted_size)
         data_out.resize(shifted_size);
 
     auto iter_data_in = data_in.begin() + n_shift;
@@ -184,7 +228,6 @@ void NoiseInjector::addNoise(std::vector<std::complex<double>>& data, double snr
 
     uint32_t size = data.size();
 
-    std::vector<std::complex<double>> noise;
     gen.generateAwgn(noise, size);
 
     for (uint32_t i = 0; i < size; ++i)
@@ -271,7 +314,7 @@ void BaseGenerator::generate(std::vector<std::complex<double>>& data_out)
     // Pointer to current info bit val
     auto   cur_bit = info_bits.begin();
 
-    if (data_out.empty())
+    if (data_out.size() != m_NumSampl)
         data_out.resize(m_NumSampl);
 
     double I = 0;
@@ -337,16 +380,15 @@ void DataProcessor::config(const cfg& params)
     return;
 }
 
-// Run Data Processing
-void DataProcessor::run(uint32_t num_runs)
+// Run Data Processing, returns probability of detection
+double DataProcessor::process(uint32_t num_runs)
 {
     size_t counter = 0;
-    Correlator corr;
 
-    // Temp data for processing
-    std::vector<std::complex<double>> firstSignal;
-    std::vector<std::complex<double>> secondSignal;
-    std::vector<double>               correlation;
+    // Buffers are kept between calls
+    std::vector<std::complex<double>>& firstSignal  = m_FirstSignal;
+    std::vector<std::complex<double>>& secondSignal = m_SecondSignal;
+    std::vector<double>&               correlation  = m_Correlation;
     double   shifted_size_per    = m_Cfg.size_per / 100.;
     uint32_t max_metric_id       = 0;
     uint32_t shifted_signal_size = 0;
@@ -368,7 +410,7 @@ void DataProcessor::run(uint32_t num_runs)
         m_Noise.addNoise(firstSignal,  m_Cfg.snr1);
         m_Noise.addNoise(secondSignal, m_Cfg.snr2);
 
-        corr.correlate(firstSignal, secondSignal, correlation, max_metric_id);
+        m_Corr.correlate(firstSignal, secondSignal, correlation, max_metric_id);
 
         if (std::abs(max_metric_id - dt) < m_GenData.getNumSamplesPerBit())
             counter++;
@@ -376,7 +418,13 @@ void DataProcessor::run(uint32_t num_runs)
 
     persent = (double)counter / (double)num_runs;
 
-    Utils::writeBer(persent, fileName);
+    return persent;
+}
+
+// Run Data Processing with writing probability to the ber file
+void DataProcessor::run(uint32_t num_runs)
+{
+    Utils::writeBer(process(num_runs), fileName);
 
     return;
 }
@@ -404,9 +452,9 @@ void DataProcessor::run()
     Correlator corr;
     corr.correlate(firstSignal, secondSignal, correlation, max_metric_id);
     
-    Utils::write(firstSignal, std::string("../data/first_data.txt"));
-    Utils::write(secondSignal, std::string("../data/second_data.txt"));
-    Utils::write(correlation, std::string("../data/correlation.txt"));
+    Utils::writeNpy(firstSignal, std::string("../data/first_data.npy"));
+    Utils::writeNpy(secondSignal, std::string("../data/second_data.npy"));
+    Utils::writeNpy(correlation, std::string("../data/correlation.npy"));
 
     return;
 }
\ No newline at end of file
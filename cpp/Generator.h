@@ -7,6 +7,8 @@
 #include <complex>
 #include <cstdint>
 
+#include "Correlator.h"
+
 enum class SignalType : int
 {
     ndf       = -1,  // Undefined
@@ -100,6 +102,7 @@ class NoiseInjector
 {
 private:  // variables
 RandomGenerator gen;    //! Random Generator
+std::vector<std::complex<double>> noise;  //! Noise buffer, reused between calls
 
 public:  // functions
 
@@ -185,12 +188,22 @@ class DataProcessor
 
     std::string fileName;         // Filename to write ber data
 
+    // Correlator and signal buffers live as long as the processor,
+    // so FFT plans are made once for a series of points
+    Correlator                        m_Corr;
+    std::vector<std::complex<double>> m_FirstSignal;
+    std::vector<std::complex<double>> m_SecondSignal;
+    std::vector<double>               m_Correlation;
+
     public: // functions
 
     // Configure Data Processor
     void config(const cfg& params);
 
-    // Run Data Processing
+    // Run Data Processing, returns probability of detection
+    double process(uint32_t num_runs);
+
+    // Run Data Processing with writing probability to the ber file
     void run(uint32_t num_runs);
 
     // Run Data Processing with writing temp data 
@@ -1,7 +1,10 @@
+#include <cstdio>
+#include <exception>
 #include <iostream>
 #include <thread>
 #include <vector>
 #include <memory>
+#include <string>
 
 #include "Generator.h"
 #include "Correlator.h"
@@ -41,13 +44,141 @@ void runProcessor(DataProcessor& processor, const cfg& config, uint32_t numRans)
     processor.run(numRans);
 }
 
+// Frames of the long-lived mode (--serve), host (little-endian) byte order
+constexpr uint32_t REQUEST_MAGIC  = 0x51525044;  // "DPRQ"
+constexpr uint32_t RESPONSE_MAGIC = 0x53525044;  // "DPRS"
+
+// Research point request, read from stdin
+struct RequestFrame
+{
+    uint32_t magic;
+    uint32_t num_runs;
+    double   fd;
+    double   f;
+    double   vel;
+    double   snr1;
+    double   snr2;
+    double   size_per;
+    uint32_t n;
+    uint32_t reserved;
+};
+static_assert(sizeof(RequestFrame) == 64, "Unexpected request frame layout");
+
+// Response header, written to stdout and followed by payload_size bytes:
+// 3 doubles (AM, BPSK, MFM probabilities of detection) or error text
+struct ResponseHeader
+{
+    uint32_t magic;
+    uint32_t status;        // 0 - ok, 1 - error
+    uint32_t payload_size;
+};
+
+// Write response frame
+void writeResponse(uint32_t status, const void* payload, uint32_t size)
+{
+    ResponseHeader header = {RESPONSE_MAGIC, status, size};
+    std::fwrite(&header, sizeof(header), 1, stdout);
+    if (size)
+        std::fwrite(payload, size, 1, stdout);
+    std::fflush(stdout);
+}
+
+// Функция для расчета точки в потоке, ошибка передается в вызывающий поток
+void processPoint(DataProcessor& processor, uint32_t numRans, double& probability, std::exception_ptr& error)
+{
+    try
+    {
+        probability = processor.process(numRans);
+    }
+    catch (...)
+    {
+        error = std::current_exception();
+    }
+}
+
+// Long-lived mode: one research point per request frame until stdin is closed.
+// Processors (FFT plans and signal buffers) are kept between points
+int serve()
+{
+    // stdout is the frame channel, diagnostic output is discarded
+    std::cout.rdbuf(nullptr);
+
+    DataProcessor    processors[3];
+    const SignalType types[3] = {SignalType::amplitude, SignalType::phase, SignalType::freq};
+
+    // Ready frame: the process has started and understands the protocol
+    writeResponse(0, nullptr, 0);
+
+    RequestFrame request;
+    while (std::fread(&request, sizeof(request), 1, stdin) == 1)
+    {
+        if (request.magic != REQUEST_MAGIC)
+        {
+            std::cerr << "Invalid request frame" << std::endl;
+            return 1;
+        }
+
+        double             probability[3] = {0., 0., 0.};
+        std::exception_ptr errors[3];
+
+        try
+        {
+            if (request.num_runs == 0)
+                throw std::runtime_error("Invalid number of runs: 0");
+
+            cfg config;
+            config.fd   = request.fd;
+            config.f    = request.f;
+            config.n    = request.n;
+            config.vel  = request.vel;
+            config.snr1 = request.snr1;
+            config.snr2 = request.snr2;
+            config.is_random_dt = true;
+            config.size_per = request.size_per;
+
+            for (int i = 0; i < 3; ++i)
+            {
+                cfg type_cfg = config;
+                type_cfg.type = types[i];
+                processors[i].config(type_cfg);
+            }
+
+            std::vector<std::thread> threads;
+            for (int i = 0; i < 3; ++i)
+                threads.emplace_back(processPoint, std::ref(processors[i]), request.num_runs,
+                                     std::ref(probability[i]), std::ref(errors[i]));
+
+            for (auto& thread : threads)
+                thread.join();
+
+            for (auto& error : errors)
+                if (error)
+                    std::rethrow_exception(error);
+        }
+        catch (const std::exception& e)
+        {
+            std::string message = e.what();
+            writeResponse(1, message.data(), message.size());
+            continue;
+        }
+
+        writeResponse(0, probability, sizeof(probability));
+    }
+
+    return 0;
+}
+
 int main(int argc, char* argv[])
 {
+    if (argc == 2 && std::string(argv[1]) == "--serve")
+        return serve();
+
     if (argc != 9 && argc != 10)
     {
         std::cerr << "Incorrect input number of parameters: " << argc << std::endl;
         std::cerr << "Usage for demo: " << argv[0] << " fd f n vel dt snr1 snr2 type" << std::endl;
         std::cerr << "Usage for research: " << argv[0] << " fd f n vel snr1 snr2" << std::endl;
+        std::cerr << "Usage for long-lived research: " << argv[0] << " --serve" << std::endl;
         return 1;
     }
 
@@ -0,0 +1,963 @@
+"""Графический интерфейс анализатора сигналов (tkinter + matplotlib)
+
+Импортируется из main.py только при запуске без аргументов командной строки.
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import tkinter as tk
+from tkinter import messagebox
+from tkinter import ttk
+
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from matplotlib.figure import Figure
+
+from processing import STORE_FILE, ResultCache, ResultStore, minmax_decimate, parse_filters, snr_grid, tracer
+from processing.pipeline import (CHOICE_PARAMS, DEMO_PARAMS, RESEARCH_PARAMS, ExternalProcessor, PipelineError,
+                                 ProcessingCancelled, parse_params, run_demo_in_worker, run_sweep_in_process,
+                                 validate_research_params)
+
+
+# Оформление кривых исследования по типам модуляции
+CURVE_COLORS = {'AM': 'blue', 'FM': 'red', 'PM': 'green'}
+CURVE_MARKERS = {'AM': 'o', 'FM': 's', 'PM': '^'}
+CURVE_LABELS = {'AM': 'Амплитудная модуляция (АМ)',
+                'FM': 'Частотная модуляция (МЧМ)',
+                'PM': 'Фазовая модуляция (ФМ-2)'}
+
+
+class DecimatedLine:
+    """Линия графика с прореживанием min/max под ширину оси в пикселях
+    
+    При изменении видимого диапазона по X линия заново прореживается
+    из исходных данных, поэтому при приближении детализация восстанавливается.
+    """
+    def __init__(self, ax, data, *args, **kwargs):
+        self.ax = ax
+        self.data = data
+        
+        x, y = minmax_decimate(self.data, 0, len(self.data), self.num_bins())
+        self.line, = ax.plot(x, y, *args, **kwargs)
+        ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+    
+    def num_bins(self):
+        """Количество интервалов прореживания - ширина оси в пикселях"""
+        return max(1, int(self.ax.bbox.width))
+    
+    def on_xlim_changed(self, ax):
+        """Повторное прореживание видимого диапазона"""
+        x_min, x_max = ax.get_xlim()
+        x, y = minmax_decimate(self.data, np.floor(x_min), np.ceil(x_max) + 1, self.num_bins())
+        self.line.set_data(x, y)
+
+
+class LiveBerPlot:
+    """Кривые исследования, дополняемые по мере готовности точек
+    
+    Оси, сетка и легенда рисуются один раз и сохраняются как фон;
+    при добавлении точек восстанавливается фон и перерисовываются только
+    анимированные линии (blitting), без ax.clear() и полной перерисовки.
+    Фон заново снимается после каждой полной перерисовки (изменение
+    размера окна, навигация).
+    """
+    def __init__(self, canvas, ax, snr_values, y_min):
+        self.canvas = canvas
+        self.ax = ax
+        self.points = {mod_type: {} for mod_type in CURVE_COLORS}
+        self.background = None
+        
+        ax.clear()
+        self.lines = {mod_type: ax.plot([], [], color=CURVE_COLORS[mod_type],
+                                        marker=CURVE_MARKERS[mod_type],
+                                        label=CURVE_LABELS[mod_type],
+                                        linewidth=2, markersize=6, animated=True)[0]
+                      for mod_type in CURVE_COLORS}
+        
+        step = snr_values[1] - snr_values[0] if len(snr_values) > 1 else 1.
+        ax.set_xlim(snr_values[0] - step / 2, snr_values[-1] + step / 2)
+        ax.set_yscale('log')
+        ax.set_ylim(y_min, 1.1)
+        ax.set_title('Зависимость Вероятности ошибки от SNR для различных типов модуляции', fontsize=14)
+        ax.set_xlabel('SNR (дБ)', fontsize=12)
+        ax.set_ylabel('Вероятность ошибки', fontsize=12)
+        ax.legend(fontsize=10)
+        ax.grid(True, alpha=0.3, which='both')
+        
+        self.draw_cid = canvas.mpl_connect('draw_event', self.on_draw)
+        canvas.draw()
+    
+    def on_draw(self, event):
+        """Снятие фона после полной перерисовки"""
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.draw_lines()
+    
+    def draw_lines(self):
+        for line in self.lines.values():
+            self.ax.draw_artist(line)
+    
+    def add(self, mod_type, snr, value):
+        """Новая точка кривой, видна после update()"""
+        points = self.points.setdefault(mod_type, {})
+        points[snr] = value
+        x = sorted(points)
+        self.lines[mod_type].set_data(x, [points[snr] for snr in x])
+    
+    def update(self):
+        """Перерисовка линий поверх сохраненного фона"""
+        if self.background is None:
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_lines()
+        self.canvas.blit(self.ax.bbox)
+    
+    def close(self):
+        self.canvas.mpl_disconnect(self.draw_cid)
+
+
+class SignalAnalyzerApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Анализатор сигналов - Демо и Исследование")
+        
+        # Настройки путей
+        self.build_dir = "build"
+        self.data_dir = "data"
+        self.processing_app = "./data_processing"
+        
+        # Настройки размеров
+        self.main_window_size = "1600x1000"
+        self.figure_sizes = [(14, 2), (14, 2), (14, 2)]
+        self.frame_padding = {"padx": 13, "pady": 8}
+        
+        # Параметры по умолчанию для демо режима и режима исследования
+        self.demo_params = dict(DEMO_PARAMS)
+        self.research_params = dict(RESEARCH_PARAMS)
+        
+        # Запуск внешней утилиты и чтение ее файлов
+        self.processor = ExternalProcessor(self.build_dir, self.data_dir, self.processing_app,
+                                           on_output=self.show_processor_output)
+        # Отмена текущей обработки (встроенный вычислитель проверяет событие)
+        self.cancel_event = threading.Event()
+        
+        self.root.geometry(self.main_window_size)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        
+        self.signal1_data = None
+        # Сегменты разделяемой памяти под signal*_data/correlation_data
+        # (встроенный вычислитель) и процесс, в котором считается демо
+        self.demo_shared = None
+        self.demo_executor = None
+        # Линии демо графиков (обработчики осей хранят только слабые ссылки)
+        self.demo_lines = []
+        self.signal2_data = None
+        self.correlation_data = None
+        self.ber_data = None
+        self.result_cache = None
+        self.research_trials = None
+        # Хранилище результатов и наложенные на график сохраненные кривые
+        self.result_store = None
+        self.overlay_curves = []
+        self.research_snr = None
+        # Координатор рабочих узлов (создается при первом распределенном
+        # исследовании и живет до закрытия приложения)
+        self.coordinator = None
+        self.coordinator_var = tk.StringVar()
+        
+        # Точки исследования из рабочего потока для живого графика
+        self.live_queue = queue.Queue()
+        self.live_plot = None
+        self.live_poll_ms = 100
+        # Не больше стольких наложенных кривых (легенда должна помещаться)
+        self.max_overlays = 12
+        
+        self.current_mode = "demo"  # "demo" или "research"
+        
+        self.create_widgets()
+        
+    def create_widgets(self):
+        # Создаем Notebook для вкладок
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        # Вкладка для демо режима
+        self.demo_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.demo_frame, text="Демонстрационный режим")
+        
+        # Вкладка для режима исследования
+        self.research_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.research_frame, text="Режим исследования")
+        
+        # Создаем виджеты для демо режима
+        self.create_demo_widgets()
+        
+        # Создаем виджеты для режима исследования
+        self.create_research_widgets()
+        
+        # Биндим событие переключения вкладок
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+    
+    def create_demo_widgets(self):
+        # Фрейм для параметров демо режима
+        demo_params_frame = tk.LabelFrame(self.demo_frame, text="Параметры обработки", font=('Arial', 10))
+        demo_params_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Создаем поля для параметров демо режима
+        demo_param_labels = {
+            "fd":      "Частота дискретизации (Гц):",
+            "f":       "Несущая частота (Гц):",
+            "n":       "Количество бит информации:",
+            "vel":     "Скорость информации (б/сек):",
+            "dt":      "Временное смещение (отсчеты):",
+            "snr1":    "SNR для сигнала 1 (дБ):",
+            "snr2":    "SNR для сигнала 2 (дБ):",
+            "type":    "Тип модуляции (\"0\" - АМ, \"1\" - ФМ-2, \"2\" - МЧМ):",
+            "sigSize": "Размер искомого сигнала в процентах:",
+            "precision": "Точность вычислений:"
+        }
+
+        self.demo_param_entries = {}
+        row = 0
+        col = 0
+        
+        for i, (key, label) in enumerate(demo_param_labels.items()):
+            frame = tk.Frame(demo_params_frame)
+            frame.grid(row=row, column=col, padx=5, pady=2, sticky="w")
+            
+            tk.Label(frame, text=label, font=('Arial', 9)).pack(side=tk.LEFT)
+            entry = self.create_param_entry(frame, key, self.demo_params[key])
+            entry.pack(side=tk.LEFT, padx=5)
+            self.demo_param_entries[key] = entry
+            
+            col += 1
+            if col > 4:  # 3 колонки в ряду
+                col = 0
+                row += 1
+        
+        # Фрейм для кнопок демо режима
+        demo_button_frame = tk.Frame(self.demo_frame)
+        demo_button_frame.pack(pady=10)
+        
+        # Кнопка старт для демо режима
+        self.demo_start_btn = tk.Button(demo_button_frame, text="Старт обработки", 
+                                       command=self.start_demo_processing,
+                                       bg='green', fg='white', font=('Arial', 12))
+        self.demo_start_btn.pack(side=tk.LEFT, padx=10)
+        
+        # Кнопка выхода
+        self.demo_exit_btn = tk.Button(demo_button_frame, text="Выход", 
+                                      command=self.on_closing,
+                                      bg='red', fg='white', font=('Arial', 12))
+        self.demo_exit_btn.pack(side=tk.LEFT, padx=10)
+        
+        # Кнопка отмены (активна во время обработки)
+        self.demo_cancel_btn = tk.Button(demo_button_frame, text="Отмена",
+                                        command=self.cancel_processing,
+                                        state=tk.DISABLED, font=('Arial', 12))
+        self.demo_cancel_btn.pack(side=tk.LEFT, padx=10)
+        
+        # Выбор вычислителя: встроенный (numpy) или внешняя утилита
+        self.use_external_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(demo_button_frame, text="Внешняя утилита data_processing",
+                       variable=self.use_external_var,
+                       font=('Arial', 10)).pack(side=tk.LEFT, padx=10)
+        
+        # Таймаут одного запуска утилиты (общий для обоих режимов)
+        self.timeout_var = tk.StringVar(value=str(self.processor.timeout))
+        self.create_timeout_widgets(demo_button_frame)
+        
+        # Замер этапов обработки (общий для обоих режимов)
+        self.profile_var = tk.BooleanVar(value=False)
+        self.create_profile_widgets(demo_button_frame)
+        
+        # Создаем фреймы для трех отдельных графиков в демо режиме
+        self.demo_plot_frame = tk.Frame(self.demo_frame)
+        self.demo_plot_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Фреймы для каждого графика
+        self.demo_frame1 = tk.Frame(self.demo_plot_frame)
+        self.demo_frame1.pack(side=tk.TOP, fill=tk.BOTH, expand=True, **self.frame_padding)
+        
+        self.demo_frame2 = tk.Frame(self.demo_plot_frame)
+        self.demo_frame2.pack(side=tk.TOP, fill=tk.BOTH, expand=True, **self.frame_padding)
+        
+        self.demo_frame3 = tk.Frame(self.demo_plot_frame)
+        self.demo_frame3.pack(side=tk.TOP, fill=tk.BOTH, expand=True, **self.frame_padding)
+        
+        # Создаем отдельные фигуры для демо режима
+        self.demo_fig1 = Figure(figsize=self.figure_sizes[0])
+        self.demo_fig2 = Figure(figsize=self.figure_sizes[1])
+        self.demo_fig3 = Figure(figsize=self.figure_sizes[2])
+        self.demo_ax1 = self.demo_fig1.add_subplot()
+        self.demo_ax2 = self.demo_fig2.add_subplot()
+        self.demo_ax3 = self.demo_fig3.add_subplot()
+        
+        # Настраиваем отступы внутри фигур
+        figure_padding = 1.0
+        self.demo_fig1.tight_layout(pad=figure_padding)
+        self.demo_fig2.tight_layout(pad=figure_padding)
+        self.demo_fig3.tight_layout(pad=figure_padding)
+        
+        # Canvas для каждого графика в демо режиме
+        self.demo_canvas1 = FigureCanvasTkAgg(self.demo_fig1, master=self.demo_frame1)
+        self.demo_canvas1.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        self.demo_canvas2 = FigureCanvasTkAgg(self.demo_fig2, master=self.demo_frame2)
+        self.demo_canvas2.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        self.demo_canvas3 = FigureCanvasTkAgg(self.demo_fig3, master=self.demo_frame3)
+        self.demo_canvas3.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        # Панели масштабирования, графики прореживаются под видимый диапазон
+        for canvas, frame in ((self.demo_canvas1, self.demo_frame1),
+                              (self.demo_canvas2, self.demo_frame2),
+                              (self.demo_canvas3, self.demo_frame3)):
+            NavigationToolbar2Tk(canvas, frame).update()
+    
+    def create_research_widgets(self):
+        # Фрейм для параметров исследования
+        research_params_frame = tk.LabelFrame(self.research_frame, text="Параметры исследования BER", font=('Arial', 10))
+        research_params_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Создаем поля для параметров исследования
+        research_param_labels = {
+            "fd": "Частота дискретизации (Гц):",
+            "f":  "Несущая частота (Гц):",
+            "n": "Количество бит информации:",
+            "vel": "Скорость информации (б/сек):",
+            "snr_static": "Статическое SNR (дБ):",
+            "snr_min": "Минимальное SNR (дБ):",
+            "snr_max": "Максимальное SNR (дБ):",
+            "n_points": "Количество точек:",
+            "n_runs": "Количество испытаний:",
+            "sigSize": "Размер искомого сигнала в процентах:",
+            "seed": "Зерно ГСЧ:",
+            "tolerance": "Точность (0 - фикс. число испытаний):",
+            "precision": "Точность вычислений:"
+        }
+
+        self.research_param_entries = {}
+        row = 0
+        col = 0
+        
+        for i, (key, label) in enumerate(research_param_labels.items()):
+            frame = tk.Frame(research_params_frame)
+            frame.grid(row=row, column=col, padx=5, pady=2, sticky="w")
+            
+            tk.Label(frame, text=label, font=('Arial', 9)).pack(side=tk.LEFT)
+            entry = self.create_param_entry(frame, key, self.research_params[key])
+            entry.pack(side=tk.LEFT, padx=5)
+            self.research_param_entries[key] = entry
+            
+            col += 1
+            if col > 4:  # 3 колонки в ряду
+                col = 0
+                row += 1
+        
+        # Фрейм для кнопок исследования
+        research_button_frame = tk.Frame(self.research_frame)
+        research_button_frame.pack(pady=10)
+        
+        # Кнопка начала исследования
+        self.research_start_btn = tk.Button(research_button_frame, text="Начать исследование", 
+                                           command=self.start_research_processing,
+                                           bg='blue', fg='white', font=('Arial', 12))
+        self.research_start_btn.pack(side=tk.LEFT, padx=10)
+        
+        # Кнопка выхода
+        self.research_exit_btn = tk.Button(research_button_frame, text="Выход", 
+                                          command=self.on_closing,
+                                          bg='red', fg='white', font=('Arial', 12))
+        self.research_exit_btn.pack(side=tk.LEFT, padx=10)
+        
+        self.research_cancel_btn = tk.Button(research_button_frame, text="Отмена",
+                                            command=self.cancel_processing,
+                                            state=tk.DISABLED, font=('Arial', 12))
+        self.research_cancel_btn.pack(side=tk.LEFT, padx=10)
+        
+        tk.Checkbutton(research_button_frame, text="Внешняя утилита data_processing",
+                       variable=self.use_external_var,
+                       font=('Arial', 10)).pack(side=tk.LEFT, padx=10)
+        self.create_timeout_widgets(research_button_frame)
+        self.create_profile_widgets(research_button_frame)
+        
+        # Распределенный расчет: адрес, который слушает координатор
+        coordinator_frame = tk.Frame(self.research_frame)
+        coordinator_frame.pack(pady=(0, 5))
+        tk.Label(coordinator_frame, text="Координатор рабочих узлов (host:port или unix:/path, пусто - локально):",
+                 font=('Arial', 10)).pack(side=tk.LEFT)
+        tk.Entry(coordinator_frame, textvariable=self.coordinator_var, width=25,
+                 font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        
+        # Наложение сохраненных кривых из хранилища результатов
+        overlay_frame = tk.Frame(self.research_frame)
+        overlay_frame.pack(pady=(0, 5))
+        tk.Label(overlay_frame, text="Сохраненные кривые (например modulation=BPSK sigSize=30 fd=20):",
+                 font=('Arial', 10)).pack(side=tk.LEFT)
+        self.overlay_filter_var = tk.StringVar()
+        tk.Entry(overlay_frame, textvariable=self.overlay_filter_var, width=40,
+                 font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(overlay_frame, text="Наложить", command=self.add_overlays,
+                  font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(overlay_frame, text="Убрать наложения", command=self.clear_overlays,
+                  font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        
+        # Создаем фрейм для графика BER в режиме исследования
+        self.research_plot_frame = tk.Frame(self.research_frame)
+        self.research_plot_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Создаем фигуру для графика BER
+        self.research_fig = Figure(figsize=(14, 8))
+        self.research_ax = self.research_fig.add_subplot()
+        self.research_fig.tight_layout(pad=3.0)
+        
+        # Canvas для графика BER
+        self.research_canvas = FigureCanvasTkAgg(self.research_fig, master=self.research_plot_frame)
+        self.research_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        # Статус бар и прогресс бар (общие для обоих режимов)
+        self.status_var = tk.StringVar()
+        self.status_var.set("Готов к работе")
+        self.status_bar = tk.Label(self.root, textvariable=self.status_var, 
+                                  relief=tk.SUNKEN, anchor=tk.W, font=('Arial', 10))
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        self.progress_var = tk.DoubleVar()
+        self.progress_bar = ttk.Progressbar(self.root, variable=self.progress_var, 
+                                          maximum=100, mode='determinate')
+        self.progress_bar.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=5)
+    
+    def create_param_entry(self, frame, key, value):
+        """Поле ввода параметра; для параметров с выбором - выпадающий список"""
+        if key in CHOICE_PARAMS:
+            entry = ttk.Combobox(frame, values=CHOICE_PARAMS[key], state="readonly",
+                                 width=8, font=('Arial', 9))
+            entry.set(value)
+        else:
+            entry = tk.Entry(frame, width=10, font=('Arial', 9))
+            entry.insert(0, str(value))
+        return entry
+    
+    def create_timeout_widgets(self, frame):
+        """Поле таймаута запуска утилиты в секундах"""
+        tk.Label(frame, text="Таймаут, с", font=('Arial', 10)).pack(side=tk.LEFT)
+        tk.Entry(frame, textvariable=self.timeout_var, width=6,
+                 font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+    
+    def apply_timeout(self):
+        """Таймаут из поля ввода для следующих запусков утилиты"""
+        try:
+            timeout = float(self.timeout_var.get())
+        except ValueError:
+            raise PipelineError(f"Некорректный таймаут: {self.timeout_var.get()}")
+        if timeout <= 0:
+            raise PipelineError("Таймаут должен быть положительным")
+        self.processor.timeout = timeout
+    
+    def show_processor_output(self, stream, line):
+        """Строки вывода утилиты по мере появления"""
+        if line:
+            self.status_var.set(f"data_processing: {line}")
+    
+    def set_running(self, start_btn, cancel_btn, running):
+        """Переключение кнопок старта и отмены на время обработки"""
+        start_btn.config(state=tk.DISABLED if running else tk.NORMAL)
+        cancel_btn.config(state=tk.NORMAL if running else tk.DISABLED)
+    
+    def cancel_processing(self):
+        """Отмена текущей обработки: процессы утилиты завершаются сразу"""
+        self.cancel_event.set()
+        self.processor.cancel()
+        self.status_var.set("Отмена...")
+    
+    def create_profile_widgets(self, frame):
+        """Флажок профилирования и кнопка сохранения трассы"""
+        tk.Checkbutton(frame, text="Профилирование",
+                       variable=self.profile_var,
+                       font=('Arial', 10)).pack(side=tk.LEFT, padx=10)
+        tk.Button(frame, text="Сохранить трассу",
+                  command=self.save_trace,
+                  font=('Arial', 10)).pack(side=tk.LEFT, padx=10)
+    
+    def start_profiling(self):
+        """Сброс замеров перед запуском обработки"""
+        tracer.enabled = self.profile_var.get()
+        tracer.reset()
+    
+    def show_profile_summary(self, message=None):
+        """Итог запуска в строке состояния: message (по умолчанию текущее сообщение) и время этапов"""
+        message = message or self.status_var.get()
+        if tracer.enabled and tracer.events:
+            message = f"{message}. Этапы: {tracer.format_summary()}"
+        self.status_var.set(message)
+    
+    def save_trace(self):
+        """Сохранение замеров последнего запуска в формате Chrome trace"""
+        if not tracer.events:
+            messagebox.showwarning("Трасса", "Нет замеров: включите профилирование и запустите обработку")
+            return
+        
+        from tkinter import filedialog
+        filename = filedialog.asksaveasfilename(defaultextension=".json",
+                                                filetypes=[("Chrome trace", "*.json")],
+                                                initialfile="trace.json")
+        if not filename:
+            return
+        
+        try:
+            tracer.export_chrome_trace(filename)
+        except OSError as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить трассу:\n{str(e)}")
+    
+    def on_tab_changed(self, event):
+        """Обработчик переключения вкладок"""
+        selected_tab = self.notebook.index(self.notebook.select())
+        if selected_tab == 0:
+            self.current_mode = "demo"
+            self.status_var.set("Режим: Демонстрационный")
+        else:
+            self.current_mode = "research"
+            self.status_var.set("Режим: Исследование")
+    
+    def get_demo_parameters(self):
+        """Получение параметров демо режима из полей ввода"""
+        try:
+            values = {key: entry.get() for key, entry in self.demo_param_entries.items()}
+            return parse_params(values, DEMO_PARAMS)
+        except PipelineError as e:
+            messagebox.showerror("Ошибка", str(e))
+            return None
+    
+    def get_research_parameters(self):
+        """Получение параметров исследования из полей ввода"""
+        try:
+            values = {key: entry.get() for key, entry in self.research_param_entries.items()}
+            return parse_params(values, RESEARCH_PARAMS)
+        except PipelineError as e:
+            messagebox.showerror("Ошибка", str(e))
+            return None
+    
+    def on_closing(self):
+        """Обработчик закрытия приложения"""
+        if messagebox.askokcancel("Выход", "Вы уверены, что хотите выйти?"):
+            self.cancel_event.set()
+            self.processor.close()
+            if self.result_store is not None:
+                self.result_store.close()
+            if self.coordinator is not None:
+                self.coordinator.close()
+            if self.demo_executor is not None:
+                self.demo_executor.shutdown(wait=False, cancel_futures=True)
+            self.root.quit()
+            self.root.destroy()
+    
+    def get_result_store(self):
+        """Хранилище результатов в директории данных, открывается при первом обращении"""
+        if self.result_store is None:
+            os.makedirs(self.data_dir, exist_ok=True)
+            self.result_store = ResultStore(os.path.join(self.data_dir, STORE_FILE))
+        return self.result_store
+    
+    def get_coordinator(self):
+        """Координатор по адресу из поля ввода, None для локального расчета
+
+        Узлы остаются подключенными между исследованиями, координатор
+        пересоздается только при смене адреса.
+        """
+        address = self.coordinator_var.get().strip()
+        if self.coordinator is not None and self.coordinator.address != address:
+            self.coordinator.close()
+            self.coordinator = None
+        if not address or self.coordinator is not None:
+            return self.coordinator
+        
+        from processing import Coordinator
+        try:
+            self.coordinator = Coordinator(address, on_event=self.status_var.set)
+        except (OSError, ValueError) as e:
+            raise PipelineError(f"Не удалось запустить координатор {address}: {str(e)}")
+        # Адрес с портом 0 заменяется фактическим
+        self.coordinator_var.set(self.coordinator.address)
+        return self.coordinator
+    
+    def add_overlays(self):
+        """Наложение сохраненных кривых, выбранных по условиям из поля ввода"""
+        try:
+            filters = parse_filters(self.overlay_filter_var.get())
+            curves = self.get_result_store().curves(**filters)
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Ошибка", f"Ошибка выборки сохраненных кривых:\n{str(e)}")
+            return
+        
+        if not curves:
+            self.status_var.set("Сохраненных кривых с такими параметрами нет")
+            return
+        
+        known = {(curve["sweep_id"], curve["modulation"]) for curve in self.overlay_curves}
+        new_curves = [curve for curve in curves if (curve["sweep_id"], curve["modulation"]) not in known]
+        self.overlay_curves += new_curves[:max(0, self.max_overlays - len(self.overlay_curves))]
+        self.redraw_overlays()
+        self.status_var.set(f"Найдено кривых: {len(curves)}, наложено: {len(self.overlay_curves)}")
+    
+    def clear_overlays(self):
+        self.overlay_curves = []
+        self.redraw_overlays()
+    
+    def redraw_overlays(self):
+        """Перерисовка графика исследования; во время расчета - после его окончания"""
+        if self.live_plot is None:
+            self.show_research_plot(self.ber_data, self.research_snr)
+    
+    def draw_overlays(self):
+        """Сохраненные кривые пунктиром поверх текущих"""
+        for curve in self.overlay_curves:
+            params = curve["params"]
+            self.research_ax.semilogy(curve["snr"], curve["probability"], linestyle='--', linewidth=1,
+                                      color=CURVE_COLORS.get(curve["modulation"], 'black'),
+                                      marker=CURVE_MARKERS.get(curve["modulation"], 'o'),
+                                      markersize=4, alpha=0.6,
+                                      label=f"#{curve['sweep_id']} {curve['modulation']}: "
+                                            f"sigSize={params['sigSize']:g}, fd={params['fd']:g}, "
+                                            f"vel={params['vel']:g}, n_runs={params['n_runs']}")
+    
+    def show_load_progress(self, done, total):
+        """Отображение прогресса чтения текстового файла"""
+        if total > 0:
+            self.status_var.set(f"Загрузка: {done / total * 100:.0f}%")
+    
+    def run_demo_external(self, params):
+        """Демо обработка внешней утилитой с загрузкой записанных ею файлов"""
+        # Шаг 1: Проверка директорий
+        self.status_var.set("Проверка директорий...")
+        self.apply_timeout()
+        self.processor.check_directories()
+        
+        self.progress_var.set(10)
+        
+        # Шаг 2: Запуск внешней утилиты с параметрами
+        self.status_var.set("Запуск data_processing с параметрами...")
+        self.progress_var.set(20)
+        self.processor.run_demo(params)
+        
+        # Шаг 3: Загрузка сгенерированных файлов
+        self.status_var.set("Загрузка данных...")
+        return self.processor.load_demo(self.show_load_progress)
+    
+    def run_research_external(self, params):
+        """Исследование внешней утилитой, по одному запуску на точку SNR"""
+        def on_point(index, total, snr2, point):
+            self.status_var.set(f"Точка {index+1}/{total}, SNR={snr2:.2f} дБ")
+            self.progress_var.set(((index + 1) / total) * 90 + 5)  # 5-95%
+            for mod_name, probability in point.items():
+                self.live_queue.put(("point", mod_name, snr2, probability))
+        
+        self.apply_timeout()
+        snr_values, ber_data = self.processor.run_sweep(params, on_point, self.get_result_store())
+        self.research_trials = None
+        
+        return snr_values, ber_data
+    
+    def run_research_in_process(self, params):
+        """Параллельный расчет всех точек исследования встроенным вычислителем"""
+        def on_result(mod_name, snr2, result, done, total):
+            self.status_var.set(f"Точка {done}/{total}: {mod_name}, SNR={snr2:.2f} дБ")
+            self.progress_var.set(done / total * 90 + 5)  # 5-95%
+            self.live_queue.put(("point", mod_name, snr2, result["probability"]))
+        
+        if self.result_cache is None:
+            self.result_cache = ResultCache(os.path.join(self.data_dir, "cache"))
+        
+        coordinator = self.get_coordinator()
+        if coordinator is not None and coordinator.worker_count == 0:
+            self.status_var.set(f"Ожидание рабочих узлов: python main.py worker {coordinator.address}")
+        
+        snr_values, ber_data, self.research_trials = run_sweep_in_process(params, on_result,
+                                                                          self.result_cache,
+                                                                          cancel=self.cancel_event,
+                                                                          store=self.get_result_store(),
+                                                                          coordinator=coordinator)
+        
+        return snr_values, ber_data
+    
+    def show_demo_plots(self):
+        """Отображение графиков для демо режима"""
+        try:
+            # Очищаем графики
+            self.demo_ax1.clear()
+            self.demo_ax2.clear()
+            self.demo_ax3.clear()
+            
+            # 1. График первого комплексного сигнала
+            self.demo_lines = [
+                DecimatedLine(self.demo_ax1, np.real(self.signal1_data), 'b-', label='Сигнал 1 (I)', linewidth=1),
+                DecimatedLine(self.demo_ax1, np.imag(self.signal1_data), 'r-', label='Сигнал 1 (Q)', linewidth=1),
+            ]
+            self.demo_ax1.set_title('Сигнал 1 - Комплексные I/Q компоненты', fontsize=12)
+            self.demo_ax1.set_xlabel('Отсчеты', fontsize=10)
+            self.demo_ax1.set_ylabel('Амплитуда', fontsize=10)
+            self.demo_ax1.legend(fontsize=9)
+            self.demo_ax1.grid(True, alpha=0.3)
+            
+            # 2. График второго комплексного сигнала
+            self.demo_lines += [
+                DecimatedLine(self.demo_ax2, np.real(self.signal2_data), 'g-', label='Сигнал 2 (I)', linewidth=1),
+                DecimatedLine(self.demo_ax2, np.imag(self.signal2_data), 'm-', label='Сигнал 2 (Q)', linewidth=1),
+            ]
+            self.demo_ax2.set_title('Сигнал 2 - Комплексные I/Q компоненты', fontsize=12)
+            self.demo_ax2.set_xlabel('Отсчеты', fontsize=10)
+            self.demo_ax2.set_ylabel('Амплитуда', fontsize=10)
+            self.demo_ax2.legend(fontsize=9)
+            self.demo_ax2.grid(True, alpha=0.3)
+            
+            # 3. График модуля корреляции
+            self.demo_lines.append(DecimatedLine(self.demo_ax3, self.correlation_data, 'orange', linewidth=2))
+            self.demo_ax3.set_title('Модуль корреляции сигналов', fontsize=12)
+            self.demo_ax3.set_xlabel('Отсчеты', fontsize=10)
+            self.demo_ax3.set_ylabel('Амплитуда корреляции', fontsize=10)
+            self.demo_ax3.grid(True, alpha=0.3)
+            
+            # Помечаем максимум корреляции (по полным данным, не по прореженным)
+            max_idx = np.argmax(self.correlation_data)
+            max_val = self.correlation_data[max_idx]
+            self.demo_ax3.plot(max_idx, max_val, 'ro', markersize=8)
+            self.demo_ax3.annotate(f'Максимум: {max_val:.3f}\nОтсчет: {max_idx}', 
+                                 xy=(max_idx, max_val),
+                                 xytext=(max_idx + len(self.correlation_data)*0.1, max_val*0.9),
+                                 arrowprops=dict(arrowstyle='->', color='red'),
+                                 bbox=dict(boxstyle="round,pad=0.3", fc="yellow", alpha=0.3),
+                                 fontsize=9)
+            
+            # Обновляем canvas
+            self.demo_fig1.tight_layout()
+            self.demo_fig2.tight_layout()
+            self.demo_fig3.tight_layout()
+            
+            self.demo_canvas1.draw()
+            self.demo_canvas2.draw()
+            self.demo_canvas3.draw()
+            
+            self.status_var.set("Графики успешно отображены")
+            self.progress_var.set(100)
+            
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка при отображении графиков:\n{str(e)}")
+    
+    def poll_live_plot(self):
+        """Разбор очереди живого графика в главном потоке
+        
+        ("start", snr_values, y_min) - новые пустые кривые,
+        ("point", модуляция, snr, p) - точка, ("done", ber_data, snr_values,
+        сообщение) - итоговый график и итог в строке состояния. Все точки, пришедшие за период опроса, выводятся
+        одним обновлением.
+        """
+        updated = False
+        finished = False
+        while True:
+            try:
+                item = self.live_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if item[0] == "start":
+                if self.live_plot is not None:
+                    self.live_plot.close()
+                self.live_plot = LiveBerPlot(self.research_canvas, self.research_ax, *item[1:])
+            elif item[0] == "point" and self.live_plot is not None:
+                self.live_plot.add(*item[1:])
+                updated = True
+            elif item[0] == "done":
+                finished = True
+                if self.live_plot is not None:
+                    self.live_plot.close()
+                    self.live_plot = None
+                    updated = False
+                if item[1] is not None:
+                    with tracer.stage("draw"):
+                        self.show_research_plot(item[1], item[2])
+                    self.show_profile_summary(item[3])
+        
+        if updated:
+            self.live_plot.update()
+        if not finished:
+            self.root.after(self.live_poll_ms, self.poll_live_plot)
+    
+    def show_research_plot(self, ber_data, snr_values):
+        """Отображение графика BER для исследования"""
+        try:
+            self.ber_data = ber_data
+            self.research_snr = snr_values
+            
+            # Очищаем график
+            self.research_ax.clear()
+            
+            # Строим кривые для каждого типа модуляции
+            for mod_type, ber_values in (ber_data or {}).items():
+                if len(ber_values) == len(snr_values):
+                    self.research_ax.semilogy(snr_values, ber_values, 
+                                            color=CURVE_COLORS.get(mod_type, 'black'),
+                                            marker=CURVE_MARKERS.get(mod_type, 'o'),
+                                            label=CURVE_LABELS.get(mod_type, mod_type),
+                                            linewidth=2,
+                                            markersize=6)
+            
+            self.draw_overlays()
+            
+            self.research_ax.set_title('Зависимость Вероятности ошибки от SNR для различных типов модуляции', fontsize=14)
+            self.research_ax.set_xlabel('SNR (дБ)', fontsize=12)
+            self.research_ax.set_ylabel('Вероятность ошибки', fontsize=12)
+            self.research_ax.legend(fontsize=8 if self.overlay_curves else 10)
+            self.research_ax.grid(True, alpha=0.3, which='both')
+            self.research_ax.set_yscale('log')
+            
+            # Обновляем canvas
+            self.research_fig.tight_layout()
+            self.research_canvas.draw()
+            
+            self.status_var.set("График Вероятности успешно отображен")
+            self.progress_var.set(100)
+            
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка при отображении графика Вероятности ошибки:\n{str(e)}")
+    
+    def demo_processing_thread(self):
+        """Поток обработки данных для демо режима"""
+        try:
+            self.set_running(self.demo_start_btn, self.demo_cancel_btn, True)
+            self.cancel_event.clear()
+            self.progress_var.set(0)
+            
+            # Получаем параметры
+            self.status_var.set("Чтение параметров...")
+            self.start_profiling()
+            params = self.get_demo_parameters()
+            if params is None:
+                return
+            
+            shared = None
+            try:
+                if self.use_external_var.get():
+                    # Шаги 1-3: Запуск утилиты и загрузка ее файлов
+                    signal1, signal2, correlation = self.run_demo_external(params)
+                else:
+                    # Шаги 1-3: Генерация и корреляция в рабочем процессе,
+                    # результат передается через разделяемую память
+                    self.status_var.set("Генерация и корреляция сигналов...")
+                    self.progress_var.set(20)
+                    if self.demo_executor is None:
+                        self.demo_executor = ProcessPoolExecutor(max_workers=1)
+                    shared, _ = run_demo_in_worker(params, self.demo_executor, self.cancel_event)
+                    signal1, signal2, correlation = shared.arrays
+            except ProcessingCancelled:
+                self.status_var.set("Обработка отменена")
+                self.progress_var.set(0)
+                return
+            except PipelineError as e:
+                messagebox.showerror("Ошибка", str(e))
+                return
+            
+            self.signal1_data = signal1
+            self.signal2_data = signal2
+            self.correlation_data = correlation
+            self.progress_var.set(65)
+            
+            # Шаг 4: Отображение графиков
+            self.status_var.set("Построение графиков...")
+            with tracer.stage("draw"):
+                self.show_demo_plots()
+            
+            # Старые графики заменены, их сегменты больше не нужны
+            if self.demo_shared is not None:
+                self.demo_shared.release()
+            self.demo_shared = shared
+            self.show_profile_summary()
+            
+            messagebox.showinfo("Успех", "Обработка данных завершена успешно!")
+            
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка в процессе обработки: {str(e)}")
+        finally:
+            self.set_running(self.demo_start_btn, self.demo_cancel_btn, False)
+    
+    def research_processing_thread(self):
+        """Поток обработки данных для исследования"""
+        live_done = False
+        try:
+            self.set_running(self.research_start_btn, self.research_cancel_btn, True)
+            self.cancel_event.clear()
+            self.progress_var.set(0)
+            
+            # Получаем параметры
+            self.status_var.set("Чтение параметров исследования...")
+            self.start_profiling()
+            params = self.get_research_parameters()
+            if params is None:
+                return
+            
+            try:
+                validate_research_params(params)
+            except PipelineError as e:
+                messagebox.showerror("Ошибка", str(e))
+                return
+            
+            use_external = self.use_external_var.get()
+            self.progress_var.set(5)
+            
+            # Пустые кривые на всю сетку SNR, нижняя граница - одно попадание из n_runs
+            self.live_queue.put(("start", snr_grid(params["snr_min"], params["snr_max"], params["n_points"]),
+                                 0.5 / params["n_runs"]))
+            
+            # Шаги 1-5: Расчет всех точек SNR и загрузка результатов
+            try:
+                if use_external:
+                    snr_values, ber_data = self.run_research_external(params)
+                else:
+                    snr_values, ber_data = self.run_research_in_process(params)
+            except ProcessingCancelled:
+                self.status_var.set("Обработка отменена")
+                self.progress_var.set(0)
+                return
+            except PipelineError as e:
+                messagebox.showerror("Ошибка", str(e))
+                return
+            
+            # Шаг 6: Итоговый график (строится в главном потоке, там же
+            # выводится итог исследования и время этапов)
+            message = None
+            if not use_external and params["tolerance"] > 0:
+                trials = ", ".join(f"{mod_name}: {values.tolist()}"
+                                   for mod_name, values in self.research_trials.items())
+                message = f"Выполнено испытаний по точкам - {trials}"
+            self.status_var.set("Построение графика ...")
+            self.live_queue.put(("done", ber_data, snr_values, message))
+            live_done = True
+            
+            messagebox.showinfo("Успех", "Исследование завершено успешно!")
+            
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка в процессе исследования: {str(e)}")
+        finally:
+            # Без итоговых данных живой график остается как есть (отмена, ошибка)
+            if not live_done:
+                self.live_queue.put(("done", None, None, None))
+            self.set_running(self.research_start_btn, self.research_cancel_btn, False)
+    
+    def start_demo_processing(self):
+        """Запуск процесса обработки в отдельном потоке для демо режима"""
+        thread = threading.Thread(target=self.demo_processing_thread)
+        thread.daemon = True
+        thread.start()
+    
+    def start_research_processing(self):
+        """Запуск процесса исследования в отдельном потоке"""
+        thread = threading.Thread(target=self.research_processing_thread)
+        thread.daemon = True
+        thread.start()
+        self.root.after(self.live_poll_ms, self.poll_live_plot)
+
+def run():
+    """Запуск графического интерфейса"""
+    root = tk.Tk()
+    app = SignalAnalyzerApp(root)
+    root.mainloop()
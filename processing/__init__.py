@@ -0,0 +1,118 @@
+"""Вычислительное ядро анализатора сигналов без внешней утилиты data_processing
+
+Подмодули импортируются при первом обращении к их именам, поэтому,
+например, загрузчики файлов не тянут за собой БПФ и пул процессов.
+"""
+
+import importlib
+
+# Публичное имя -> подмодуль, в котором оно определено
+_EXPORTS = {
+    "POINT_PARAMS": "cache",
+    "ResultCache": "cache",
+    "key_digest": "cache",
+    "point_key": "cache",
+    "Correlator": "correlator",
+    "PreparedTemplate": "correlator",
+    "TemplateCache": "correlator",
+    "correlation_layout": "correlator",
+    "fast_fft_length": "correlator",
+    "fft_backend": "correlator",
+    "minmax_decimate": "decimate",
+    "run_demo": "demo",
+    "Coordinator": "distributed",
+    "DistributedScheduler": "distributed",
+    "parse_address": "distributed",
+    "run_worker": "distributed",
+    "start_workers": "distributed",
+    "DEMO_FILES": "fileio",
+    "load_array": "fileio",
+    "load_demo": "fileio",
+    "parse_complex_text": "fileio",
+    "parse_real_text": "fileio",
+    "save_array": "fileio",
+    "save_demo": "fileio",
+    "FilterBank": "filterbank",
+    "AMPLITUDE": "generator",
+    "FREQ": "generator",
+    "MODULATION_NAMES": "generator",
+    "NoiseInjector": "generator",
+    "PHASE": "generator",
+    "SignalGenerator": "generator",
+    "add_noise": "generator",
+    "shift_signal": "generator",
+    "shift_signal_batch": "generator",
+    "validate_params": "generator",
+    "GRID_AXES": "grid",
+    "Checkpoint": "grid",
+    "GridSweep": "grid",
+    "grid_slice": "grid",
+    "parse_axis": "grid",
+    "plot_grid": "grid",
+    "Job": "jobs",
+    "JobCancelled": "jobs",
+    "JobManager": "jobs",
+    "JobTimeout": "jobs",
+    "BER_FILES": "pipeline",
+    "CHOICE_PARAMS": "pipeline",
+    "DEMO_PARAMS": "pipeline",
+    "RESEARCH_PARAMS": "pipeline",
+    "ExternalProcessor": "pipeline",
+    "PipelineError": "pipeline",
+    "ProcessingCancelled": "pipeline",
+    "parse_params": "pipeline",
+    "run_demo_in_process": "pipeline",
+    "run_demo_in_worker": "pipeline",
+    "run_demo_shared": "pipeline",
+    "run_grid_in_process": "pipeline",
+    "run_sweep_in_process": "pipeline",
+    "sweep_table": "pipeline",
+    "validate_research_params": "pipeline",
+    "PRECISIONS": "precision",
+    "complex_dtype": "precision",
+    "real_dtype": "precision",
+    "Tracer": "profiling",
+    "tracer": "profiling",
+    "LatencyStats": "realtime",
+    "RealtimeDetector": "realtime",
+    "RingBuffer": "realtime",
+    "detect_stream": "realtime",
+    "follow_source": "realtime",
+    "open_source": "realtime",
+    "reader_source": "realtime",
+    "replay_source": "realtime",
+    "ResearchEngine": "research",
+    "wilson_half_width": "research",
+    "SharedArrays": "shared",
+    "discard": "shared",
+    "discard_result": "shared",
+    "publish": "shared",
+    "STORE_FILE": "store",
+    "ResultStore": "store",
+    "parse_filters": "store",
+    "StreamingCorrelator": "streaming",
+    "stream_search": "streaming",
+    "SweepCancelled": "sweep",
+    "SweepScheduler": "sweep",
+    "point_seed": "sweep",
+    "run_sweep_point": "sweep",
+    "snr_grid": "sweep",
+    "sweep_curves": "sweep",
+    "ServeUnsupported": "utility",
+    "UtilityWorker": "utility",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+
+# Параметры, от которых зависит результат точки исследования
+POINT_PARAMS = {
+    "fd": float,
+    "f": float,
+    "n": int,
+    "vel": float,
+    "snr_static": float,
+    "n_runs": int,
+    "sigSize": float,
+}
+
+
+def point_key(params, mod_name, snr2, seed):
+    """Полный набор параметров точки исследования вместе с зерном ГСЧ"""
+    key = {name: cast(params[name]) for name, cast in POINT_PARAMS.items()}
+    key.update(snr=float(snr2), modulation=mod_name, seed=int(seed),
+               tolerance=float(params.get("tolerance", 0.)),
+               precision=str(params.get("precision", "double")))
+    return key
+
+
+def key_digest(key):
+    """Хэш sha256 канонической JSON записи ключа"""
+    text = json.dumps(key, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Кэш результатов точек исследования на диске
+
+    Каждая точка хранится в отдельном JSON файле, имя которого - хэш ее
+    ключа. При чтении время изменения файла обновляется, при превышении
+    max_entries удаляются давно не использованные записи (LRU).
+    """
+
+    def __init__(self, directory, max_entries=10000):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(self.directory, exist_ok=True)
+        self.num_entries = len(self.entries())
+
+    def entries(self):
+        """Пути ко всем записям кэша"""
+        return [os.path.join(self.directory, name)
+                for name in os.listdir(self.directory) if name.endswith(".json")]
+
+    def path(self, key):
+        return os.path.join(self.directory, key_digest(key) + ".json")
+
+    def get(self, key):
+        """Результат точки или None, если его нет в кэше"""
+        path = self.path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        # Защита от коллизий и испорченных записей
+        if entry.get("key") != key:
+            return None
+
+        return entry["result"]
+
+    def put(self, key, result):
+        """Сохранение результата точки"""
+        path = self.path(key)
+        exists = os.path.exists(path)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"key": key, "result": result}, file)
+        os.replace(tmp_path, path)
+
+        if not exists:
+            self.num_entries += 1
+            if self.num_entries > self.max_entries:
+                self.evict()
+
+    def evict(self):
+        """Удаление давно не использованных записей до 90% от max_entries"""
+        entries = sorted(self.entries(), key=os.path.getmtime)
+        keep = int(self.max_entries * 0.9)
+
+        for path in entries[:max(0, len(entries) - keep)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+        self.num_entries = len(self.entries())
+
+    def clear(self):
+        """Удаление всех записей"""
+        for path in self.entries():
+            os.remove(path)
+        self.num_entries = 0
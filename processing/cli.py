@@ -0,0 +1,570 @@
+"""Командная строка: python main.py demo ... / sweep ... / grid ... / worker ... / search ... / bank ... / watch ... / results ...
+
+Работает без графического интерфейса и дисплея, результаты пишутся в
+JSON, CSV или бинарном формате (.npy/.npz).
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+from .cache import ResultCache
+from .fileio import load_array, parse_complex_text, save_demo
+from .pipeline import (CHOICE_PARAMS, DEMO_PARAMS, RESEARCH_PARAMS, ExternalProcessor, PipelineError,
+                       parse_params, run_demo_in_process, run_grid_in_process, run_sweep_in_process,
+                       sweep_table)
+from .precision import PRECISIONS, complex_dtype
+from .profiling import tracer
+
+
+def add_param_arguments(parser, defaults):
+    """Аргументы --<параметр> для каждого параметра из defaults"""
+    group = parser.add_argument_group("параметры обработки")
+    for key, default in defaults.items():
+        group.add_argument(f"--{key}", type=type(default), default=default,
+                           choices=CHOICE_PARAMS.get(key), help=f"по умолчанию {default}")
+
+
+def add_coordinator_arguments(parser):
+    """Параметры раздачи точек рабочим узлам (python main.py worker)"""
+    group = parser.add_argument_group("распределенный расчет")
+    group.add_argument("--coordinator", metavar="ADDRESS",
+                       help="раздавать точки рабочим узлам, слушая host:port или unix:/path")
+    group.add_argument("--local-workers", type=int, default=0, metavar="N",
+                       help="запустить N рабочих узлов на этой машине (с --coordinator)")
+    group.add_argument("--heartbeat-timeout", type=float, default=None,
+                       help="время молчания, после которого точки узла отдаются другим, с")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Анализатор сигналов без GUI")
+    parser.add_argument("--external", action="store_true",
+                        help="считать внешней утилитой data_processing вместо встроенного вычислителя")
+    parser.add_argument("--build-dir", default="build", help="директория утилиты data_processing")
+    parser.add_argument("--data-dir", default="data", help="директория файлов утилиты и кэша")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="замерить этапы обработки и сохранить трассу (Chrome trace JSON)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    demo = subparsers.add_parser("demo", help="демонстрационный прогон")
+    add_param_arguments(demo, DEMO_PARAMS)
+    demo.add_argument("-o", "--output", default="-",
+                      help="файл (json) или директория (npy) результата, '-' - stdout")
+    demo.add_argument("--format", choices=("json", "npy"), default="json")
+
+    sweep = subparsers.add_parser("sweep", help="исследование вероятности обнаружения от SNR")
+    add_param_arguments(sweep, RESEARCH_PARAMS)
+    sweep.add_argument("-o", "--output", default="-", help="файл результата, '-' - stdout")
+    sweep.add_argument("--format", choices=("json", "csv", "npz"), default="json")
+    sweep.add_argument("--workers", type=int, default=None,
+                       help="число процессов или одновременных запусков утилиты (по умолчанию все ядра)")
+    sweep.add_argument("--no-cache", action="store_true", help="не использовать кэш точек")
+    sweep.add_argument("--no-serve", action="store_true",
+                       help="с --external запускать утилиту на каждую точку, а не постоянные процессы --serve")
+    sweep.add_argument("--no-store", action="store_true",
+                       help="не записывать точки в хранилище результатов (см. команду results)")
+    add_coordinator_arguments(sweep)
+    sweep.add_argument("-q", "--quiet", action="store_true", help="не выводить прогресс")
+
+    grid = subparsers.add_parser("grid", help="исследование по многомерной сетке параметров")
+    add_param_arguments(grid, RESEARCH_PARAMS)
+    grid.add_argument("--axis", action="append", default=[], metavar="PARAM=VALUES",
+                      help="ось сетки: sigSize=10,30,50 или vel=5:20:4 (start:stop:count); "
+                           "без оси snr она строится по snr_min, snr_max, n_points")
+    grid.add_argument("--checkpoint", metavar="FILE",
+                      help="файл контрольных точек, повторный запуск с ним продолжает исследование")
+    grid.add_argument("-o", "--output", default="-", help="файл результата, '-' - stdout")
+    grid.add_argument("--format", choices=("json", "npz"), default="json")
+    grid.add_argument("--plot", metavar="FILE", help="сохранить графики (png, pdf, svg)")
+    grid.add_argument("--plot-kind", choices=("heatmap", "curves"), default="heatmap")
+    grid.add_argument("--plot-axes", nargs="+", default=None, metavar="AXIS",
+                      help="ось x и ось y (тепловая карта) или семейства кривых, по умолчанию snr и первая ось")
+    grid.add_argument("--workers", type=int, default=None, help="число процессов (по умолчанию все ядра)")
+    grid.add_argument("--no-cache", action="store_true", help="не использовать кэш точек")
+    grid.add_argument("--no-store", action="store_true",
+                      help="не записывать точки в хранилище результатов (см. команду results)")
+    add_coordinator_arguments(grid)
+    grid.add_argument("-q", "--quiet", action="store_true", help="не выводить прогресс")
+
+    worker = subparsers.add_parser("worker", help="рабочий узел распределенного исследования")
+    worker.add_argument("address", help="адрес координатора: host:port или unix:/path")
+    worker.add_argument("--slots", type=int, default=1, help="число процессов узла (обычно по числу ядер)")
+    worker.add_argument("--name", default=None, help="имя узла в сообщениях координатора")
+    worker.add_argument("--once", action="store_true",
+                        help="завершиться после отключения координатора, а не ждать следующего")
+    worker.add_argument("--heartbeat-timeout", type=float, default=None,
+                        help="время ожидания ответа координатора, с (как --heartbeat-timeout координатора)")
+
+    search = subparsers.add_parser("search", help="потоковый поиск шаблона в длинной записи")
+    search.add_argument("received", help="запись (.npy открывается через memmap, .txt - формат утилиты)")
+    search.add_argument("template", help="искомый фрагмент (.npy или .txt)")
+    search.add_argument("--top-k", type=int, default=10, help="число кандидатов")
+    search.add_argument("--n-fft", type=int, default=None, help="длина БПФ блока")
+    search.add_argument("--min-separation", type=int, default=None,
+                        help="минимальное расстояние между кандидатами (по умолчанию длина шаблона)")
+    search.add_argument("--precision", choices=tuple(PRECISIONS), default="double",
+                        help="точность вычислений (single - complex64)")
+    search.add_argument("-o", "--output", default="-", help="JSON файл результата, '-' - stdout")
+
+    bank = subparsers.add_parser("bank", help="проверка сигнала набором шаблонов за один проход")
+    bank.add_argument("received", help="принимаемый сигнал (.npy или .txt)")
+    bank.add_argument("templates", nargs="+", help="шаблоны (.npy или .txt)")
+    bank.add_argument("--precision", choices=tuple(PRECISIONS), default="double",
+                      help="точность вычислений (single - complex64)")
+    bank.add_argument("-o", "--output", default="-", help="JSON файл результата, '-' - stdout")
+
+    watch = subparsers.add_parser("watch", help="обнаружение шаблона в потоке в реальном времени")
+    watch.add_argument("template", help="искомый фрагмент (.npy или .txt)")
+    watch.add_argument("source", help="tcp:host:port, unix:/path, fifo:/path или файл; файл воспроизводится "
+                                      "с частотой --rate (с --follow - читается по мере дописывания)")
+    watch.add_argument("--rate", type=float, default=None,
+                       help="частота дискретизации, отсчетов/с (время событий и скорость воспроизведения)")
+    watch.add_argument("--follow", action="store_true", help="читать файл по мере дописывания (как tail -f)")
+    watch.add_argument("--idle-timeout", type=float, default=None,
+                       help="с --follow завершиться, если файл не растет дольше, с")
+    watch.add_argument("--sample-format", choices=("complex64", "complex128"), default="complex64",
+                       help="формат отсчетов потока и файлов, кроме .npy/.txt")
+    watch.add_argument("--frame", type=int, default=4096, help="отсчетов в кадре")
+    watch.add_argument("--threshold", type=float, default=0.5, help="порог нормированной метрики")
+    watch.add_argument("--n-fft", type=int, default=None, help="длина БПФ блока (меньше - меньше задержка)")
+    watch.add_argument("--min-separation", type=int, default=None,
+                       help="минимальное расстояние между событиями (по умолчанию длина шаблона)")
+    watch.add_argument("--queue", type=int, default=16, help="длина очереди кадров")
+    watch.add_argument("--overflow", choices=("drop", "block"), default="drop",
+                       help="при переполнении очереди: выбросить старые кадры или приостановить прием")
+    watch.add_argument("--duration", type=float, default=None, help="остановиться через, с")
+    watch.add_argument("--stats", metavar="FILE", help="сохранить статистику (JSON)")
+    watch.add_argument("-o", "--output", default="-", help="файл событий (JSON по строке), '-' - stdout")
+
+    results = subparsers.add_parser("results", help="выборка сохраненных кривых из хранилища результатов")
+    results.add_argument("filters", nargs="*", metavar="PARAM=VALUE",
+                         help="условия выборки, например modulation=BPSK sigSize=30 fd=20")
+    results.add_argument("-o", "--output", default="-", help="файл результата, '-' - stdout")
+    results.add_argument("--format", choices=("json", "csv"), default="json")
+
+    return parser
+
+
+def open_store(args):
+    """Хранилище результатов в директории данных"""
+    from .store import STORE_FILE, ResultStore
+
+    try:
+        os.makedirs(args.data_dir, exist_ok=True)
+        return ResultStore(os.path.join(args.data_dir, STORE_FILE))
+    except (OSError, ValueError) as e:
+        raise PipelineError(f"Не удалось открыть хранилище результатов: {str(e)}")
+
+
+@contextlib.contextmanager
+def open_coordinator(args, log):
+    """Координатор по --coordinator (None без него) и локальные узлы по --local-workers"""
+    if args.coordinator is None:
+        yield None
+        return
+
+    # Сокеты и пулы узлов нужны только распределенному расчету
+    from .distributed import HEARTBEAT_TIMEOUT, Coordinator, start_workers
+
+    heartbeat_timeout = args.heartbeat_timeout or HEARTBEAT_TIMEOUT
+    try:
+        coordinator = Coordinator(args.coordinator, heartbeat_timeout, on_event=log)
+    except (OSError, ValueError) as e:
+        raise PipelineError(f"Не удалось запустить координатор {args.coordinator}: {str(e)}")
+
+    processes = start_workers(coordinator.address, args.local_workers, heartbeat_timeout=heartbeat_timeout)
+    log(f"Координатор слушает {coordinator.address}, узлы: python main.py worker {coordinator.address}")
+    try:
+        yield coordinator
+    finally:
+        coordinator.close()
+        for process in processes:
+            process.terminate()
+
+
+def load_signal(filename):
+    """Комплексный сигнал из .npy (memmap) или текстового файла утилиты"""
+    try:
+        if filename.endswith(".npy"):
+            return load_array(filename)
+        return parse_complex_text(filename)
+    except (OSError, ValueError) as e:
+        raise PipelineError(f"Ошибка при чтении файла {filename}:\n{str(e)}")
+
+
+def open_output(path, binary=False):
+    """Файл для записи результата, '-' - стандартный вывод"""
+    if path == "-":
+        return contextlib.nullcontext(sys.stdout.buffer if binary else sys.stdout)
+    if binary:
+        return open(path, "wb")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def write_demo(args, signal1, signal2, correlation, max_metric_id):
+    """Запись результата демо прогона"""
+    if args.format == "npy":
+        if args.output == "-":
+            raise PipelineError("Для формата npy укажите директорию результата (--output)")
+        save_demo(args.output, signal1, signal2, correlation)
+        return
+
+    result = {
+        "max_metric_id": int(max_metric_id),
+        "max_metric": float(correlation[max_metric_id]),
+        "signal1": np.column_stack((np.real(signal1), np.imag(signal1))).tolist(),
+        "signal2": np.column_stack((np.real(signal2), np.imag(signal2))).tolist(),
+        "correlation": np.asarray(correlation).tolist(),
+    }
+    with open_output(args.output) as file:
+        json.dump(result, file)
+
+
+def write_sweep(args, params, snr_values, curves, trials):
+    """Запись результата исследования"""
+    if args.format == "npz":
+        arrays = {"snr": np.array(snr_values)}
+        arrays.update({f"p_{mod_name}": values for mod_name, values in curves.items()})
+        if trials is not None:
+            arrays.update({f"n_trials_{mod_name}": values for mod_name, values in trials.items()})
+        with open_output(args.output, binary=True) as file:
+            np.savez(file, **arrays)
+        return
+
+    rows = sweep_table(snr_values, curves, trials)
+    with open_output(args.output) as file:
+        if args.format == "csv":
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump({"params": params, "points": rows}, file, indent=1)
+
+
+def run_demo_command(args):
+    params = parse_params(vars(args), DEMO_PARAMS)
+
+    if args.external:
+        processor = ExternalProcessor(args.build_dir, args.data_dir)
+        try:
+            processor.check_directories()
+            processor.run_demo(params)
+        finally:
+            processor.close()
+        signal1, signal2, correlation = processor.load_demo()
+        max_metric_id = int(np.argmax(correlation))
+    else:
+        signal1, signal2, correlation, max_metric_id = run_demo_in_process(params)
+
+    write_demo(args, signal1, signal2, correlation, max_metric_id)
+
+
+def run_sweep_command(args):
+    params = parse_params(vars(args), RESEARCH_PARAMS)
+
+    def log(message):
+        if not args.quiet:
+            print(message, file=sys.stderr, flush=True)
+
+    if args.external:
+        def on_point(index, total, snr2, point):
+            probabilities = ", ".join(f"{mod_name}={p:.4f}" for mod_name, p in point.items())
+            log(f"Точка {index + 1}/{total}, SNR={snr2:.2f} дБ: {probabilities}")
+
+        # Прерывание (Ctrl+C) завершает запущенные процессы утилиты в close
+        def on_output(stream, line):
+            if stream == "stderr":
+                log(line)
+
+        store = None if args.no_store else open_store(args)
+        processor = ExternalProcessor(args.build_dir, args.data_dir, max_concurrent=args.workers,
+                                      on_output=on_output, persistent=not args.no_serve)
+        try:
+            snr_values, curves = processor.run_sweep(params, on_point, store)
+        finally:
+            processor.close()
+            if store is not None:
+                store.close()
+        trials = None
+    else:
+        def on_result(mod_name, snr2, result, done, total):
+            log(f"Точка {done}/{total}: {mod_name}, SNR={snr2:.2f} дБ, "
+                f"p={result['probability']:.4f}, испытаний: {result['n_trials']}")
+
+        cache = None if args.no_cache else ResultCache(os.path.join(args.data_dir, "cache"))
+        store = None if args.no_store else open_store(args)
+        try:
+            with open_coordinator(args, log) as coordinator:
+                snr_values, curves, trials = run_sweep_in_process(params, on_result, cache, args.workers,
+                                                                  store=store, coordinator=coordinator)
+        finally:
+            if store is not None:
+                store.close()
+
+    write_sweep(args, params, snr_values, curves, trials)
+
+
+def write_grid(args, params, axes, probability, n_trials):
+    """Запись результата исследования по сетке"""
+    if args.format == "npz":
+        arrays = {f"axis_{name}": np.array(values) for name, values in axes.items()}
+        arrays.update({f"p_{mod_name}": values for mod_name, values in probability.items()})
+        arrays.update({f"n_trials_{mod_name}": values for mod_name, values in n_trials.items()})
+        with open_output(args.output, binary=True) as file:
+            np.savez(file, **arrays)
+        return
+
+    result = {
+        "params": params,
+        "axes": axes,
+        "probability": {mod_name: values.tolist() for mod_name, values in probability.items()},
+        "n_trials": {mod_name: values.tolist() for mod_name, values in n_trials.items()},
+    }
+    with open_output(args.output) as file:
+        json.dump(result, file)
+
+
+def run_grid_command(args):
+    from .grid import parse_axis, plot_grid
+
+    params = parse_params(vars(args), RESEARCH_PARAMS)
+    try:
+        axes = dict(parse_axis(text) for text in args.axis)
+    except ValueError as e:
+        raise PipelineError(str(e))
+
+    def log(message):
+        if not args.quiet:
+            print(message, file=sys.stderr, flush=True)
+
+    def on_result(mod_name, point, snr2, result, done, total):
+        values = ", ".join(f"{name}={point[name]:g}" for name in axes if name != "snr")
+        log(f"Точка {done}/{total}: {mod_name}, SNR={snr2:.2f} дБ{', ' + values if values else ''}, "
+            f"p={result['probability']:.4f}")
+
+    cache = None if args.no_cache else ResultCache(os.path.join(args.data_dir, "cache"))
+    store = None if args.no_store else open_store(args)
+    try:
+        with open_coordinator(args, log) as coordinator:
+            axes, probability, n_trials = run_grid_in_process(params, axes, on_result, cache, args.workers,
+                                                              checkpoint=args.checkpoint, store=store,
+                                                              coordinator=coordinator)
+    finally:
+        if store is not None:
+            store.close()
+
+    write_grid(args, params, axes, probability, n_trials)
+
+    if args.plot:
+        plot_axes = args.plot_axes or ["snr"] + [name for name in axes if name != "snr"][:1]
+        try:
+            figure = plot_grid(probability, axes, plot_axes[0], plot_axes[1] if len(plot_axes) > 1 else None,
+                               args.plot_kind)
+            figure.savefig(args.plot)
+        except (OSError, ValueError) as e:
+            raise PipelineError(f"Ошибка построения графиков: {str(e)}")
+
+
+def run_worker_command(args):
+    from .distributed import HEARTBEAT_TIMEOUT, run_worker, start_workers
+
+    def log(message):
+        print(message, file=sys.stderr, flush=True)
+
+    heartbeat_timeout = args.heartbeat_timeout or HEARTBEAT_TIMEOUT
+
+    try:
+        if args.slots > 1:
+            processes = start_workers(args.address, args.slots, not args.once, args.name, heartbeat_timeout)
+            for process in processes:
+                process.join()
+        else:
+            run_worker(args.address, args.name, reconnect=not args.once, on_event=log,
+                       heartbeat_timeout=heartbeat_timeout)
+    except (OSError, ValueError) as e:
+        raise PipelineError(f"Нет связи с координатором {args.address}: {str(e)}")
+
+
+def run_search_command(args):
+    from .streaming import stream_search
+
+    received = load_signal(args.received)
+    template = load_signal(args.template)
+
+    try:
+        candidates = stream_search(received, template, args.top_k, args.n_fft, args.min_separation,
+                                   dtype=complex_dtype(args.precision))
+    except ValueError as e:
+        raise PipelineError(str(e))
+
+    result = {
+        "samples": len(received),
+        "template_size": len(template),
+        "candidates": [{"index": index, "score": score} for index, score in candidates],
+    }
+    with open_output(args.output) as file:
+        json.dump(result, file, indent=1)
+
+
+def run_bank_command(args):
+    from .filterbank import FilterBank
+
+    received = load_signal(args.received)
+    templates = [load_signal(filename) for filename in args.templates]
+
+    try:
+        bank = FilterBank(templates, names=args.templates, dtype=complex_dtype(args.precision))
+        _, peak_ids, peak_scores = bank.correlate(received)
+    except ValueError as e:
+        raise PipelineError(str(e))
+
+    best = int(np.argmax(peak_scores))
+    result = {
+        "best": bank.names[best],
+        "templates": [{"template": name, "max_metric_id": int(peak_id), "max_metric": float(score)}
+                      for name, peak_id, score in zip(bank.names, peak_ids, peak_scores)],
+    }
+    with open_output(args.output) as file:
+        json.dump(result, file, indent=1)
+
+
+async def open_watch_source(args):
+    """Асинхронный источник кадров команды watch"""
+    from .realtime import SAMPLE_FORMATS, open_source, replay_source
+
+    dtype = SAMPLE_FORMATS[args.sample_format]
+    path = args.source[5:] if args.source.startswith("fifo:") else args.source
+    if args.source.startswith(("tcp:", "unix:", "fifo:")) or args.follow or not os.path.isfile(path):
+        return await open_source(args.source, dtype, args.frame, args.idle_timeout)
+
+    if args.rate is None:
+        raise PipelineError("Для воспроизведения файла укажите --rate (или --follow)")
+    if path.endswith((".npy", ".txt")):
+        data = load_signal(path)
+    else:
+        try:
+            data = np.memmap(path, dtype=dtype, mode="r")
+        except (OSError, ValueError) as e:
+            raise PipelineError(f"Ошибка при чтении файла {path}:\n{str(e)}")
+
+    return replay_source(data, args.rate, args.frame)
+
+
+def run_watch_command(args):
+    import asyncio
+    import signal
+
+    from .realtime import RealtimeDetector, detect_stream
+
+    template = load_signal(args.template)
+    try:
+        detector = RealtimeDetector(template, args.threshold, args.n_fft, args.min_separation, args.rate)
+    except ValueError as e:
+        raise PipelineError(str(e))
+
+    async def watch(file):
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        # Ctrl+C и --duration завершают прием, статистика все равно выводится
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(signal.SIGINT, stop.set)
+        if args.duration is not None:
+            loop.call_later(args.duration, stop.set)
+
+        def on_detection(event):
+            file.write(json.dumps(event) + "\n")
+            file.flush()
+
+        try:
+            source = await open_watch_source(args)
+            return await detect_stream(source, detector, args.queue, args.overflow, on_detection, stop)
+        finally:
+            with contextlib.suppress(NotImplementedError):
+                loop.remove_signal_handler(signal.SIGINT)
+
+    with open_output(args.output) as file:
+        try:
+            stats = asyncio.run(watch(file))
+        except (OSError, ValueError) as e:
+            raise PipelineError(f"Ошибка источника {args.source}: {str(e)}")
+
+    latency = ", ".join(f"{name} {value:.2f}" for name, value in stats["latency_ms"].items())
+    print(f"Отсчетов: {stats['samples']}, событий: {stats['detections']}, "
+          f"выброшено кадров: {stats['dropped_frames']} из {stats['frames']}, "
+          f"задержка, мс: {latency or '-'}", file=sys.stderr)
+    if args.stats:
+        with open(args.stats, "w", encoding="utf-8") as file:
+            json.dump(stats, file, indent=1)
+
+
+def run_results_command(args):
+    from .store import parse_filters
+
+    try:
+        filters = parse_filters(" ".join(args.filters))
+    except ValueError as e:
+        raise PipelineError(str(e))
+
+    store = open_store(args)
+    try:
+        curves = store.curves(**filters)
+    finally:
+        store.close()
+
+    def trials(curve):
+        # Для точек внешней утилиты без числа испытаний - None
+        return [None if np.isnan(n) else int(n) for n in curve["n_trials"]]
+
+    with open_output(args.output) as file:
+        if args.format == "csv":
+            rows = [dict(sweep_id=curve["sweep_id"], modulation=curve["modulation"], **curve["params"],
+                         snr=snr2, probability=p, n_trials=n)
+                    for curve in curves
+                    for snr2, p, n in zip(curve["snr"], curve["probability"], trials(curve))]
+            if rows:
+                writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            json.dump([dict(curve, snr=curve["snr"].tolist(), probability=curve["probability"].tolist(),
+                            n_trials=trials(curve))
+                       for curve in curves], file, indent=1)
+
+
+def main(argv=None):
+    """Точка входа командной строки, возвращает код завершения"""
+    args = build_parser().parse_args(argv)
+    tracer.enabled = args.trace is not None
+
+    try:
+        with tracer.stage(args.command):
+            if args.command == "demo":
+                run_demo_command(args)
+            elif args.command == "search":
+                run_search_command(args)
+            elif args.command == "bank":
+                run_bank_command(args)
+            elif args.command == "grid":
+                run_grid_command(args)
+            elif args.command == "worker":
+                run_worker_command(args)
+            elif args.command == "watch":
+                run_watch_command(args)
+            elif args.command == "results":
+                run_results_command(args)
+            else:
+                run_sweep_command(args)
+    except PipelineError as e:
+        print(f"Ошибка: {str(e)}", file=sys.stderr)
+        return 1
+
+    if args.trace:
+        tracer.export_chrome_trace(args.trace)
+        print(f"Этапы: {tracer.format_summary()}", file=sys.stderr)
+
+    return 0
@@ -0,0 +1,235 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from .profiling import tracer
+
+_fft = None
+
+
+def fft_backend():
+    """Модуль БПФ: scipy.fft, если установлен, иначе numpy.fft
+
+    Импорт выполняется при первом вызове - scipy заметно замедляет запуск.
+    """
+    global _fft
+    if _fft is None:
+        try:
+            from scipy import fft
+        except ImportError:  # scipy не обязателен, numpy.fft дает тот же результат
+            from numpy import fft
+        _fft = fft
+    return _fft
+
+
+def power_of_two_length(size):
+    """Ближайшая сверху степень двойки (длина БПФ в cpp/Correlator.cpp)"""
+    n_fft = 1
+    while n_fft < size:
+        n_fft <<= 1
+    return n_fft
+
+
+def fast_fft_length(size):
+    """Наименьшее число вида 2^a * 3^b * 5^c, не меньшее size
+
+    БПФ таких длин почти так же быстры, как степени двойки, а дополнение
+    нулями до них бывает заметно короче.
+    """
+    best = power_of_two_length(size)
+
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            # Наименьшее power35 * 2^k >= size
+            n = power35
+            while n < size:
+                n <<= 1
+            best = min(best, n)
+            power35 *= 3
+        power5 *= 5
+
+    return best
+
+
+def correlation_layout(corr, size_a, size_b):
+    """Модуль циклической корреляции corr в раскладке findCorrelation
+
+    Результат длиной size_a + size_b - 1: положительные сдвиги, затем хвост,
+    как у БПФ длины степени двойки n_pow2 - нули и отрицательные сдвиги
+    в конце циклической корреляции.
+    """
+    n_fft = corr.shape[-1]
+    size_out = size_a + size_b - 1
+    corr_out = np.abs(corr[..., :size_out])
+
+    n_pow2 = power_of_two_length(size_out)
+    if n_fft != n_pow2:
+        tail_start = max(size_a, n_pow2 - size_b + 1)
+        corr_out[..., size_a:tail_start] = 0.
+        offset = n_fft - n_pow2
+        corr_out[..., tail_start:] = np.abs(corr[..., tail_start + offset:size_out + offset])
+
+    return corr_out
+
+
+def template_digest(template):
+    """Идентификатор шаблона по содержимому (для кэша без явного template_id)"""
+    template = np.ascontiguousarray(template, dtype=np.complex128)
+    digest = hashlib.blake2b(template.view(np.uint8), digest_size=16)
+    digest.update(str(template.shape).encode())
+    return digest.hexdigest()
+
+
+class PreparedTemplate:
+    """Центрированный шаблон с сопряженным спектром длины n_fft и энергией
+
+    Шаблон (или строки блока шаблонов (n_templates, n)) центрируется и
+    преобразуется один раз, после чего коррелируется с любым числом
+    принимаемых сигналов длиной до n_fft - size + 1. dtype - комплексный
+    тип спектра (complex64 в режиме single).
+    """
+
+    def __init__(self, template, n_fft, template_id=None, dtype=np.complex128):
+        template = np.asarray(template, dtype=dtype)
+        if template.shape[-1] > n_fft:
+            raise ValueError(f"FFT length {n_fft} is less than the template size {template.shape[-1]}")
+
+        centered = template - template.mean(axis=-1, keepdims=True)
+
+        self.template_id = template_id
+        self.size = template.shape[-1]
+        self.n_fft = n_fft
+        self.dtype = template.dtype
+        self.energy = np.sum(centered.real ** 2 + centered.imag ** 2, axis=-1, keepdims=True)
+        self.spectrum = np.conj(fft_backend().fft(centered, n_fft, axis=-1))
+
+
+class TemplateCache:
+    """Кэш PreparedTemplate по (template_id, n_fft, dtype) с вытеснением давно не использованных"""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, template, n_fft, template_id=None, dtype=np.complex128):
+        """Подготовленный шаблон, спектр считается только при промахе
+
+        Без template_id шаблон идентифицируется хэшем содержимого.
+        """
+        if template_id is None:
+            template_id = template_digest(template)
+
+        key = (template_id, n_fft, np.dtype(dtype).str)
+        prepared = self.entries.get(key)
+        if prepared is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return prepared
+
+        self.misses += 1
+        prepared = PreparedTemplate(template, n_fft, template_id, dtype)
+        self.entries[key] = prepared
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return prepared
+
+    def clear(self):
+        self.entries.clear()
+
+
+class Correlator:
+    """Корреляционный приемник, повторяющий Correlator из cpp/Correlator.cpp
+
+    Вторым сигналом может быть PreparedTemplate; с template_cache
+    (TemplateCache) шаблоны-массивы подготавливаются через кэш. dtype -
+    комплексный тип вычислений (complex64 вдвое экономит память).
+    """
+
+    # Порог нормировки, как в findCorrelation
+    min_normalizer = 1e-12
+
+    def __init__(self, template_cache=None, dtype=np.complex128):
+        self.n_fft = 1
+        self.template_cache = template_cache
+        self.dtype = np.dtype(dtype)
+
+    @staticmethod
+    def fft_length(size_out):
+        """Длина БПФ - ближайшая сверху 2·3·5-гладкая длина
+
+        cpp/Correlator.cpp берет степень двойки, раскладка результата
+        приводится к ней в correlation_layout.
+        """
+        return fast_fft_length(size_out)
+
+    def prepare(self, data_b, size_a, template_id=None):
+        """PreparedTemplate для корреляции с сигналами длиной size_a"""
+        data_b = np.asarray(data_b, dtype=self.dtype)
+        n_fft = self.fft_length(size_a + data_b.shape[-1] - 1)
+
+        if self.template_cache is not None:
+            return self.template_cache.get(data_b, n_fft, template_id, self.dtype)
+        return PreparedTemplate(data_b, n_fft, template_id, self.dtype)
+
+    def find_correlation(self, data_a, data_b):
+        """Модуль нормированной взаимной корреляции data_a и data_b
+
+        Блоки (n_trials, n) обрабатываются построчно одним БПФ по последней оси.
+        """
+        data_a = np.asarray(data_a, dtype=self.dtype)
+        size_a = data_a.shape[-1]
+
+        with tracer.stage("normalize"):
+            template = data_b if isinstance(data_b, PreparedTemplate) else self.prepare(data_b, size_a)
+
+            # Центрирование
+            a_centered = data_a - data_a.mean(axis=-1, keepdims=True)
+
+            # Нормировка на энергию
+            energy_a = np.sum(a_centered.real ** 2 + a_centered.imag ** 2, axis=-1, keepdims=True)
+            normalizer = np.maximum(np.sqrt(energy_a * template.energy), self.min_normalizer)
+
+        size_out = size_a + template.size - 1
+        if template.n_fft < size_out:
+            raise ValueError(f"Template prepared for FFT length {template.n_fft}, {size_out} required")
+        self.n_fft = template.n_fft
+
+        # Корреляция через БПФ с дополнением нулями
+        with tracer.stage("fft", n_fft=self.n_fft):
+            fft = fft_backend()
+            a_fft = fft.fft(a_centered, self.n_fft, axis=-1)
+            a_fft *= template.spectrum
+            corr = fft.ifft(a_fft, axis=-1)
+
+            return correlation_layout(corr, size_a, template.size) / normalizer
+
+    @staticmethod
+    def template_size(data_b):
+        return data_b.size if isinstance(data_b, PreparedTemplate) else np.shape(data_b)[-1]
+
+    def correlate(self, data_a, data_b):
+        """Корреляция и индекс ее максимума"""
+        if self.template_size(data_b) > len(data_a):
+            raise ValueError("Error in correlate function. Size of data_a less then the size of data_b")
+
+        corr_out = self.find_correlation(data_a, data_b)
+
+        with tracer.stage("peak"):
+            max_metric_id = int(np.argmax(corr_out))
+
+        return corr_out, max_metric_id
+
+    def correlate_batch(self, data_a, data_b):
+        """Индексы максимумов корреляции для каждой строки блоков (n_trials, n)"""
+        if self.template_size(data_b) > data_a.shape[-1]:
+            raise ValueError("Error in correlate function. Size of data_a less then the size of data_b")
+
+        corr_out = self.find_correlation(data_a, data_b)
+
+        with tracer.stage("peak"):
+            return np.argmax(corr_out, axis=-1)
@@ -0,0 +1,38 @@
+import numpy as np
+
+
+def minmax_decimate(data, start, stop, n_bins):
+    """Огибающая min/max отрезка data[start:stop] не более чем из 2 * n_bins точек
+
+    Отрезок делится на n_bins интервалов, из каждого берутся минимум и
+    максимум в порядке их следования, поэтому экстремумы (в том числе
+    глобальный максимум) сохраняются. Возвращает (x, y), где x - индексы
+    отсчетов в исходном массиве.
+    """
+    start = max(0, int(start))
+    stop = min(len(data), int(stop))
+    n_bins = max(1, int(n_bins))
+
+    segment = np.asarray(data[start:stop])
+    size = segment.size
+
+    if size <= 2 * n_bins:
+        return np.arange(start, stop), segment
+
+    bin_size = -(-size // n_bins)
+    n_full = size // bin_size
+    rows = segment[:n_full * bin_size].reshape(n_full, bin_size)
+
+    offsets = np.arange(n_full) * bin_size
+    ids = np.stack((offsets + rows.argmin(axis=1), offsets + rows.argmax(axis=1)), axis=1)
+
+    # Неполный последний интервал
+    if n_full * bin_size < size:
+        tail = segment[n_full * bin_size:]
+        tail_ids = n_full * bin_size + np.array([[tail.argmin(), tail.argmax()]])
+        ids = np.concatenate((ids, tail_ids))
+
+    ids.sort(axis=1)
+    ids = ids.ravel()
+
+    return start + ids, segment[ids]
@@ -0,0 +1,38 @@
+import numpy as np
+
+from .correlator import Correlator
+from .generator import NoiseInjector, SignalGenerator, shift_signal
+from .precision import complex_dtype
+from .profiling import tracer
+
+
+def run_demo(params, rng=None, correlator=None):
+    """Демонстрационный прогон (DataProcessor::run() без записи файлов)
+
+    Точность задается params["precision"] ("double" по умолчанию или "single").
+    Возвращает (signal1, signal2, correlation, max_metric_id).
+    """
+    rng = np.random.default_rng(rng)
+    dtype = complex_dtype(params.get("precision", "double"))
+    correlator = correlator or Correlator(dtype=dtype)
+
+    generator = SignalGenerator(params, int(params["type"]), rng, dtype)
+
+    with tracer.stage("generate"):
+        # Generate large part
+        first_signal = generator.generate()
+
+        # Generate min part
+        shifted_size = int(params["sigSize"] / 100. * first_signal.size)
+        if params["dt"] < 0:
+            raise ValueError(f"Invalid d_t: {params['dt']}")
+        second_signal = shift_signal(first_signal, shifted_size, params["dt"])
+
+    with tracer.stage("noise"):
+        noise = NoiseInjector(rng)
+        noise.add_noise(first_signal, params["snr1"])
+        noise.add_noise(second_signal, params["snr2"])
+
+    correlation, max_metric_id = correlator.correlate(first_signal, second_signal)
+
+    return first_signal, second_signal, correlation, max_metric_id
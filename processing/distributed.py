@@ -0,0 +1,690 @@
+"""Распределенное исследование: координатор и рабочие узлы
+
+Координатор раздает точки исследования рабочим узлам (python main.py
+worker АДРЕС) по TCP ("host:port") или Unix сокету ("unix:/path").
+Сообщения - JSON с 4-байтовым префиксом длины. Узел сам запрашивает
+следующую точку, как только освобождается, поэтому быстрые машины
+забирают больше работы. Во время расчета узел шлет heartbeat; точки узла,
+который отключился или молчит дольше heartbeat_timeout, возвращаются в
+очередь. Когда очередь пуста, свободный узел получает копию точки, которая
+считается намного дольше типичной готовой точки сеанса (отставший узел):
+результат точки определяется ее ключом (см. point_seed), поэтому
+засчитывается первая пришедшая копия, остальным узлам отправляется
+cancel, и они прерывают расчет.
+"""
+
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import socketserver
+import stat
+import statistics
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .profiling import tracer
+from .sweep import (SweepCancelled, SweepScheduler, point_seed, record_worker_pid, run_sweep_point,
+                    terminate_workers)
+
+# Префикс сообщения - длина JSON в байтах
+_HEADER = struct.Struct("!I")
+
+# Максимальная длина сообщения, байт
+MAX_MESSAGE = 64 * 1024 * 1024
+
+# Период heartbeat узла и время молчания, после которого узел считается потерянным, с
+HEARTBEAT_INTERVAL = 1.0
+HEARTBEAT_TIMEOUT = 10.0
+
+# Пауза узла, которому нечего считать, и пауза перед переподключением, с
+IDLE_DELAY = 0.5
+RECONNECT_DELAY = 1.0
+
+
+class ProtocolError(Exception):
+    """Некорректное сообщение от другой стороны соединения"""
+
+
+def parse_address(address):
+    """Адрес "unix:/path", "host:port" или ":port" -> (семейство сокета, адрес)"""
+    if address.startswith("unix:"):
+        if not address[5:]:
+            raise ValueError(f"Invalid address: {address}, expected unix:/path")
+        return socket.AF_UNIX, address[5:]
+
+    host, sep, port = address.rpartition(":")
+    try:
+        port = int(port)
+    except ValueError:
+        port = -1
+    if not sep or not 0 <= port < 65536:
+        raise ValueError(f"Invalid address: {address}, expected host:port or unix:/path")
+    return socket.AF_INET, (host.strip("[]"), port)
+
+
+def connect(address, timeout=None):
+    """Соединение с координатором по адресу address"""
+    family, target = parse_address(address)
+    if family == socket.AF_UNIX:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(timeout)
+            sock.connect(target)
+        except OSError:
+            sock.close()
+            raise
+    else:
+        host, port = target
+        sock = socket.create_connection((host or "localhost", port), timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.settimeout(None)
+    return sock
+
+
+def _json_default(value):
+    # Скаляры numpy в результатах и замерах
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def send_message(sock, message):
+    """Отправка словаря message одним кадром"""
+    data = json.dumps(message, default=_json_default, separators=(",", ":")).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(sock):
+    """Прием кадра, словарь или None, если соединение закрыто"""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    size, = _HEADER.unpack(header)
+    if size > MAX_MESSAGE:
+        raise ProtocolError(f"Message too large: {size} bytes")
+
+    data = _recv_exact(sock, size)
+    if data is None:
+        return None
+    try:
+        message = json.loads(data.decode("utf-8"))
+    except ValueError:
+        raise ProtocolError("Message is not valid JSON")
+    if not isinstance(message, dict) or "type" not in message:
+        raise ProtocolError("Message has no type")
+    return message
+
+
+class _WorkerState:
+    """Подключенный рабочий узел на стороне координатора"""
+
+    def __init__(self, worker_id, sock, name):
+        self.id = worker_id
+        self.sock = sock
+        self.name = name
+        self.last_seen = time.monotonic()
+        self.tasks = set()
+        self.completed = 0
+        self.send_lock = threading.Lock()
+
+
+class _Session:
+    """Точки одного запуска Coordinator.run"""
+
+    def __init__(self, number, tasks):
+        self.number = number
+        self.tasks = tasks
+        self.queue = deque(tasks)
+        self.running = {}
+        self.started = {}
+        self.done = set()
+        # Время расчета готовых точек, с
+        self.durations = []
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.server.coordinator.serve_worker(self.request)
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class Coordinator:
+    """Сервер, раздающий точки исследования рабочим узлам
+
+        with Coordinator("0.0.0.0:5555") as coordinator:
+            scheduler = DistributedScheduler(coordinator, seed=0)
+            results = scheduler.run(params, snr_values)
+
+    Сервер принимает узлы в фоновых потоках с момента создания и до
+    close(), узлы остаются подключенными между запусками run, так что
+    одного координатора достаточно на весь сеанс GUI. on_event(text)
+    получает сообщения о подключении и потере узлов. Копия точки выдается,
+    только если точка считается дольше speculate_after медиан времени
+    готовых точек сеанса, и не более max_copies копий на точку.
+    """
+
+    # Период проверки отмены и heartbeat узлов, с
+    poll_interval = 0.1
+
+    def __init__(self, address, heartbeat_timeout=HEARTBEAT_TIMEOUT, max_copies=2, speculate_after=2.,
+                 on_event=None):
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_copies = max_copies
+        self.speculate_after = speculate_after
+        self.on_event = on_event
+        self.lock = threading.Lock()
+        self.workers = {}
+        self.session = None
+        self.results = queue.Queue()
+        self._worker_ids = itertools.count(1)
+        self._session_numbers = itertools.count(1)
+
+        family, target = parse_address(address)
+        self.unix_path = None
+        if family == socket.AF_UNIX:
+            # Файл сокета, оставшийся от упавшего координатора
+            if os.path.exists(target) and stat.S_ISSOCK(os.stat(target).st_mode):
+                os.unlink(target)
+            self.server = _UnixServer(target, _Handler)
+            self.unix_path = target
+            self.address = address
+        else:
+            self.server = _TCPServer(target, _Handler)
+            host, port = self.server.server_address[:2]
+            self.address = f"{target[0] or host}:{port}"
+        self.server.coordinator = self
+
+        self.thread = threading.Thread(target=self.server.serve_forever, name="coordinator", daemon=True)
+        self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        """Остановка сервера и отключение всех узлов"""
+        self.server.shutdown()
+        self.server.server_close()
+        with self.lock:
+            workers = list(self.workers.values())
+        for worker in workers:
+            self._disconnect(worker)
+        if self.unix_path is not None and os.path.exists(self.unix_path):
+            os.unlink(self.unix_path)
+
+    def _event(self, text):
+        if self.on_event is not None:
+            self.on_event(text)
+
+    @property
+    def worker_count(self):
+        with self.lock:
+            return len(self.workers)
+
+    def wait_for_workers(self, count=1, timeout=None):
+        """Ожидание подключения count узлов, True если дождались"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.worker_count < count:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+        return True
+
+    def serve_worker(self, sock):
+        """Обслуживание соединения одного узла (в потоке сервера)"""
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        worker = None
+        try:
+            message = recv_message(sock)
+            if message is None or message["type"] != "hello":
+                return
+
+            with self.lock:
+                worker = _WorkerState(next(self._worker_ids), sock, message.get("name", "?"))
+                self.workers[worker.id] = worker
+            self._event(f"Узел {worker.name} подключен")
+
+            while True:
+                message = recv_message(sock)
+                if message is None:
+                    break
+
+                worker.last_seen = time.monotonic()
+                if message["type"] == "request":
+                    self._send(worker, self._next_task(worker))
+                elif message["type"] in ("result", "error"):
+                    self._complete(worker, message)
+                elif message["type"] != "heartbeat":
+                    raise ProtocolError(f"Unknown message type: {message['type']}")
+        except (OSError, ProtocolError) as e:
+            if worker is not None:
+                self._event(f"Узел {worker.name}: {e}")
+        finally:
+            if worker is not None:
+                self._drop_worker(worker)
+
+    def _send(self, worker, message):
+        # Ответы идут из потока узла, отмены - из потоков других узлов и run
+        with worker.send_lock:
+            send_message(worker.sock, message)
+
+    def _cancel_copies(self, copies, session_number):
+        """Отправка cancel узлам, считающим уже ненужные точки [(узел, task_id)]"""
+        for worker, task_id in copies:
+            try:
+                self._send(worker, {"type": "cancel", "session": session_number, "task_id": task_id})
+            except OSError:
+                # Разрыв обработает поток этого узла
+                pass
+
+    def _next_task(self, worker):
+        with self.lock:
+            session = self.session
+            task_id = None
+            if session is not None:
+                while session.queue and task_id is None:
+                    task_id = session.queue.popleft()
+                    if task_id in session.done:
+                        task_id = None
+                if task_id is None:
+                    task_id = self._steal(session, worker)
+
+            if task_id is None:
+                return {"type": "wait", "delay": IDLE_DELAY}
+
+            session.running.setdefault(task_id, []).append(worker.id)
+            session.started.setdefault(task_id, time.monotonic())
+            worker.tasks.add(task_id)
+            return dict(session.tasks[task_id], type="task", session=session.number, task_id=task_id,
+                        trace=tracer.enabled)
+
+    def _steal(self, session, worker):
+        # Пока ни одна точка не готова, неизвестно, что считать отставанием
+        if not session.durations:
+            return None
+
+        # Самая давняя из отстающих точек, у которой меньше max_copies копий
+        deadline = time.monotonic() - self.speculate_after * statistics.median(session.durations)
+        candidates = [task_id for task_id, holders in session.running.items()
+                      if worker.id not in holders and len(holders) < self.max_copies
+                      and session.started[task_id] < deadline]
+        return min(candidates, key=session.started.__getitem__, default=None)
+
+    def _complete(self, worker, message):
+        with self.lock:
+            task_id = message.get("task_id")
+            worker.tasks.discard(task_id)
+            session = self.session
+            if session is None or message.get("session") != session.number or task_id in session.done:
+                return
+
+            session.done.add(task_id)
+            session.durations.append(time.monotonic() - session.started.pop(task_id))
+            copies = []
+            for worker_id in session.running.pop(task_id, []):
+                if worker_id in self.workers:
+                    self.workers[worker_id].tasks.discard(task_id)
+                    if worker_id != worker.id:
+                        copies.append((self.workers[worker_id], task_id))
+            worker.completed += 1
+        self.results.put((session.number, task_id, message))
+        self._cancel_copies(copies, session.number)
+
+    def _drop_worker(self, worker):
+        with self.lock:
+            if self.workers.pop(worker.id, None) is None:
+                return
+            requeued = 0
+            session = self.session
+            if session is not None:
+                for task_id in worker.tasks:
+                    holders = session.running.get(task_id, [])
+                    if worker.id in holders:
+                        holders.remove(worker.id)
+                    if not holders and task_id not in session.done:
+                        session.running.pop(task_id, None)
+                        session.started.pop(task_id, None)
+                        session.queue.appendleft(task_id)
+                        requeued += 1
+            worker.tasks.clear()
+
+        self._disconnect(worker)
+        self._event(f"Узел {worker.name} отключен" + (f", точек возвращено в очередь: {requeued}"
+                                                       if requeued else ""))
+
+    def _disconnect(self, worker):
+        try:
+            worker.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _check_workers(self):
+        now = time.monotonic()
+        with self.lock:
+            silent = [worker for worker in self.workers.values()
+                      if now - worker.last_seen > self.heartbeat_timeout]
+        for worker in silent:
+            self._event(f"Узел {worker.name} не отвечает {now - worker.last_seen:.1f} с")
+            self._drop_worker(worker)
+
+    def run(self, tasks, on_result=None, cancel=None):
+        """Расчет точек tasks {task_id: {"params", "signal_type", "snr2", "key"}} на узлах
+
+        on_result(task_id, result) вызывается по мере готовности в потоке,
+        запустившем run. Ошибка параметров на узле выбрасывается как
+        ValueError. При установке cancel run выбрасывает SweepCancelled.
+        Узлам, которые считают точки завершенного или прерванного запуска,
+        отправляется cancel.
+        """
+        with self.lock:
+            if self.session is not None:
+                raise RuntimeError("Coordinator is already running a sweep")
+            session = self.session = _Session(next(self._session_numbers), tasks)
+
+        remaining = set(tasks)
+        try:
+            while remaining:
+                if cancel is not None and cancel.is_set():
+                    raise SweepCancelled("Sweep cancelled")
+                self._check_workers()
+
+                try:
+                    number, task_id, message = self.results.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    continue
+                if number != session.number:
+                    continue
+                if message["type"] == "error":
+                    raise ValueError(message.get("error", "worker error"))
+
+                tracer.merge(message.get("events", []))
+                remaining.discard(task_id)
+                if on_result is not None:
+                    on_result(task_id, message["result"])
+        finally:
+            with self.lock:
+                self.session = None
+                copies = []
+                for task_id, holders in session.running.items():
+                    for worker_id in holders:
+                        if worker_id in self.workers:
+                            self.workers[worker_id].tasks.discard(task_id)
+                            copies.append((self.workers[worker_id], task_id))
+            self._cancel_copies(copies, session.number)
+
+
+class DistributedScheduler(SweepScheduler):
+    """SweepScheduler, считающий точки на рабочих узлах координатора
+
+    Кэш, ключи и зерна точек - как у локального пула, поэтому результаты
+    совпадают с локальным расчетом при том же seed.
+    """
+
+    def __init__(self, coordinator, seed=None, cache=None):
+        super().__init__(max_workers=1, seed=seed, cache=cache)
+        self.coordinator = coordinator
+
+    def execute(self, tasks, pending, add_result, cancel):
+        keys = dict(pending)
+        payloads = {}
+        for index, key in pending:
+            params, signal_type, snr2 = tasks[index]
+            payloads[index] = {"params": params, "signal_type": signal_type, "snr2": snr2, "key": key}
+
+        def on_result(index, result):
+            if self.cache is not None:
+                self.cache.put(keys[index], result)
+            add_result(index, result)
+
+        self.coordinator.run(payloads, on_result, cancel)
+
+
+class _PointRunner:
+    """Процесс узла, в котором считаются точки
+
+    Точка считается в отдельном процессе, а не в потоке узла, чтобы по
+    cancel координатора расчет можно было остановить сразу: close()
+    завершает процесс, следующая точка запускает новый. Гибель процесса
+    (нехватка памяти, сигнал) приходит как point_error с BrokenProcessPool.
+    """
+
+    def __init__(self):
+        self.executor = None
+        self.pids = None
+
+    def start(self, message, on_done):
+        """Запуск точки задания message, on_done(kind, value) - "point" или "point_error" """
+        if self.executor is None:
+            context = multiprocessing.get_context()
+            self.pids = context.SimpleQueue()
+            self.executor = ProcessPoolExecutor(max_workers=1, mp_context=context,
+                                                initializer=record_worker_pid, initargs=(self.pids,))
+        future = self.executor.submit(run_sweep_point, message["params"], message["signal_type"],
+                                      message["snr2"], point_seed(message["key"]), message.get("trace", False))
+
+        def done(future):
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is None:
+                on_done("point", future.result())
+            else:
+                on_done("point_error", error)
+
+        future.add_done_callback(done)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            terminate_workers(self.pids)
+            self.pids.close()
+            self.executor = None
+            self.pids = None
+
+
+def _serve_coordinator(sock, name, stop, runner, heartbeat_timeout):
+    """Цикл узла на одном соединении до stop или разрыва"""
+    # Несколько heartbeat за время ожидания координатора
+    interval = min(HEARTBEAT_INTERVAL, heartbeat_timeout / 4)
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            send_message(sock, message)
+
+    # Сообщения координатора и готовые точки: ("message", сообщение),
+    # ("closed", None), ("failed", исключение), ("point" | "point_error", (задание, значение))
+    inbox = queue.Queue()
+    finished = threading.Event()
+
+    def receive():
+        try:
+            while True:
+                message = recv_message(sock)
+                if message is None:
+                    inbox.put(("closed", None))
+                    return
+                inbox.put(("message", message))
+        except (OSError, ProtocolError) as e:
+            inbox.put(("failed", e))
+
+    def heartbeat():
+        while not finished.wait(interval):
+            try:
+                send({"type": "heartbeat"})
+            except OSError:
+                return
+
+    def next_item(timeout=None):
+        try:
+            kind, value = inbox.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"coordinator did not respond in {timeout} s")
+        if kind == "closed":
+            raise ConnectionResetError("connection closed")
+        if kind == "failed":
+            raise value
+        return kind, value
+
+    busy = False
+    send({"type": "hello", "name": name})
+    for target, thread_name in ((receive, "receive"), (heartbeat, "heartbeat")):
+        threading.Thread(target=target, name=thread_name, daemon=True).start()
+    try:
+        while not stop.is_set():
+            send({"type": "request"})
+            # Ответ на запрос приходит сразу, долгое молчание - потерянный
+            # координатор; отмены уже посчитанных точек пропускаются
+            while True:
+                _, message = next_item(heartbeat_timeout)
+                if message["type"] != "cancel":
+                    break
+
+            if message["type"] == "wait":
+                stop.wait(message.get("delay", IDLE_DELAY))
+                continue
+            if message["type"] != "task":
+                raise ProtocolError(f"Unknown message type: {message['type']}")
+
+            task = (message["session"], message["task_id"])
+            runner.start(message, lambda kind, value, task=task: inbox.put((kind, (task, value))))
+            busy = True
+            while True:
+                kind, value = next_item()
+                if kind == "message":
+                    if value["type"] != "cancel":
+                        raise ProtocolError(f"Unexpected message type: {value['type']}")
+                    if (value["session"], value["task_id"]) == task:
+                        runner.close()
+                        break
+                elif value[0] == task:
+                    break
+            busy = False
+            if kind == "message":
+                continue
+
+            reply = {"session": task[0], "task_id": task[1]}
+            _, value = value
+            if kind == "point_error":
+                if isinstance(value, BrokenProcessPool):
+                    # Процесс точек погиб: соединение закрывается (и heartbeat
+                    # прекращается), координатор сразу возвращает точку в очередь
+                    runner.close()
+                    raise value
+                if not isinstance(value, ValueError):
+                    raise value
+                send(dict(reply, type="error", error=str(value)))
+            else:
+                _, _, result, events = value
+                send(dict(reply, type="result", result=result, events=events))
+    finally:
+        finished.set()
+        # Точка прерванного соединения уже отдана другому узлу
+        if busy:
+            runner.close()
+
+
+def run_worker(address, name=None, reconnect=True, stop=None, on_event=None,
+               heartbeat_timeout=HEARTBEAT_TIMEOUT):
+    """Рабочий узел: подключается к координатору и считает выдаваемые точки
+
+    При reconnect узел ждет координатора и переподключается после разрыва
+    (перезапуск координатора, новое исследование), пока не установлено
+    событие stop; иначе возвращается после первого разрыва.
+    heartbeat_timeout - как у координатора: столько узел ждет ответа
+    координатора, heartbeat отправляются в несколько раз чаще.
+    """
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    stop = stop or threading.Event()
+    connected = False
+    runner = _PointRunner()
+    try:
+        while not stop.is_set():
+            try:
+                sock = connect(address, timeout=RECONNECT_DELAY * 5)
+            except OSError as e:
+                if not reconnect:
+                    raise
+                if connected and on_event is not None:
+                    on_event(f"{name}: нет связи с координатором {address}: {e}")
+                connected = False
+                stop.wait(RECONNECT_DELAY)
+                continue
+
+            if on_event is not None:
+                on_event(f"{name}: подключен к {address}")
+            connected = True
+            try:
+                _serve_coordinator(sock, name, stop, runner, heartbeat_timeout)
+            except ConnectionError:
+                if on_event is not None:
+                    on_event(f"{name}: координатор закрыл соединение")
+            except (OSError, ProtocolError, BrokenProcessPool) as e:
+                if on_event is not None:
+                    on_event(f"{name}: {e}")
+            finally:
+                # shutdown будит поток приема и сразу сообщает координатору о разрыве
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                sock.close()
+
+            if not reconnect:
+                return
+            stop.wait(RECONNECT_DELAY)
+    finally:
+        runner.close()
+
+
+def _worker_process(address, name, reconnect, heartbeat_timeout):
+    # terminate() - обычный выход, чтобы завершился и процесс точек узла
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    run_worker(address, name, reconnect, heartbeat_timeout=heartbeat_timeout)
+
+
+def start_workers(address, count, reconnect=True, name=None, heartbeat_timeout=HEARTBEAT_TIMEOUT):
+    """Запуск count узлов в отдельных процессах этой машины, список процессов
+
+    Узел запускает собственный процесс точек, поэтому процессы узлов не
+    daemon: их нужно завершать через terminate().
+    """
+    name = name or socket.gethostname()
+    processes = []
+    for i in range(count):
+        process = multiprocessing.Process(target=_worker_process,
+                                          args=(address, f"{name}/{i}", reconnect, heartbeat_timeout))
+        process.start()
+        processes.append(process)
+    return processes
@@ -0,0 +1,101 @@
+import os
+
+import numpy as np
+
+# Файлы демо режима: (имя без расширения, комплексные ли данные)
+DEMO_FILES = [
+    ("first_data", True),
+    ("second_data", True),
+    ("correlation", False),
+]
+
+
+# Размер блока чтения текстовых файлов
+TEXT_CHUNK_SIZE = 4 * 1024 ** 2
+
+# Скобки и разделители текстового формата Utils::write заменяются пробелами
+_TEXT_SEPARATORS = bytes.maketrans(b"(),;\t\r\n", b"       ")
+
+
+def _parse_text(filename, delimiters, chunk_size, progress):
+    """Поблочный разбор текстового файла в массив float64
+
+    Блок обрезается по последнему из delimiters, хвост переносится в
+    следующий блок, поэтому числа на границе блоков не разрываются.
+    """
+    total_size = os.path.getsize(filename)
+    parts = []
+    done = 0
+    rest = b""
+
+    with open(filename, "rb") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            done += len(chunk)
+
+            if chunk:
+                data = rest + chunk
+                cut = max(data.rfind(delimiter) for delimiter in delimiters) + 1
+                data, rest = data[:cut], data[cut:]
+            else:
+                data, rest = rest, b""
+
+            # Блок из одних разделителей fromstring разбирает как [-1.]
+            text = data.translate(_TEXT_SEPARATORS)
+            if text.strip():
+                parts.append(np.fromstring(text, sep=" "))
+
+            if progress is not None:
+                progress(done, total_size)
+
+            if not chunk:
+                break
+
+    return np.concatenate(parts) if parts else np.empty(0)
+
+
+def parse_complex_text(filename, chunk_size=TEXT_CHUNK_SIZE, progress=None):
+    """Чтение текстового файла "(re,im), (re,im), ..." в массив complex128
+
+    progress(прочитано_байт, всего_байт) вызывается после каждого блока.
+    """
+    values = _parse_text(filename, (b")",), chunk_size, progress)
+    if values.size % 2:
+        raise ValueError(f"Odd number of values in complex file {filename}")
+
+    return values.view(np.complex128)
+
+
+def parse_real_text(filename, chunk_size=TEXT_CHUNK_SIZE, progress=None):
+    """Чтение текстового файла с действительными числами в массив float64"""
+    return _parse_text(filename, (b",", b" ", b"\n"), chunk_size, progress)
+
+
+def save_array(filename, data, dtype=None):
+    """Сохранение массива в бинарном формате .npy"""
+    data = np.asarray(data, dtype=dtype)
+    with open(filename, "wb") as file:
+        np.save(file, data)
+
+
+def load_array(filename):
+    """Открытие .npy файла как np.memmap, данные читаются с диска по мере обращения"""
+    return np.load(filename, mmap_mode="r")
+
+
+def save_demo(data_dir, signal1, signal2, correlation):
+    """Сохранение результатов демо режима в data_dir в формате .npy
+
+    Массивы одинарной точности (complex64/float32) сохраняются как есть.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    arrays = (np.asarray(signal1), np.asarray(signal2), np.asarray(correlation))
+
+    for (name, is_complex), data in zip(DEMO_FILES, arrays):
+        dtype = np.result_type(data, np.complex64 if is_complex else np.float32)
+        save_array(os.path.join(data_dir, name + ".npy"), data, dtype)
+
+
+def load_demo(data_dir):
+    """Открытие результатов демо режима из data_dir, (signal1, signal2, correlation)"""
+    return tuple(load_array(os.path.join(data_dir, name + ".npy")) for name, _ in DEMO_FILES)
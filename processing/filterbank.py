@@ -0,0 +1,99 @@
+"""Банк согласованных фильтров: один принимаемый сигнал против многих шаблонов
+
+Принимаемый сигнал преобразуется один раз, спектры шаблонов (из
+TemplateCache) складываются в блок (n_templates, n_fft), и умножение с
+обратным БПФ выполняются одной пакетной операцией по всем шаблонам.
+"""
+
+import numpy as np
+
+from .correlator import Correlator, TemplateCache, correlation_layout, fft_backend
+from .profiling import tracer
+
+
+class FilterBank:
+    """Набор шаблонов (возможно разной длины) с именами
+
+        bank = FilterBank([am, bpsk, mfm], names=["AM", "PM", "FM"])
+        corr, peak_ids, peak_scores = bank.correlate(received)
+
+    Строка i матрицы корреляции совпадает с Correlator.find_correlation(
+    received, templates[i]), дополненной нулями до самого длинного шаблона.
+    dtype - комплексный тип вычислений (complex64 в режиме single).
+    """
+
+    def __init__(self, templates, names=None, template_cache=None, dtype=np.complex128):
+        self.dtype = np.dtype(dtype)
+        self.templates = [np.asarray(template, dtype=self.dtype) for template in templates]
+        if not self.templates:
+            raise ValueError("Filter bank must contain at least one template")
+        if any(template.ndim != 1 or len(template) == 0 for template in self.templates):
+            raise ValueError("Templates must be non-empty 1-D arrays")
+
+        self.names = list(names) if names is not None else [str(i) for i in range(len(self.templates))]
+        if len(self.names) != len(self.templates):
+            raise ValueError(f"Got {len(self.names)} names for {len(self.templates)} templates")
+
+        self.sizes = np.array([len(template) for template in self.templates])
+        self.template_cache = template_cache if template_cache is not None else TemplateCache()
+        # Блок спектров и энергии для последней длины БПФ
+        self.prepared = None
+
+    def __len__(self):
+        return len(self.templates)
+
+    def prepare(self, n_fft):
+        """Блок сопряженных спектров (n_templates, n_fft) и энергии (n_templates, 1)
+
+        Спектры отдельных шаблонов берутся из template_cache, поэтому при
+        смене длины принимаемого сигнала пересчитываются только новые.
+        """
+        if self.prepared is None or self.prepared[0] != n_fft:
+            templates = [self.template_cache.get(template, n_fft, dtype=self.dtype) for template in self.templates]
+            self.prepared = (n_fft,
+                             np.stack([template.spectrum for template in templates]),
+                             np.concatenate([template.energy for template in templates])[:, None])
+        return self.prepared[1:]
+
+    def find_correlation(self, received):
+        """Матрица (n_templates, len(received) + max_size - 1) модулей нормированной корреляции"""
+        received = np.asarray(received, dtype=self.dtype)
+        size_a = len(received)
+        max_size = int(self.sizes.max())
+        if max_size > size_a:
+            raise ValueError("Error in correlate function. Size of data_a less then the size of data_b")
+
+        n_fft = Correlator.fft_length(size_a + max_size - 1)
+        spectra, energies = self.prepare(n_fft)
+
+        with tracer.stage("normalize"):
+            centered = received - received.mean()
+            energy = np.sum(centered.real ** 2 + centered.imag ** 2)
+            normalizer = np.maximum(np.sqrt(energy * energies), Correlator.min_normalizer)
+
+        with tracer.stage("fft", n_fft=n_fft, n_templates=len(self)):
+            fft = fft_backend()
+            products = fft.fft(centered, n_fft) * spectra
+            corr = fft.ifft(products, axis=-1)
+
+            corr_out = np.zeros((len(self), size_a + max_size - 1), dtype=np.finfo(self.dtype).dtype)
+            for i, size in enumerate(self.sizes):
+                corr_out[i, :size_a + size - 1] = correlation_layout(corr[i], size_a, size)
+
+            return corr_out / normalizer
+
+    def correlate(self, received):
+        """Матрица корреляции, индексы и значения максимумов по шаблонам"""
+        corr_out = self.find_correlation(received)
+
+        with tracer.stage("peak"):
+            peak_ids = np.argmax(corr_out, axis=-1)
+            peak_scores = corr_out[np.arange(len(self)), peak_ids]
+
+        return corr_out, peak_ids, peak_scores
+
+    def best_match(self, received):
+        """Лучше всего совпавший шаблон: (имя, индекс максимума, значение)"""
+        _, peak_ids, peak_scores = self.correlate(received)
+        best = int(np.argmax(peak_scores))
+        return self.names[best], int(peak_ids[best]), float(peak_scores[best])
@@ -0,0 +1,173 @@
+import numpy as np
+
+PI_2 = 2 * np.pi
+
+# Типы модуляции (SignalType из cpp/Generator.h)
+AMPLITUDE = 0  # AM
+PHASE = 1      # BPSK
+FREQ = 2       # MFM
+
+MODULATION_NAMES = {AMPLITUDE: "AM", PHASE: "PM", FREQ: "FM"}
+
+
+def validate_params(params):
+    """Проверка параметров генератора, как в BaseGenerator::configure"""
+    if params["fd"] <= 0.:
+        raise ValueError(f"Invalid parameters fd: {params['fd']}")
+    if params["f"] <= 0.:
+        raise ValueError(f"Invalid parameters f: {params['f']}")
+    if params["n"] <= 0:
+        raise ValueError(f"Invalid parameters numBits: {params['n']}")
+    if params["vel"] <= 0.:
+        raise ValueError(f"Invalid parameters infoVel: {params['vel']}")
+
+    # Koef for normal trasmission (F_info / f << 1)
+    koeff = 1. / params["vel"] / params["f"]
+    if koeff >= 0.1:
+        raise ValueError(f"Invalid parameters infoVel. F_info / f_carrier = {koeff}, (koeff << 1)")
+    if params["f"] * 2 > params["fd"]:
+        raise ValueError("Invalid parameters fd and f. fd >= 2 * f")
+
+
+class SignalGenerator:
+    """Генератор информационного сигнала (BaseGenerator из cpp/Generator.cpp)
+
+    dtype - комплексный тип результата; фаза всегда считается в float64.
+    """
+
+    def __init__(self, params, signal_type, rng=None, dtype=np.complex128):
+        validate_params(params)
+        if signal_type not in MODULATION_NAMES:
+            raise ValueError(f"Error in modulation type! Type: {signal_type}")
+
+        self.rng = np.random.default_rng(rng)
+        self.signal_type = signal_type
+        self.dtype = np.dtype(dtype)
+        self.num_bits = int(params["n"])
+
+        # Num samples = numBits * infoVel * fd
+        self.num_samples = int(params["n"] * params["vel"] * params["fd"])
+        self.samples_per_bit = int(params["vel"] * params["fd"])
+
+        # phase = ph0 + f * t, where t = n * T
+        self.d_phase = params["f"] / params["fd"]
+        self.d_phase_freq_mod = (params["f"] * (1 + 0.5) / params["fd"],
+                                 params["f"] * (1 - 0.5) / params["fd"])
+
+        # Число отсчетов каждого информационного бита: бит меняется после
+        # отсчетов i = k * samples_per_bit, поэтому первый бит на один отсчет длиннее
+        sample_ids = np.arange(self.num_samples)
+        bit_ids = np.minimum(np.maximum(sample_ids - 1, 0) // self.samples_per_bit, self.num_bits - 1)
+        self.bit_counts = np.bincount(bit_ids, minlength=self.num_bits)
+
+        # Фаза несущей без начальной фазы для AM и BPSK
+        self.carrier_phase = self.d_phase * sample_ids
+
+    def generate(self):
+        """Генерация одной реализации сигнала"""
+        return self.generate_batch(1)[0]
+
+    def expand_bits(self, values):
+        """Значения по битам (n_trials, num_bits) -> по отсчетам (n_trials, num_samples)"""
+        return np.repeat(values, self.bit_counts, axis=-1)
+
+    def generate_batch(self, n_trials):
+        """Генерация блока независимых реализаций, массив (n_trials, num_samples)
+
+        Фаза считается в float64, косинус записывается сразу в действительную
+        часть результата, модуляция умножается на месте.
+        """
+        bits = self.rng.integers(0, 2, (n_trials, self.num_bits))
+        phase0 = self.rng.random((n_trials, 1)) * PI_2
+
+        if self.signal_type == FREQ:
+            # Набег фазы по битам, фаза накапливается cumsum
+            d_phase = self.expand_bits(np.where(bits, *self.d_phase_freq_mod))
+            phase = np.empty((n_trials, self.num_samples))
+            phase[:, :1] = phase0
+            np.cumsum(d_phase[:, :-1], axis=1, out=phase[:, 1:])
+            phase[:, 1:] += phase0
+        else:
+            phase = np.add(phase0, self.carrier_phase)
+
+        signal = np.empty((n_trials, self.num_samples), dtype=self.dtype)
+        np.cos(phase, out=signal.real)
+        signal.imag = 0.
+
+        # Амплитуда AM (1 или 2) или знак BPSK (-1 или 1) по отсчетам
+        if self.signal_type == AMPLITUDE:
+            signal.real *= self.expand_bits((1. + bits).astype(signal.real.dtype))
+        elif self.signal_type == PHASE:
+            signal.real *= self.expand_bits((2. * bits - 1.).astype(signal.real.dtype))
+
+        return signal
+
+
+def shift_signal(data_in, shifted_size, n_shift):
+    """Вырезка искомого фрагмента со сдвигом n_shift отсчетов"""
+    size = len(data_in)
+    if size < shifted_size:
+        raise ValueError(f"Invalid shifted_size: {shifted_size} while size of data_in: {size}")
+
+    n_shift = int(n_shift)
+    if n_shift < 0 or n_shift + shifted_size > size:
+        raise ValueError(f"Invalid n_shift: {n_shift}, size: {size}, shifted_size: {shifted_size}")
+
+    return data_in[n_shift:n_shift + shifted_size].copy()
+
+
+def shift_signal_batch(data_in, shifted_size, n_shift):
+    """Вырезка фрагментов из каждой строки блока со своими сдвигами n_shift"""
+    n_shift = np.asarray(n_shift, dtype=np.int64)
+    if np.any(n_shift < 0) or np.any(n_shift + shifted_size > data_in.shape[-1]):
+        raise ValueError(f"Invalid n_shift for size: {data_in.shape[-1]}, shifted_size: {shifted_size}")
+
+    ids = n_shift[:, None] + np.arange(shifted_size)
+    return np.take_along_axis(data_in, ids, axis=-1)
+
+
+class NoiseInjector:
+    """АБГШ с заданным SNR, добавляемый на месте (NoiseInjector из cpp/Generator.cpp)
+
+    Нормальные отсчеты пишутся в буфер, который переиспользуется между
+    вызовами, поэтому при неизменном размере блока add_noise ничего не
+    выделяет. Для блока (n_trials, n) энергия считается по каждой
+    реализации отдельно, шум генерируется в точности data.
+    """
+
+    def __init__(self, rng=None):
+        self.rng = np.random.default_rng(rng)
+        self.scratch = None
+
+    def buffer(self, shape, dtype):
+        """Буфер нужной формы, перевыделяется только при нехватке места"""
+        size = int(np.prod(shape))
+        if self.scratch is None or self.scratch.dtype != dtype or self.scratch.size < size:
+            self.scratch = np.empty(size, dtype=dtype)
+        return self.scratch[:size].reshape(shape)
+
+    def add_noise(self, data, snr):
+        """Добавление шума к комплексному массиву data на месте, возвращает data"""
+        scratch = self.buffer(data.shape, data.real.dtype)
+
+        np.square(data.real, out=scratch)
+        energy = scratch.sum(axis=-1, keepdims=True)
+        np.square(data.imag, out=scratch)
+        energy += scratch.sum(axis=-1, keepdims=True)
+
+        # noise = energy / 10^snr
+        noise_power = energy / 10 ** snr
+        std = np.sqrt(noise_power / 2.)
+
+        for part in (data.real, data.imag):
+            self.rng.standard_normal(dtype=scratch.dtype, out=scratch)
+            scratch *= std
+            part += scratch
+
+        return data
+
+
+def add_noise(data, snr, rng):
+    """Копия data с добавленным АБГШ с заданным SNR (NoiseInjector::addNoise)"""
+    data = np.array(data, dtype=np.result_type(data, np.complex64))
+    return NoiseInjector(rng).add_noise(data, snr)
@@ -0,0 +1,305 @@
+"""Исследование по многомерной сетке параметров с контрольными точками
+
+Сетка - декартово произведение значений осей (SNR × sigSize × vel × fd
+...), каждая точка сетки считается для всех типов модуляции на пуле
+процессов (SweepScheduler.run_tasks). Готовые точки сразу записываются в
+журнал контрольных точек (дописыванием строки), поэтому прерванное или
+упавшее исследование при повторном запуске с тем же файлом продолжается
+с места остановки. plot_grid строит тепловые карты или семейства кривых.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .cache import key_digest, point_key
+from .generator import MODULATION_NAMES
+from .sweep import SweepScheduler
+
+# Параметры, по которым может идти сетка, и их типы (snr - SNR второго сигнала)
+GRID_AXES = {
+    "snr": float,
+    "snr_static": float,
+    "sigSize": float,
+    "vel": float,
+    "fd": float,
+    "f": float,
+    "n": int,
+    "n_runs": int,
+}
+
+
+def parse_axis(text):
+    """Ось сетки из строки "sigSize=10,30,50" или "vel=5:20:4" (start:stop:count, включая stop)"""
+    name, sep, values = text.partition("=")
+    name = name.strip()
+    if not sep or name not in GRID_AXES:
+        raise ValueError(f"Invalid axis: {text}, expected name=v1,v2,... or name=start:stop:count "
+                         f"with name one of {', '.join(GRID_AXES)}")
+
+    cast = GRID_AXES[name]
+    try:
+        if ":" in values:
+            start, stop, count = values.split(":")
+            values = [cast(value) for value in np.linspace(float(start), float(stop), int(count))]
+        else:
+            values = [cast(value) for value in values.split(",") if value.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid axis values: {text}")
+
+    if not values:
+        raise ValueError(f"Axis {name} has no values")
+    return name, values
+
+
+class Checkpoint:
+    """Журнал готовых точек сетки {хэш ключа точки: результат}
+
+    Файл - JSON по строке: первая строка {"spec": ...}, далее по строке
+    {"key": хэш, "result": ...} на точку. Готовая точка дописывается в
+    конец с fsync, так что запись точки не зависит от размера сетки.
+    Недописанная последняя строка (обрыв во время записи) при загрузке
+    пропускается. Файл целиком перезаписывается (через временный файл и
+    os.replace) только при продолжении исследования и в close(). spec
+    (параметры, оси, зерно) хранится в файле: продолжить можно только то
+    же самое исследование.
+    """
+
+    def __init__(self, path, spec):
+        self.path = path
+        self.spec = spec
+        self.points = {}
+
+        if os.path.exists(path):
+            self.load()
+        self.compact()
+        self.file = open(path, "a", encoding="utf-8")
+
+    def __len__(self):
+        return len(self.points)
+
+    def load(self):
+        with open(self.path, "r", encoding="utf-8") as file:
+            lines = file.read().split("\n")
+
+        records = []
+        for i, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # Обрыв при дописывании портит только последнюю строку
+                if any(rest.strip() for rest in lines[i + 1:]):
+                    raise ValueError(f"Checkpoint {self.path} is corrupted at line {i + 1}")
+
+        if not records or records[0].get("spec") != self.spec:
+            raise ValueError(f"Checkpoint {self.path} belongs to a different grid sweep")
+        # Файл прежнего формата - один JSON {"spec", "points"}
+        self.points = dict(records[0].get("points", {}))
+        for record in records[1:]:
+            self.points[record["key"]] = record["result"]
+
+    def get(self, key):
+        return self.points.get(key_digest(key))
+
+    def put(self, key, result):
+        digest = key_digest(key)
+        self.points[digest] = result
+        self.file.write(json.dumps({"key": digest, "result": result}) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def compact(self):
+        """Перезапись журнала: spec и по строке на точку, без повторов и оборванных строк"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(json.dumps({"spec": self.spec}) + "\n")
+            for digest, result in self.points.items():
+                file.write(json.dumps({"key": digest, "result": result}) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        """Закрытие журнала с перезаписью в сжатом виде"""
+        if not self.file.closed:
+            self.file.close()
+            self.compact()
+
+
+class GridSweep:
+    """Расчет вероятности обнаружения на сетке axes {имя оси: значения}
+
+        grid = GridSweep(params, {"snr": [0, 5, 10], "sigSize": [10, 30], "vel": [5, 10]},
+                         checkpoint="grid.json")
+        probability, n_trials = grid.run()
+        probability["PM"].shape  # (3, 2, 2) - порядок осей как в axes
+
+    Параметры, не вошедшие в axes, берутся из params. С checkpoint точки,
+    посчитанные в прошлых запусках, не пересчитываются; cache (ResultCache)
+    и store (ResultStore) используются так же, как в обычном исследовании.
+    С coordinator (distributed.Coordinator) точки считаются на рабочих узлах.
+    """
+
+    def __init__(self, params, axes, max_workers=None, cache=None, checkpoint=None, store=None,
+                 coordinator=None):
+        for name in axes:
+            if name not in GRID_AXES:
+                raise ValueError(f"Invalid axis: {name}, expected one of {', '.join(GRID_AXES)}")
+
+        self.params = dict(params)
+        self.axes = {name: [GRID_AXES[name](value) for value in values] for name, values in axes.items()}
+        if "snr" not in self.axes:
+            raise ValueError("Grid must contain the snr axis")
+
+        if coordinator is not None:
+            from .distributed import DistributedScheduler
+            self.scheduler = DistributedScheduler(coordinator, seed=params["seed"], cache=cache)
+        else:
+            self.scheduler = SweepScheduler(max_workers=max_workers, seed=params["seed"], cache=cache)
+        self.store = store
+
+        spec = {"params": self.params, "axes": self.axes, "seed": self.scheduler.seed}
+        self.checkpoint = Checkpoint(checkpoint, spec) if checkpoint is not None else None
+
+    @property
+    def shape(self):
+        return tuple(len(values) for values in self.axes.values())
+
+    def points(self):
+        """Точки сетки: (индекс в сетке, параметры точки, snr2)"""
+        for index in np.ndindex(*self.shape):
+            point = dict(self.params)
+            point.update({name: values[i] for (name, values), i in zip(self.axes.items(), index)})
+            yield index, point, point.pop("snr")
+
+    def run(self, on_result=None, cancel=None):
+        """Расчет недостающих точек, ({модуляция: вероятности}, {модуляция: испытания})
+
+        Массивы имеют форму shape (оси в порядке axes). on_result(mod_name,
+        point, snr2, result, done, total) вызывается для каждой готовой точки,
+        включая взятые из контрольных точек. Отмена - как в SweepScheduler.run.
+        """
+        probability = {mod_name: np.full(self.shape, np.nan) for mod_name in MODULATION_NAMES.values()}
+        n_trials = {mod_name: np.zeros(self.shape, dtype=np.int64) for mod_name in MODULATION_NAMES.values()}
+        sweep_id = self.store.start_sweep(dict(self.params, axes=self.axes), "grid") if self.store is not None else None
+
+        tasks = []
+        indices = []
+        done = 0
+        total = int(np.prod(self.shape)) * len(MODULATION_NAMES)
+
+        def add_result(index, point, signal_type, snr2, result):
+            nonlocal done
+            mod_name = MODULATION_NAMES[signal_type]
+            probability[mod_name][index] = result["probability"]
+            n_trials[mod_name][index] = result["n_trials"]
+            done += 1
+            if on_result is not None:
+                on_result(mod_name, point, snr2, result, done, total)
+
+        for index, point, snr2 in self.points():
+            for signal_type, mod_name in MODULATION_NAMES.items():
+                result = None
+                if self.checkpoint is not None:
+                    result = self.checkpoint.get(point_key(point, mod_name, snr2, self.scheduler.seed))
+
+                if result is None:
+                    tasks.append((point, signal_type, snr2))
+                    indices.append(index)
+                else:
+                    add_result(index, point, signal_type, snr2, result)
+
+        def on_task(task_id, result, task_done, task_total):
+            point, signal_type, snr2 = tasks[task_id]
+            if self.checkpoint is not None:
+                self.checkpoint.put(point_key(point, MODULATION_NAMES[signal_type], snr2, self.scheduler.seed),
+                                    result)
+            if self.store is not None and not result.get("cached"):
+                self.store.add_point(sweep_id, point, MODULATION_NAMES[signal_type], snr2, result,
+                                     self.scheduler.seed)
+            add_result(indices[task_id], point, signal_type, snr2, result)
+
+        try:
+            self.scheduler.run_tasks(tasks, on_task, cancel)
+        finally:
+            if self.checkpoint is not None:
+                self.checkpoint.close()
+        return probability, n_trials
+
+
+def grid_slice(values, axes, keep, fixed=None):
+    """Срез массива сетки по осям keep, остальные оси - по fixed {ось: значение}
+
+    Для осей, не указанных в fixed, берется первое значение.
+    """
+    fixed = fixed or {}
+    index = []
+    for name, axis_values in axes.items():
+        if name in keep:
+            index.append(slice(None))
+        elif name in fixed:
+            if fixed[name] not in axis_values:
+                raise ValueError(f"Value {fixed[name]} is not on the {name} axis")
+            index.append(axis_values.index(fixed[name]))
+        else:
+            index.append(0)
+
+    data = values[tuple(index)]
+    # Оставшиеся оси в порядке keep
+    order = [name for name in axes if name in keep]
+    return np.transpose(data, [order.index(name) for name in keep])
+
+
+def plot_grid(probability, axes, x_axis="snr", y_axis=None, kind="heatmap", fixed=None, figure=None):
+    """Графики результатов сетки, по одному на модуляцию
+
+    kind="heatmap" - тепловая карта вероятности по осям x_axis × y_axis,
+    kind="curves" - семейство кривых по x_axis, по кривой на значение y_axis
+    (без y_axis - одна кривая). Остальные оси фиксируются (см. grid_slice).
+    Возвращает matplotlib Figure (matplotlib импортируется только здесь).
+    """
+    from matplotlib.figure import Figure
+
+    if kind not in ("heatmap", "curves"):
+        raise ValueError(f"Invalid plot kind: {kind}")
+    if kind == "heatmap" and y_axis is None:
+        raise ValueError("Heatmap requires y_axis")
+    for name in (x_axis, y_axis):
+        if name is not None and name not in axes:
+            raise ValueError(f"Axis {name} is not in the grid")
+
+    keep = [x_axis] + ([y_axis] if y_axis is not None else [])
+    rest = [f"{name}={(fixed or {}).get(name, values[0]):g}" for name, values in axes.items() if name not in keep]
+
+    figure = figure or Figure(figsize=(5 * len(probability), 4.5))
+    for i, (mod_name, values) in enumerate(probability.items()):
+        ax = figure.add_subplot(1, len(probability), i + 1)
+        data = grid_slice(values, axes, keep, fixed)
+
+        if kind == "heatmap":
+            # Ячейки подписываются значениями осей независимо от шага сетки
+            mesh = ax.pcolormesh(np.arange(len(axes[x_axis]) + 1) - 0.5, np.arange(len(axes[y_axis]) + 1) - 0.5,
+                                 data.T, vmin=0., vmax=1., cmap="viridis")
+            ax.set_xticks(range(len(axes[x_axis])), [f"{value:.4g}" for value in axes[x_axis]])
+            ax.set_yticks(range(len(axes[y_axis])), [f"{value:.4g}" for value in axes[y_axis]])
+            ax.set_ylabel(y_axis)
+            figure.colorbar(mesh, ax=ax, label="Вероятность обнаружения")
+        else:
+            rows = data.T if y_axis is not None else data[None, :]
+            labels = [f"{y_axis}={value:g}" for value in axes[y_axis]] if y_axis is not None else [None]
+            for row, label in zip(rows, labels):
+                ax.plot(axes[x_axis], row, marker="o", label=label)
+            ax.set_ylim(0., 1.05)
+            ax.set_ylabel("Вероятность обнаружения")
+            ax.grid(True, alpha=0.3)
+            if y_axis is not None:
+                ax.legend(fontsize=8)
+
+        ax.set_xlabel(x_axis)
+        ax.set_title(mod_name + (f" ({', '.join(rest)})" if rest else ""), fontsize=10)
+
+    figure.tight_layout()
+    return figure
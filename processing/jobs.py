@@ -0,0 +1,156 @@
+"""Асинхронный запуск внешних процессов (утилиты data_processing)
+
+JobManager держит цикл asyncio в отдельном потоке, поэтому им можно
+пользоваться из потоков GUI и командной строки: submit возвращает
+concurrent.futures.Future. Каждая задача получает свою рабочую
+директорию (cwd процесса, без os.chdir), одновременно выполняется не
+больше max_concurrent задач, вывод передается построчно по мере
+появления, задачи отменяются и снимаются по таймауту с завершением
+процесса.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import CancelledError
+
+
+class JobTimeout(Exception):
+    """Задача превысила отведенное время, процесс завершен"""
+
+
+class JobCancelled(Exception):
+    """Задача отменена, процесс (если был запущен) завершен"""
+
+
+class Job:
+    """Запуск args в cwd; state: pending, running, done, failed, timeout, cancelled"""
+
+    def __init__(self, job_id, args, cwd, timeout):
+        self.id = job_id
+        self.args = list(args)
+        self.cwd = cwd
+        self.timeout = timeout
+        self.state = "pending"
+        self.returncode = None
+        self.stdout = []
+        self.stderr = []
+        self.future = None
+
+    @property
+    def output(self):
+        return "".join(self.stderr)
+
+    def __repr__(self):
+        return f"Job({self.id}, {self.state}, {self.args!r})"
+
+
+class JobManager:
+    """Очередь задач с ограничением числа одновременно работающих процессов
+
+    on_output(job, stream, line) вызывается в потоке цикла asyncio для
+    каждой строки stdout/stderr (stream - "stdout" или "stderr").
+    """
+
+    def __init__(self, max_concurrent=None, on_output=None):
+        self.max_concurrent = max_concurrent or os.cpu_count() or 1
+        self.on_output = on_output
+        self.jobs = {}
+        self.next_id = 0
+        self.lock = threading.Lock()
+
+        self.loop = asyncio.new_event_loop()
+        self.semaphore = asyncio.Semaphore(self.max_concurrent)
+        self.thread = threading.Thread(target=self.loop.run_forever, name="jobs", daemon=True)
+        self.thread.start()
+
+    def submit(self, args, cwd=None, timeout=None):
+        """Постановка задачи в очередь, возвращает Job (результат - job.future)"""
+        with self.lock:
+            job = Job(self.next_id, args, cwd, timeout)
+            self.next_id += 1
+            self.jobs[job.id] = job
+
+        job.future = asyncio.run_coroutine_threadsafe(self.execute(job), self.loop)
+        job.future.add_done_callback(lambda _: self.forget(job))
+        return job
+
+    def run(self, args, cwd=None, timeout=None):
+        """Запуск с ожиданием завершения, возвращает Job"""
+        return self.wait(self.submit(args, cwd, timeout))
+
+    @staticmethod
+    def wait(job):
+        """Ожидание задачи; JobTimeout/JobCancelled при таймауте или отмене"""
+        try:
+            return job.future.result()
+        except CancelledError:
+            raise JobCancelled(f"Job {job.id} cancelled")
+
+    def cancel(self, job):
+        """Отмена задачи: из очереди снимается сразу, запущенный процесс завершается"""
+        job.future.cancel()
+
+    def cancel_all(self):
+        with self.lock:
+            jobs = list(self.jobs.values())
+        for job in jobs:
+            self.cancel(job)
+
+    def forget(self, job):
+        with self.lock:
+            self.jobs.pop(job.id, None)
+
+    def close(self):
+        """Отмена всех задач с завершением их процессов и остановка цикла"""
+        asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    async def shutdown(self):
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def execute(self, job):
+        try:
+            async with self.semaphore:
+                job.state = "running"
+                process = await asyncio.create_subprocess_exec(*job.args, cwd=job.cwd,
+                                                               stdout=asyncio.subprocess.PIPE,
+                                                               stderr=asyncio.subprocess.PIPE)
+                try:
+                    await asyncio.wait_for(asyncio.gather(self.pump(job, process.stdout, "stdout"),
+                                                          self.pump(job, process.stderr, "stderr"),
+                                                          process.wait()),
+                                           job.timeout)
+                except BaseException:
+                    # Таймаут или отмена: процесс не должен пережить задачу
+                    if process.returncode is None:
+                        process.kill()
+                        await process.wait()
+                    raise
+        except asyncio.TimeoutError:
+            job.state = "timeout"
+            raise JobTimeout(f"Job {job.id} exceeded {job.timeout} s")
+        except asyncio.CancelledError:
+            job.state = "cancelled"
+            raise
+        except OSError:
+            job.state = "failed"
+            raise
+
+        job.returncode = process.returncode
+        job.state = "done" if process.returncode == 0 else "failed"
+        return job
+
+    async def pump(self, job, stream, name):
+        """Построчное чтение вывода процесса"""
+        lines = job.stdout if name == "stdout" else job.stderr
+        async for raw in stream:
+            line = raw.decode(errors="replace")
+            lines.append(line)
+            if self.on_output is not None:
+                self.on_output(job, name, line)
@@ -0,0 +1,611 @@
+"""Конвейер обработки без графического интерфейса
+
+Проверка параметров, запуск демо и исследования (встроенным вычислителем
+или внешней утилитой data_processing) и загрузка результатов. Ошибки
+сообщаются исключением PipelineError с текстом для пользователя; GUI и
+командная строка только показывают их.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from .demo import run_demo
+from .fileio import DEMO_FILES, load_array, parse_complex_text, parse_real_text
+from .precision import PRECISIONS
+from .profiling import tracer
+from .shared import SharedArrays, discard, discard_result, publish
+from .sweep import SweepCancelled, SweepScheduler, snr_grid, sweep_curves
+
+# Параметры по умолчанию для демо режима
+DEMO_PARAMS = {
+    "fd": 20.0,      # Sample freq
+    "f": 10.0,       # Carrier freq
+    "n": 100,        # Num info bits
+    "vel": 10.0,     # Info velocity
+    "dt":  10.0,     # Time offset
+    "snr1": 10.0,    # SNR for signal 1
+    "snr2": 10.0,    # SNR for signal 2
+    "type": 0,       # Modulation type
+    "sigSize": 30.0, # Signal size in persents
+    "precision": "double"  # Точность встроенного вычислителя: double или single
+}
+
+# Параметры по умолчанию для режима исследования
+RESEARCH_PARAMS = {
+    "fd": 20.0,         # Sample freq
+    "f": 10.0,          # Carrier freq
+    "n": 100,           # Num info bits
+    "vel": 10.0,        # Info velocity
+    "snr_static": 10.0, # Статическое SNR для референсного сигнала
+    "snr_min": 0.0,     # Минимальное SNR для BER
+    "snr_max": 20.0,    # Максимальное SNR для BER
+    "n_points": 10,     # Количество точек на графике
+    "n_runs": 100,      # Количество испытаний на точку
+    "sigSize": 30.0,    # Signal size in persents
+    "seed": 0,          # Зерно ГСЧ, по нему же ищутся точки в кэше
+    "tolerance": 0.0,   # Полуширина 95% интервала для адаптивного режима (0 - выкл.)
+    "precision": "double"  # Точность встроенного вычислителя: double или single
+}
+
+# Целочисленные параметры
+INT_PARAMS = {"n", "type", "n_points", "n_runs", "seed"}
+
+# Строковые параметры и их допустимые значения
+CHOICE_PARAMS = {"precision": tuple(PRECISIONS)}
+
+# Файлы вероятностей, которые дописывает утилита в режиме исследования
+BER_FILES = ["ber_am.txt", "ber_fm.txt", "ber_pm.txt"]
+
+
+class PipelineError(Exception):
+    """Ошибка конвейера обработки, текст предназначен для пользователя"""
+
+
+class ProcessingCancelled(PipelineError):
+    """Обработка прервана пользователем"""
+
+
+def parse_params(values, defaults):
+    """Приведение значений параметров (в том числе строк из полей ввода) к числам
+
+    Отсутствующие параметры берутся из defaults, пустая строка дает 0
+    (для строковых параметров из CHOICE_PARAMS - значение по умолчанию).
+    """
+    params = {}
+    for key, default in defaults.items():
+        value = values.get(key, default)
+
+        if key in CHOICE_PARAMS:
+            value = str(value).strip() or default
+            if value not in CHOICE_PARAMS[key]:
+                raise PipelineError(f"Некорректное значение параметра {key}: {value} "
+                                    f"(допустимо: {', '.join(CHOICE_PARAMS[key])})")
+            params[key] = value
+            continue
+
+        if isinstance(value, str):
+            value = value.strip() or 0
+
+        try:
+            params[key] = int(value) if key in INT_PARAMS else float(value)
+        except ValueError as e:
+            raise PipelineError(f"Некорректное значение параметра: {str(e)}")
+
+    return params
+
+
+def validate_research_params(params):
+    """Проверка параметров исследования"""
+    if params["n_points"] <= 0:
+        raise PipelineError("Количество точек должно быть больше 0")
+
+    if params["n_runs"] <= 0:
+        raise PipelineError("Количество испытаний должно быть больше 0")
+
+    if params["snr_min"] >= params["snr_max"]:
+        raise PipelineError("Минимальное SNR должно быть меньше максимального")
+
+
+def run_demo_in_process(params):
+    """Демо обработка встроенным вычислителем, (signal1, signal2, correlation, max_metric_id)"""
+    try:
+        return run_demo(params)
+    except ValueError as e:
+        raise PipelineError(f"Некорректные параметры: {str(e)}")
+
+
+def run_demo_shared(params):
+    """Демо в рабочем процессе, массивы передаются через разделяемую память
+
+    Возвращает ([описатели signal1, signal2, correlation], max_metric_id).
+    """
+    *arrays, max_metric_id = run_demo(params)
+
+    descriptors = []
+    try:
+        for array in arrays:
+            descriptors.append(publish(array))
+    except BaseException:
+        discard(descriptors)
+        raise
+
+    return descriptors, max_metric_id
+
+
+def run_demo_in_worker(params, executor=None, cancel=None):
+    """Демо обработка в отдельном процессе без копирования результата
+
+    executor - пул процессов для повторного использования (по умолчанию
+    создается на один запуск). Возвращает (SharedArrays, max_metric_id):
+    shared.arrays - (signal1, signal2, correlation) поверх сегментов
+    разделяемой памяти, shared.release() освобождает их. При отмене
+    (cancel - threading.Event, ProcessingCancelled) или ошибке ожидания
+    сегменты результата удаляются, когда рабочий процесс его вернет.
+    """
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=1)
+
+    future = None
+    try:
+        future = executor.submit(run_demo_shared, params)
+        while cancel is not None and not cancel.is_set():
+            if wait([future], timeout=SweepScheduler.cancel_poll)[0]:
+                break
+        if cancel is not None and cancel.is_set():
+            future.cancel()
+            raise ProcessingCancelled("Обработка отменена")
+        descriptors, max_metric_id = future.result()
+    except ValueError as e:
+        raise PipelineError(f"Некорректные параметры: {str(e)}")
+    except OSError as e:
+        raise PipelineError(f"Ошибка разделяемой памяти: {str(e)}")
+    except BaseException:
+        # Результат, пришедший после отказа от него, не должен остаться в /dev/shm
+        if future is not None:
+            future.add_done_callback(discard_result)
+        raise
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return SharedArrays(descriptors), max_metric_id
+
+
+def run_sweep_in_process(params, on_result=None, cache=None, max_workers=None, cancel=None, store=None,
+                         coordinator=None):
+    """Параллельный расчет всех точек исследования встроенным вычислителем
+
+    cancel - threading.Event для прерывания (ProcessingCancelled), store -
+    ResultStore, в который записывается каждая рассчитанная точка (взятые
+    из кэша уже записаны исследованием, которое их посчитало). С coordinator
+    (distributed.Coordinator) точки считаются на рабочих узлах, а не на
+    локальном пуле процессов.
+    Возвращает (snr_values, {модуляция: вероятности}, {модуляция: число испытаний}).
+    """
+    validate_research_params(params)
+    snr_values = snr_grid(params["snr_min"], params["snr_max"], params["n_points"])
+
+    if store is not None:
+        sweep_id = store.start_sweep(params, "process")
+        user_on_result = on_result
+
+        def on_result(mod_name, snr2, result, done, total):
+            if not result.get("cached"):
+                store.add_point(sweep_id, params, mod_name, snr2, result, params["seed"])
+            if user_on_result is not None:
+                user_on_result(mod_name, snr2, result, done, total)
+
+    try:
+        if coordinator is not None:
+            from .distributed import DistributedScheduler
+            scheduler = DistributedScheduler(coordinator, seed=params["seed"], cache=cache)
+        else:
+            scheduler = SweepScheduler(max_workers=max_workers, seed=params["seed"], cache=cache)
+        results = scheduler.run(params, snr_values, on_result, cancel)
+    except ValueError as e:
+        raise PipelineError(f"Некорректные параметры: {str(e)}")
+    except SweepCancelled:
+        raise ProcessingCancelled("Исследование отменено")
+
+    return snr_values, sweep_curves(results, snr_values), sweep_curves(results, snr_values, "n_trials")
+
+
+def run_grid_in_process(params, axes, on_result=None, cache=None, max_workers=None, cancel=None,
+                        checkpoint=None, store=None, coordinator=None):
+    """Исследование по сетке axes {ось: значения} встроенным вычислителем
+
+    Без оси snr она строится по snr_min, snr_max, n_points. checkpoint -
+    путь файла контрольных точек: повторный запуск с ним продолжает
+    прерванное исследование, coordinator - как в run_sweep_in_process.
+    Возвращает (axes, {модуляция: вероятности},
+    {модуляция: число испытаний}), массивы по осям axes.
+    """
+    axes = dict(axes)
+    if "snr" not in axes:
+        validate_research_params(params)
+        axes = dict(snr=snr_grid(params["snr_min"], params["snr_max"], params["n_points"]), **axes)
+
+    from .grid import GridSweep
+
+    try:
+        grid = GridSweep(params, axes, max_workers, cache, checkpoint, store, coordinator)
+        probability, n_trials = grid.run(on_result, cancel)
+    except ValueError as e:
+        raise PipelineError(f"Некорректные параметры: {str(e)}")
+    except OSError as e:
+        raise PipelineError(f"Ошибка файла контрольных точек: {str(e)}")
+    except SweepCancelled:
+        raise ProcessingCancelled("Исследование отменено")
+
+    return grid.axes, probability, n_trials
+
+
+class ExternalProcessor:
+    """Запуск внешней утилиты data_processing и чтение записанных ею файлов
+
+    Процессы запускаются через JobManager: у каждого свой cwd, точки
+    исследования считаются параллельно (до max_concurrent), cancel()
+    прерывает все запущенные и ожидающие задачи. on_output(stream, line)
+    получает строки stdout/stderr утилиты по мере появления.
+
+    При persistent точки исследования считаются постоянными процессами
+    утилиты (data_processing --serve, см. utility.UtilityWorker), которые
+    живут до close() и переиспользуются следующими исследованиями. Со
+    сборкой утилиты без --serve - по процессу на точку.
+    """
+
+    def __init__(self, build_dir="build", data_dir="data", processing_app="./data_processing",
+                 timeout=30, max_concurrent=None, on_output=None, persistent=True):
+        self.build_dir = build_dir
+        self.data_dir = data_dir
+        self.processing_app = processing_app
+        self.timeout = timeout
+        self.max_concurrent = max_concurrent
+        self.on_output = on_output
+        self.persistent = persistent
+        self.jobs = None
+        # Простаивающие и занятые процессы --serve
+        self.workers = []
+        self.busy_workers = set()
+        self.workers_lock = threading.Lock()
+        self.cancelled = threading.Event()
+
+    def check_directories(self):
+        """Проверка существования необходимых директорий, data создается при отсутствии"""
+        if not os.path.exists(self.build_dir):
+            raise PipelineError(f"Директория {self.build_dir} не существует!")
+
+        if not os.path.exists(os.path.join(self.build_dir, self.processing_app)):
+            raise PipelineError(f"Утилита {self.processing_app} не найдена в {self.build_dir}!")
+
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def cleanup_ber_files(self):
+        """Очистка старых BER файлов перед началом исследования"""
+        for filename in BER_FILES:
+            filepath = os.path.join(self.data_dir, filename)
+            if os.path.exists(filepath):
+                try:
+                    os.remove(filepath)
+                except OSError as e:
+                    raise PipelineError(f"Не удалось удалить файл {filename}: {str(e)}")
+
+    def job_manager(self):
+        """JobManager, создается при первом запуске утилиты"""
+        if self.jobs is None:
+            # asyncio нужен только запускам утилиты, не встроенному вычислителю
+            from .jobs import JobManager
+
+            on_output = None
+            if self.on_output is not None:
+                on_output = lambda job, stream, line: self.on_output(stream, line.rstrip())  # noqa: E731
+            self.jobs = JobManager(self.max_concurrent, on_output)
+        return self.jobs
+
+    def app_path(self):
+        """Абсолютный путь утилиты, не зависящий от cwd задачи"""
+        return os.path.abspath(os.path.join(self.build_dir, self.processing_app))
+
+    def submit(self, args, cwd=None):
+        """Постановка запуска утилиты в очередь (cwd по умолчанию - build директория)"""
+        return self.job_manager().submit([self.app_path()] + args[1:], cwd or self.build_dir, self.timeout)
+
+    def wait(self, job):
+        """Ожидание запуска утилиты, ошибки переводятся в PipelineError"""
+        from .jobs import JobCancelled, JobManager, JobTimeout
+
+        try:
+            with tracer.stage("spawn", args=" ".join(job.args)):
+                JobManager.wait(job)
+        except JobTimeout:
+            raise PipelineError("Утилита превысила время выполнения!")
+        except JobCancelled:
+            raise ProcessingCancelled("Обработка отменена")
+        except OSError as e:
+            raise PipelineError(f"Ошибка при запуске утилиты: {str(e)}")
+
+        if job.returncode != 0:
+            raise PipelineError(f"Ошибка выполнения {self.processing_app}:\n{job.output}")
+
+    def run(self, args, cwd=None):
+        """Запуск утилиты с аргументами в cwd (по умолчанию build директория)"""
+        self.wait(self.submit(args, cwd))
+
+    def cancel(self):
+        """Отмена всех запущенных и ожидающих запусков утилиты"""
+        self.cancelled.set()
+        self.kill_busy_workers()
+        if self.jobs is not None:
+            self.jobs.cancel_all()
+
+    def close(self):
+        self.cancel()
+        with self.workers_lock:
+            workers, self.workers = self.workers, []
+        for worker in workers:
+            worker.close()
+        if self.jobs is not None:
+            self.jobs.close()
+            self.jobs = None
+
+    def acquire_worker(self):
+        """Свободный процесс --serve, при отсутствии запускается новый"""
+        worker = None
+        with self.workers_lock:
+            while self.workers and worker is None:
+                worker = self.workers.pop()
+                if not worker.alive:
+                    worker.close()
+                    worker = None
+
+        if worker is None:
+            from .utility import UtilityWorker
+            with tracer.stage("spawn", args=f"{self.processing_app} --serve"):
+                worker = UtilityWorker(self.app_path(), self.build_dir, self.on_output)
+
+        with self.workers_lock:
+            self.busy_workers.add(worker)
+        if self.cancelled.is_set():
+            worker.kill()
+        return worker
+
+    def release_worker(self, worker):
+        """Возврат процесса в число свободных (завершенный процесс закрывается)"""
+        with self.workers_lock:
+            self.busy_workers.discard(worker)
+            if worker.alive:
+                self.workers.append(worker)
+                return
+        worker.close()
+
+    def kill_busy_workers(self):
+        with self.workers_lock:
+            workers = list(self.busy_workers)
+        for worker in workers:
+            worker.kill()
+
+    def run_point_persistent(self, params, snr2):
+        """Точка исследования постоянным процессом утилиты, {модуляция: вероятность}"""
+        from .jobs import JobCancelled, JobTimeout
+
+        worker = self.acquire_worker()
+        try:
+            with tracer.stage("serve", snr=snr2):
+                return worker.run_point(params, snr2, self.timeout)
+        except JobTimeout:
+            raise PipelineError("Утилита превысила время выполнения!")
+        except JobCancelled:
+            raise ProcessingCancelled("Обработка отменена")
+        except ValueError as e:
+            raise PipelineError(f"Ошибка выполнения {self.processing_app}:\n{str(e)}")
+        except OSError as e:
+            raise PipelineError(f"Ошибка при запуске утилиты: {str(e)}\n{worker.output}")
+        finally:
+            self.release_worker(worker)
+
+    def demo_args(self, params):
+        """Аргументы командной строки утилиты для демо режима"""
+        return [self.processing_app] + [str(params[key]) for key in
+                                         ("fd", "f", "n", "vel", "dt", "snr1", "snr2", "type", "sigSize")]
+
+    def research_args(self, params, snr2):
+        """Аргументы утилиты для точки исследования (все типы модуляции сразу)"""
+        return [
+            self.processing_app,
+            str(params["fd"]),
+            str(params["f"]),
+            str(params["n"]),
+            str(params["vel"]),
+            str(params["snr_static"]),  # snr1 - статическое значение
+            str(snr2),                  # snr2 - переменное значение
+            str(params["n_runs"]),      # Количество испытаний
+            str(params["sigSize"])
+        ]
+
+    def run_demo(self, params):
+        """Демо обработка утилитой"""
+        self.run(self.demo_args(params))
+
+    def run_research_point(self, params, snr2):
+        """Одна точка исследования утилитой, результат дописывается в ber_*.txt"""
+        self.run(self.research_args(params, snr2))
+
+    @staticmethod
+    def point_workspace(root, index):
+        """Рабочая директория точки: утилита пишет в ../data относительно cwd"""
+        cwd = os.path.join(root, f"point_{index}", "build")
+        os.makedirs(cwd)
+        os.makedirs(os.path.join(root, f"point_{index}", "data"))
+        return cwd
+
+    def load_demo(self, progress=None):
+        """Загрузка файлов демо режима, (signal1, signal2, correlation)
+
+        Бинарные .npy открываются через memmap, текстовые .txt (старые сборки
+        утилиты) разбираются поблочно с вызовом progress(done, total).
+        """
+        arrays = []
+        for name, is_complex in DEMO_FILES:
+            filepath = os.path.join(self.data_dir, name + ".npy")
+            try:
+                if os.path.exists(filepath):
+                    with tracer.stage("load", file=name):
+                        data = load_array(filepath)
+                else:
+                    filepath = os.path.join(self.data_dir, name + ".txt")
+                    if not os.path.exists(filepath):
+                        raise PipelineError(f"Файл {name}.npy/.txt не найден в {self.data_dir}!")
+
+                    parse = parse_complex_text if is_complex else parse_real_text
+                    with tracer.stage("parse", file=name):
+                        data = parse(filepath, progress=progress)
+            except (OSError, ValueError) as e:
+                raise PipelineError(f"Ошибка при чтении файла {filepath}:\n{str(e)}")
+
+            if len(data) == 0:
+                raise PipelineError(f"Не удалось загрузить данные из {filepath}!")
+
+            arrays.append(data)
+
+        return tuple(arrays)
+
+    def load_ber(self, data_dir=None):
+        """Загрузка BER данных исследования из data_dir, {модуляция: вероятности}"""
+        data_dir = data_dir or self.data_dir
+        ber_data = {}
+
+        for filename in BER_FILES:
+            filepath = os.path.join(data_dir, filename)
+
+            if not os.path.exists(filepath):
+                raise PipelineError(f"Файл {filename} не найден в {data_dir}!")
+
+            try:
+                with tracer.stage("parse", file=filename):
+                    data = parse_real_text(filepath)
+            except (OSError, ValueError) as e:
+                raise PipelineError(f"Ошибка при чтении файла {filepath}:\n{str(e)}")
+
+            if len(data) == 0:
+                raise PipelineError(f"Не удалось загрузить данные из {filename}!")
+
+            # Извлекаем название модуляции из имени файла
+            mod_name = filename.replace("ber_", "").replace(".txt", "").upper()
+            ber_data[mod_name] = data
+
+        return ber_data
+
+    def run_sweep(self, params, on_point=None, store=None):
+        """Исследование утилитой по точкам SNR, (snr_values, {модуляция: вероятности})
+
+        Точки запускаются одновременно, каждая в своей временной директории,
+        поэтому параллельные запуски не дописывают в одни и те же ber_*.txt.
+        Итоговые ber_*.txt в data_dir собираются в порядке SNR.
+        on_point(index, total, snr, {модуляция: вероятность}) вызывается
+        по завершении каждой точки. В store (ResultStore) точки записываются
+        без зерна: утилита берет его из std::random_device.
+        """
+        validate_research_params(params)
+        snr_values = snr_grid(params["snr_min"], params["snr_max"], params["n_points"])
+
+        self.check_directories()
+        self.cleanup_ber_files()
+
+        sweep_id = store.start_sweep(params, "external") if store is not None else None
+
+        def report(i, point):
+            if store is not None:
+                for mod_name, probability in point.items():
+                    store.add_point(sweep_id, params, mod_name, snr_values[i],
+                                    {"probability": probability, "n_trials": params["n_runs"]})
+            if on_point is not None:
+                on_point(i, len(snr_values), snr_values[i], point)
+
+        if self.persistent:
+            from .utility import ServeUnsupported
+            try:
+                return snr_values, self.run_sweep_persistent(params, snr_values, report)
+            except ServeUnsupported:
+                # Старая сборка утилиты: по процессу на точку
+                self.persistent = False
+
+        root = tempfile.mkdtemp(prefix="sweep_", dir=self.data_dir)
+        try:
+            jobs = [self.submit(self.research_args(params, snr2), self.point_workspace(root, i))
+                    for i, snr2 in enumerate(snr_values)]
+
+            try:
+                for i, job in enumerate(jobs):
+                    self.wait(job)
+                    if on_point is None and store is None:
+                        continue
+
+                    point = self.load_ber(os.path.join(root, f"point_{i}", "data"))
+                    report(i, {mod_name: float(values[-1]) for mod_name, values in point.items()})
+            except PipelineError:
+                for job in jobs:
+                    self.jobs.cancel(job)
+                raise
+
+            for filename in BER_FILES:
+                with open(os.path.join(self.data_dir, filename), "w", encoding="utf-8") as out:
+                    for i in range(len(snr_values)):
+                        with open(os.path.join(root, f"point_{i}", "data", filename), encoding="utf-8") as file:
+                            out.write(file.read())
+        except OSError as e:
+            raise PipelineError(f"Ошибка при сборке результатов исследования: {str(e)}")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+        return snr_values, self.load_ber()
+
+    def run_sweep_persistent(self, params, snr_values, report):
+        """Точки исследования на постоянных процессах утилиты, {модуляция: вероятности}
+
+        Одновременно считается до max_concurrent точек, report(index, point)
+        вызывается в порядке SNR. Вероятности записываются в ber_*.txt так
+        же, как при запуске утилиты на каждую точку.
+        """
+        self.cancelled.clear()
+        max_workers = min(self.max_concurrent or os.cpu_count() or 1, len(snr_values))
+
+        points = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.run_point_persistent, params, snr2) for snr2 in snr_values]
+            try:
+                for i, future in enumerate(futures):
+                    points.append(future.result())
+                    report(i, points[-1])
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                self.cancelled.set()
+                self.kill_busy_workers()
+                raise
+
+        try:
+            for filename in BER_FILES:
+                mod_name = filename.replace("ber_", "").replace(".txt", "").upper()
+                with open(os.path.join(self.data_dir, filename), "w", encoding="utf-8") as out:
+                    out.writelines(f"{point[mod_name]:g}\n" for point in points)
+        except OSError as e:
+            raise PipelineError(f"Ошибка при сборке результатов исследования: {str(e)}")
+
+        return self.load_ber()
+
+
+def sweep_table(snr_values, curves, trials=None):
+    """Таблица результатов исследования: список строк {snr, AM, PM, FM, [n_trials_*]}"""
+    rows = []
+    for i, snr2 in enumerate(snr_values):
+        row = {"snr": float(snr2)}
+        row.update({mod_name: float(values[i]) for mod_name, values in curves.items()})
+        if trials is not None:
+            row.update({f"n_trials_{mod_name}": int(values[i]) for mod_name, values in trials.items()})
+        rows.append(row)
+    return rows
+
@@ -0,0 +1,28 @@
+"""Точность вычислений: "double" (complex128) или "single" (complex64)
+
+В режиме single сигналы, шум, спектры и корреляция хранятся и считаются
+в complex64/float32, что вдвое уменьшает память и объем пересылок, а в
+блок исследования помещается вдвое больше испытаний. Фаза несущей и
+накопленные суммы окон считаются в double, иначе на длинных сигналах
+теряется точность. Сравнение с double - benchmarks/precision.py.
+"""
+
+import numpy as np
+
+# Название точности -> комплексный тип данных
+PRECISIONS = {
+    "double": np.complex128,
+    "single": np.complex64,
+}
+
+
+def complex_dtype(precision="double"):
+    """Комплексный тип данных для точности precision"""
+    if precision not in PRECISIONS:
+        raise ValueError(f"Invalid precision: {precision}, expected one of {', '.join(PRECISIONS)}")
+    return np.dtype(PRECISIONS[precision])
+
+
+def real_dtype(precision="double"):
+    """Действительный тип той же точности (float64 или float32)"""
+    return np.finfo(complex_dtype(precision)).dtype
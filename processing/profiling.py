@@ -0,0 +1,86 @@
+"""Замер времени этапов обработки и экспорт в формате Chrome trace
+
+    with tracer.stage("fft"):
+        ...
+
+При выключенном трассировщике stage возвращает общий пустой контекстный
+менеджер, так что инструментирование горячих участков почти ничего не стоит.
+Файл export_chrome_trace открывается в chrome://tracing или Perfetto.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+
+_NULL_STAGE = contextlib.nullcontext()
+
+
+class _Stage:
+    """Интервал одного этапа, по выходу добавляется в события трассировщика"""
+
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.tracer.events.append({
+            "name": self.name,
+            "ph": "X",
+            "ts": self.start / 1000.,
+            "dur": (end - self.start) / 1000.,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": self.args,
+        })
+        return False
+
+
+class Tracer:
+    """Сборщик интервалов этапов обработки"""
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+
+    def stage(self, name, **args):
+        """Контекстный менеджер замера этапа name"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, args)
+
+    def reset(self):
+        self.events = []
+
+    def merge(self, events):
+        """Добавление событий, записанных в другом процессе"""
+        self.events.extend(events)
+
+    def summary(self):
+        """Суммарное время этапов в мс, {этап: мс} в порядке первого появления"""
+        totals = {}
+        for event in self.events:
+            totals[event["name"]] = totals.get(event["name"], 0.) + event["dur"] / 1000.
+        return totals
+
+    def format_summary(self):
+        """Строка вида "generate 1.2 мс | fft 3.4 мс" для строки состояния"""
+        return " | ".join(f"{name} {ms:.1f} мс" for name, ms in self.summary().items())
+
+    def export_chrome_trace(self, filename):
+        """Сохранение событий в JSON формате Chrome trace"""
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, file)
+
+
+# Общий трассировщик процесса
+tracer = Tracer()
@@ -0,0 +1,413 @@
+"""Обнаружение шаблона в потоке отсчетов в реальном времени
+
+Источник (сокет, FIFO, дописываемый файл или воспроизведение записи с
+заданной частотой) читается задачей asyncio и кладет кадры в очередь
+ограниченной длины. Детектор забирает кадры, складывает их в кольцевой
+буфер и по мере накопления считает корреляцию блоками overlap-save (см.
+streaming.block_scores) в отдельном потоке, не останавливая прием.
+Совпадения выше порога выдаются событиями с индексом, временем в потоке
+и задержкой от приема последнего отсчета совпадения до обнаружения.
+
+При переполнении очереди overflow="block" приостанавливает чтение
+источника (для сокета и FIFO это обратное давление на передающую
+сторону), overflow="drop" выбрасывает самые старые кадры: задержка
+остается ограниченной, а детектор начинает поток заново после разрыва.
+"""
+
+import asyncio
+import os
+import stat
+import time
+from bisect import bisect_left
+from collections import deque
+
+import numpy as np
+
+from .correlator import Correlator, PreparedTemplate
+from .profiling import tracer
+from .streaming import block_scores, iter_chunks, pick_peaks
+
+# Минимальная длина БПФ блока (меньше, чем у офлайн поиска: короче блок - меньше задержка)
+MIN_REALTIME_FFT = 4096
+
+# Сколько последних задержек хранится для процентилей
+LATENCY_HISTORY = 100000
+
+# Формат отсчетов в сокете, FIFO и файле
+SAMPLE_FORMATS = {"complex64": np.complex64, "complex128": np.complex128}
+
+
+class RingBuffer:
+    """Последние capacity отсчетов потока с абсолютной нумерацией
+
+    start и end - абсолютные индексы первого хранимого отсчета и отсчета
+    после последнего, read возвращает непрерывную копию любого хранимого
+    участка независимо от переноса через конец массива.
+    """
+
+    def __init__(self, capacity, dtype=np.complex128):
+        self.data = np.zeros(capacity, dtype=dtype)
+        self.capacity = capacity
+        self.start = 0
+        self.end = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    def reset(self, position):
+        """Пустой буфер, следующий отсчет которого имеет индекс position"""
+        self.start = self.end = position
+
+    def write(self, samples):
+        samples = samples[-self.capacity:]
+        offset = self.end % self.capacity
+        head = min(len(samples), self.capacity - offset)
+        self.data[offset:offset + head] = samples[:head]
+        self.data[:len(samples) - head] = samples[head:]
+        self.end += len(samples)
+        self.start = max(self.start, self.end - self.capacity)
+
+    def read(self, start, size):
+        if start < self.start or start + size > self.end:
+            raise IndexError(f"Samples [{start}, {start + size}) are not in the buffer [{self.start}, {self.end})")
+        offset = start % self.capacity
+        head = min(size, self.capacity - offset)
+        if head == size:
+            return self.data[offset:offset + size].copy()
+        return np.concatenate((self.data[offset:], self.data[:size - head]))
+
+
+class LatencyStats:
+    """Задержки обнаружения (последние LATENCY_HISTORY) и их процентили"""
+
+    def __init__(self, history=LATENCY_HISTORY):
+        self.values = deque(maxlen=history)
+        self.count = 0
+
+    def add(self, latency):
+        self.values.append(latency)
+        self.count += 1
+
+    def percentiles(self, points=(50, 90, 99)):
+        """{"p50": мс, "p90": мс, "p99": мс, "max": мс} или {} без замеров"""
+        if not self.values:
+            return {}
+        values = np.fromiter(self.values, dtype=np.float64) * 1000.
+        result = {f"p{point:g}": float(value) for point, value in zip(points, np.percentile(values, points))}
+        result["max"] = float(values.max())
+        return result
+
+
+class RealtimeDetector:
+    """Поиск template в потоке кадров с выдачей событий по мере обнаружения
+
+        detector = RealtimeDetector(template, threshold=0.5, rate=1e6)
+        for start, frame, ingested in frames:
+            for event in detector.push(start, frame, ingested):
+                ...
+        detector.finish()
+
+    start - индекс первого отсчета кадра в потоке (разрыв в индексах -
+    пропущенные кадры), ingested - time.monotonic() приема кадра. Событие -
+    {"index", "score", "time", "timestamp", "latency"}: индекс начала
+    совпадения, метрика в [0, 1], время в потоке (index / rate, None без
+    rate), time.time() обнаружения и задержка в секундах. Совпадения ближе
+    min_separation (по умолчанию длина шаблона) считаются одним.
+    """
+
+    def __init__(self, template, threshold=0.5, n_fft=None, min_separation=None, rate=None,
+                 dtype=np.complex128):
+        template = np.asarray(template, dtype=dtype)
+        if template.ndim != 1 or len(template) == 0:
+            raise ValueError("Template must be a non-empty 1-D array")
+        if not 0. < threshold <= 1.:
+            raise ValueError(f"Invalid threshold: {threshold}, expected 0 < threshold <= 1")
+
+        self.template_size = len(template)
+        n_fft = n_fft or Correlator.fft_length(max(4 * self.template_size, MIN_REALTIME_FFT))
+        if n_fft < 2 * self.template_size:
+            raise ValueError(f"FFT length {n_fft} is too small for template of {self.template_size} samples")
+
+        self.template = PreparedTemplate(template, n_fft, dtype=dtype)
+        self.template_norm = max(float(np.sqrt(self.template.energy[0])), Correlator.min_normalizer)
+        self.n_fft = n_fft
+        self.step = n_fft - self.template_size + 1
+        self.threshold = threshold
+        self.min_separation = min_separation or self.template_size
+        self.rate = rate
+
+        # В буфере помещается необработанный блок и еще один шаг новых отсчетов
+        self.ring = RingBuffer(n_fft + self.step, dtype)
+        # Индекс первого сдвига следующего блока
+        self.position = 0
+        # (индекс после последнего отсчета кадра, время приема) еще нужных кадров
+        self.arrivals = deque()
+        self.last_index = None
+
+        self.latency = LatencyStats()
+        self.samples = 0
+        self.blocks = 0
+        self.detections = 0
+        self.gaps = 0
+
+    def push(self, start, frame, ingested):
+        """Добавление кадра, список новых событий"""
+        events = []
+        if start != self.ring.end:
+            if start < self.ring.end:
+                raise ValueError(f"Frame starts at {start}, before the end of the stream {self.ring.end}")
+            # Пропущенные кадры: корреляция через разрыв не считается
+            events += self.flush()
+            self.gaps += 1
+            self.ring.reset(start)
+            self.position = start
+            self.arrivals.clear()
+
+        self.arrivals.append((start + len(frame), ingested))
+        self.samples += len(frame)
+        for piece in iter_chunks(frame, self.step):
+            self.ring.write(piece)
+            while self.ring.end - self.position >= self.n_fft:
+                events += self.process_block(self.ring.read(self.position, self.n_fft), self.step)
+        return events
+
+    def flush(self):
+        """Сдвиги, для которых шаблон уже целиком лежит в буфере (конец потока или разрыв)"""
+        n_lags = self.ring.end - self.position - self.template_size + 1
+        if n_lags <= 0:
+            return []
+        return self.process_block(self.ring.read(self.position, n_lags + self.template_size - 1), n_lags)
+
+    def finish(self):
+        events = self.flush()
+        self.position = self.ring.end
+        return events
+
+    def ingest_time(self, index):
+        """Время приема кадра, содержащего отсчет index"""
+        ends = [end for end, _ in self.arrivals]
+        i = min(bisect_left(ends, index + 1), len(ends) - 1)
+        return self.arrivals[i][1]
+
+    def process_block(self, block, n_lags):
+        scores = block_scores(block, n_lags, self.template, self.template_norm)
+        self.blocks += 1
+
+        with tracer.stage("peak"):
+            scores = np.where(scores >= self.threshold, scores, -1.)
+            peaks = pick_peaks(scores, self.position, len(scores), self.min_separation)
+
+        events = []
+        now = time.monotonic()
+        for index, score in sorted(peaks):
+            # Совпадение на границе блоков уже выдано предыдущим блоком
+            if self.last_index is not None and index - self.last_index < self.min_separation:
+                continue
+            self.last_index = index
+
+            latency = max(now - self.ingest_time(index + self.template_size - 1), 0.)
+            self.latency.add(latency)
+            self.detections += 1
+            events.append({
+                "index": index,
+                "score": score,
+                "time": index / self.rate if self.rate else None,
+                "timestamp": time.time(),
+                "latency": latency,
+            })
+
+        self.position += n_lags
+        while self.arrivals and self.arrivals[0][0] <= self.position:
+            self.arrivals.popleft()
+        return events
+
+    def stats(self):
+        return {
+            "samples": self.samples,
+            "blocks": self.blocks,
+            "detections": self.detections,
+            "gaps": self.gaps,
+            "latency_ms": self.latency.percentiles(),
+        }
+
+
+async def replay_source(data, rate, frame_size=4096):
+    """Воспроизведение массива (в том числе np.memmap) с частотой rate отсчетов/с
+
+    Кадр выдается, когда по расписанию "пришел" его последний отсчет; если
+    потребитель задерживает чтение (обратное давление), расписание не
+    догоняется рывком, а сдвигается.
+    """
+    if rate <= 0:
+        raise ValueError(f"Invalid rate: {rate}")
+
+    clock = time.monotonic()
+    position = 0
+    for chunk in iter_chunks(data, frame_size):
+        delay = clock + len(chunk) / rate - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        clock = max(clock + len(chunk) / rate, time.monotonic() - len(chunk) / rate)
+        yield position, np.asarray(chunk), time.monotonic()
+        position += len(chunk)
+
+
+async def reader_source(reader, dtype=np.complex64, frame_size=4096, writer=None):
+    """Кадры из asyncio.StreamReader (сокет, FIFO): отсчеты dtype подряд
+
+    Кадр - все, что пришло к моменту чтения (до frame_size отсчетов),
+    неполный отсчет переносится в следующий кадр. writer (сокет)
+    закрывается по окончании потока.
+    """
+    itemsize = np.dtype(dtype).itemsize
+    position = 0
+    rest = b""
+    try:
+        while True:
+            data = await reader.read(frame_size * itemsize)
+            if not data:
+                break
+            data = rest + data
+            usable = len(data) - len(data) % itemsize
+            rest = data[usable:]
+            if usable:
+                frame = np.frombuffer(data[:usable], dtype=dtype)
+                yield position, frame, time.monotonic()
+                position += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def follow_source(path, dtype=np.complex64, frame_size=4096, poll=0.05, idle_timeout=None):
+    """Кадры из файла, который дописывается другим процессом (как tail -f)
+
+    Без новых данных дольше idle_timeout (None - бесконечно) поток завершается.
+    """
+    itemsize = np.dtype(dtype).itemsize
+    position = 0
+    rest = b""
+    idle_since = time.monotonic()
+    with open(path, "rb") as file:
+        while True:
+            data = file.read(frame_size * itemsize)
+            if not data:
+                if idle_timeout is not None and time.monotonic() - idle_since > idle_timeout:
+                    break
+                await asyncio.sleep(poll)
+                continue
+
+            idle_since = time.monotonic()
+            data = rest + data
+            usable = len(data) - len(data) % itemsize
+            rest = data[usable:]
+            if usable:
+                frame = np.frombuffer(data[:usable], dtype=dtype)
+                yield position, frame, time.monotonic()
+                position += len(frame)
+
+
+async def open_source(spec, dtype=np.complex64, frame_size=4096, idle_timeout=None):
+    """Источник по строке: tcp:host:port, unix:/path, fifo:/path или путь к файлу
+
+    Путь к FIFO открывается как канал, к обычному файлу - как дописываемый
+    файл (follow_source). Воспроизведение записи - replay_source.
+    """
+    if spec.startswith("tcp:"):
+        host, _, port = spec[4:].rpartition(":")
+        reader, writer = await asyncio.open_connection(host or "localhost", int(port))
+        return reader_source(reader, dtype, frame_size, writer)
+    if spec.startswith("unix:"):
+        reader, writer = await asyncio.open_unix_connection(spec[5:])
+        return reader_source(reader, dtype, frame_size, writer)
+
+    path = spec[5:] if spec.startswith("fifo:") else spec
+    if stat.S_ISFIFO(os.stat(path).st_mode):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        # Открытие FIFO на чтение ждет писателя, поэтому в потоке
+        pipe = await asyncio.to_thread(open, path, "rb", 0)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+        return reader_source(reader, dtype, frame_size)
+    return follow_source(path, dtype, frame_size, idle_timeout=idle_timeout)
+
+
+async def detect_stream(source, detector, queue_size=16, overflow="drop", on_detection=None, stop=None):
+    """Прием кадров source (асинхронный итератор) и обнаружение detector
+
+    on_detection(event) вызывается для каждого события в цикле asyncio,
+    stop (asyncio.Event) завершает прием досрочно. Корреляция считается в
+    потоке, поэтому прием кадров продолжается во время расчета блока.
+    Возвращает статистику: detector.stats() и счетчики кадров очереди.
+    """
+    if overflow not in ("block", "drop"):
+        raise ValueError(f"Invalid overflow policy: {overflow}, expected block or drop")
+
+    queue = asyncio.Queue(maxsize=queue_size)
+    counters = {"frames": 0, "dropped_frames": 0, "dropped_samples": 0, "queue_max": 0}
+
+    def drop_oldest():
+        _, dropped, _ = queue.get_nowait()
+        counters["dropped_frames"] += 1
+        counters["dropped_samples"] += len(dropped)
+
+    async def ingest():
+        try:
+            async for frame in source:
+                counters["frames"] += 1
+                if overflow == "block":
+                    await queue.put(frame)
+                else:
+                    if queue.full():
+                        drop_oldest()
+                    queue.put_nowait(frame)
+                    # Источник без ожидания (файл, запись) не должен занимать цикл целиком
+                    await asyncio.sleep(0)
+                counters["queue_max"] = max(counters["queue_max"], queue.qsize())
+        finally:
+            # Признак конца потока кладется даже в полную очередь
+            if queue.full():
+                drop_oldest()
+            queue.put_nowait(None)
+
+    def process(frames):
+        events = []
+        for start, frame, ingested in frames:
+            events += detector.push(start, frame, ingested)
+        return events
+
+    def emit(events):
+        if on_detection is not None:
+            for event in events:
+                on_detection(event)
+
+    async def wait_stop():
+        # Остановка прерывает и источник, ожидающий данных
+        await stop.wait()
+        producer.cancel()
+
+    producer = asyncio.create_task(ingest())
+    stopper = asyncio.create_task(wait_stop()) if stop is not None else None
+    try:
+        while True:
+            frames = [await queue.get()]
+            # Накопившиеся кадры обрабатываются одним вызовом
+            while not queue.empty():
+                frames.append(queue.get_nowait())
+            if frames[-1] is None:
+                break
+            emit(await asyncio.to_thread(process, frames))
+        if len(frames) > 1:
+            emit(await asyncio.to_thread(process, frames[:-1]))
+        emit(detector.finish())
+
+        # Ошибка источника (обрыв соединения и т.п.) передается вызывающему
+        await asyncio.wait([producer])
+        if not producer.cancelled():
+            producer.result()
+    finally:
+        producer.cancel()
+        if stopper is not None:
+            stopper.cancel()
+
+    return dict(detector.stats(), **counters)
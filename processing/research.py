@@ -0,0 +1,122 @@
+import numpy as np
+
+from .correlator import Correlator
+from .generator import MODULATION_NAMES, NoiseInjector, SignalGenerator, shift_signal_batch
+from .precision import complex_dtype
+from .profiling import tracer
+
+# Квантиль нормального распределения для 95% доверительного интервала
+CONFIDENCE_Z = 1.96
+
+
+def wilson_half_width(counter, n_runs, z=CONFIDENCE_Z):
+    """Полуширина доверительного интервала Уилсона для доли counter / n_runs"""
+    p = counter / n_runs
+    z2 = z * z
+    return z * np.sqrt(p * (1. - p) / n_runs + z2 / (4. * n_runs * n_runs)) / (1. + z2 / n_runs)
+
+
+class ResearchEngine:
+    """Пакетный расчет вероятности обнаружения (DataProcessor::run(num_runs))
+
+    Испытания обрабатываются блоками (n_trials, n_samples): генерация, шум и
+    корреляция выполняются одной операцией на блок. Размер блока подбирается
+    под memory_budget байт; с precision="single" (complex64) в него
+    помещается вдвое больше испытаний.
+    """
+
+    # Размер первой партии испытаний в адаптивном режиме
+    min_batch = 100
+
+    def __init__(self, memory_budget=256 * 1024 ** 2, rng=None, precision="double"):
+        self.memory_budget = memory_budget
+        self.rng = np.random.default_rng(rng)
+        self.noise = NoiseInjector(self.rng)
+        self.dtype = complex_dtype(precision)
+        self.correlator = Correlator(dtype=self.dtype)
+
+    def block_size(self, num_samples, shifted_size, n_runs):
+        """Количество испытаний в блоке, умещающееся в memory_budget"""
+        size_out = num_samples + shifted_size - 1
+        n_fft = Correlator.fft_length(size_out)
+
+        # Сигналы, их центрированные копии, два спектра и модуль корреляции
+        itemsize = self.dtype.itemsize
+        bytes_per_trial = (itemsize * 2 * (num_samples + shifted_size) + itemsize * 2 * n_fft
+                           + itemsize // 2 * size_out)
+        return int(max(1, min(n_runs, self.memory_budget // bytes_per_trial)))
+
+    def count_detections(self, generator, shifted_size, snr1, snr2, n_runs):
+        """Количество испытаний из n_runs, в которых сигнал обнаружен"""
+        num_samples = generator.num_samples
+        block = self.block_size(num_samples, shifted_size, n_runs)
+        counter = 0
+
+        for start in range(0, n_runs, block):
+            n_trials = min(block, n_runs - start)
+
+            with tracer.stage("generate", n_trials=n_trials):
+                # Generate large part
+                first_signal = generator.generate_batch(n_trials)
+
+                # Generate min part со случайным сдвигом в каждом испытании
+                dt = (num_samples - shifted_size) * self.rng.random(n_trials)
+                second_signal = shift_signal_batch(first_signal, shifted_size, dt.astype(np.int64))
+
+            with tracer.stage("noise"):
+                self.noise.add_noise(first_signal, snr1)
+                self.noise.add_noise(second_signal, snr2)
+
+            max_metric_id = self.correlator.correlate_batch(first_signal, second_signal)
+
+            counter += int(np.count_nonzero(np.abs(max_metric_id - dt) < generator.samples_per_bit))
+
+        return counter
+
+    def detection_probability(self, params, signal_type, snr1, snr2, n_runs):
+        """Доля испытаний, в которых максимум корреляции попал в пределы бита от dt"""
+        if n_runs <= 0:
+            raise ValueError(f"Invalid number of runs: {n_runs}")
+
+        generator = SignalGenerator(params, signal_type, self.rng, self.dtype)
+        shifted_size = int(params["sigSize"] / 100. * generator.num_samples)
+
+        return self.count_detections(generator, shifted_size, snr1, snr2, n_runs) / n_runs
+
+    def adaptive_detection_probability(self, params, signal_type, snr1, snr2, tolerance, max_runs):
+        """Вероятность обнаружения с остановкой по точности
+
+        Испытания идут партиями (каждая следующая вдвое больше) до тех пор,
+        пока полуширина 95% доверительного интервала не станет меньше
+        tolerance или не будет достигнуто max_runs испытаний.
+        Возвращает (вероятность, число выполненных испытаний).
+        """
+        if max_runs <= 0:
+            raise ValueError(f"Invalid number of runs: {max_runs}")
+        if tolerance <= 0:
+            raise ValueError(f"Invalid tolerance: {tolerance}")
+
+        generator = SignalGenerator(params, signal_type, self.rng, self.dtype)
+        shifted_size = int(params["sigSize"] / 100. * generator.num_samples)
+
+        counter = 0
+        n_runs = 0
+        batch = self.min_batch
+
+        while n_runs < max_runs:
+            n_trials = min(batch, max_runs - n_runs)
+            counter += self.count_detections(generator, shifted_size, snr1, snr2, n_trials)
+            n_runs += n_trials
+
+            if wilson_half_width(counter, n_runs) < tolerance:
+                break
+
+            batch *= 2
+
+        return counter / n_runs, n_runs
+
+    def run_point(self, params, snr2):
+        """Одна точка исследования для всех типов модуляции, {"AM": p, "PM": p, "FM": p}"""
+        return {name: self.detection_probability(params, signal_type, params["snr_static"],
+                                                 snr2, params["n_runs"])
+                for signal_type, name in MODULATION_NAMES.items()}
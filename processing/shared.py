@@ -0,0 +1,109 @@
+"""Передача массивов из рабочих процессов через multiprocessing.shared_memory
+
+Рабочий процесс копирует результат в новый сегмент (publish) и возвращает
+небольшой описатель {"name", "dtype", "shape"}; принимающая сторона
+оборачивает сегменты в массивы-представления без копирования (SharedArrays)
+или удаляет их, если результат не нужен (discard, discard_result).
+"""
+
+import os
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+
+def publish(array):
+    """Копия array в новом сегменте разделяемой памяти, возвращает описатель
+
+    Трекер ресурсов рабочего процесса удалил бы сегмент при выходе
+    процесса, поэтому регистрация снимается: владельцем становится
+    принимающая сторона. Она регистрирует сегмент в своем трекере при
+    подключении (SharedArrays, discard), а результат, от которого она
+    отказалась, удаляет через discard_result.
+    """
+    array = np.ascontiguousarray(array)
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    try:
+        np.ndarray(array.shape, array.dtype, buffer=segment.buf)[...] = array
+    except BaseException:
+        segment.close()
+        segment.unlink()
+        raise
+
+    descriptor = {"name": segment.name, "dtype": array.dtype.str, "shape": array.shape}
+    segment.close()
+    if os.name == "posix":
+        # В трекере POSIX сегмент записан под именем с ведущим "/"
+        resource_tracker.unregister("/" + segment.name, "shared_memory")
+    return descriptor
+
+
+def discard(descriptors):
+    """Удаление сегментов, которые не будут подключены"""
+    for descriptor in descriptors:
+        try:
+            segment = shared_memory.SharedMemory(name=descriptor["name"])
+        except FileNotFoundError:
+            continue
+        segment.close()
+        segment.unlink()
+
+
+def discard_result(future):
+    """Обратный вызов future.add_done_callback для результата, который уже не будет получен
+
+    Результат - кортеж, первый элемент которого - список описателей (как у
+    pipeline.run_demo_shared).
+    """
+    if not future.cancelled() and future.exception() is None:
+        discard(future.result()[0])
+
+
+class SharedArrays:
+    """Массивы-представления сегментов по описателям publish
+
+    Имена сегментов удаляются сразу после подключения: память освобождается
+    с закрытием последнего отображения и не остается в системе даже при
+    аварийном завершении. release() закрывает отображения; если на массивы
+    еще есть ссылки, закрытие откладывается до следующего release.
+    """
+
+    # Сегменты, отображения которых еще используются
+    _pending = []
+
+    def __init__(self, descriptors):
+        self.segments = []
+        self.arrays = []
+
+        try:
+            for i, descriptor in enumerate(descriptors):
+                segment = shared_memory.SharedMemory(name=descriptor["name"])
+                self.segments.append(segment)
+                segment.unlink()
+                self.arrays.append(np.ndarray(descriptor["shape"], np.dtype(descriptor["dtype"]),
+                                              buffer=segment.buf))
+        except BaseException:
+            discard(descriptors[i + 1:])
+            self.release()
+            raise
+
+    def release(self):
+        """Отказ от массивов и закрытие отображений"""
+        self.arrays = []
+        SharedArrays._pending.extend(self.segments)
+        self.segments = []
+
+        in_use = []
+        for segment in SharedArrays._pending:
+            try:
+                segment.close()
+            except BufferError:
+                in_use.append(segment)
+        SharedArrays._pending[:] = in_use
+
+    def __enter__(self):
+        return self.arrays
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
@@ -0,0 +1,177 @@
+"""Хранилище результатов исследований (SQLite)
+
+Каждая точка исследования записывается с полным набором параметров,
+числом испытаний, временем расчета и зерном ГСЧ. Точки одного запуска
+связаны общим sweep_id, по параметрам построен индекс, поэтому выборка
+вида "все кривые ФМ-2 с sigSize=30 и fd=20" не просматривает всю таблицу.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from .cache import POINT_PARAMS
+
+# Имя файла базы в директории данных
+STORE_FILE = "results.sqlite"
+
+# Параметры точки, по которым можно делать выборку, и их типы
+STORE_PARAMS = dict(POINT_PARAMS, tolerance=float, precision=str, seed=int,
+                    modulation=str, sweep_id=int)
+
+# Другие названия модуляций (как в cpp/Generator.h и подписях GUI)
+MODULATION_ALIASES = {"BPSK": "PM", "MFM": "FM", "АМ": "AM", "ФМ-2": "PM", "МЧМ": "FM"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sweeps (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    source TEXT NOT NULL,
+    params TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS points (
+    id INTEGER PRIMARY KEY,
+    sweep_id INTEGER NOT NULL REFERENCES sweeps (id),
+    modulation TEXT NOT NULL,
+    snr REAL NOT NULL,
+    probability REAL NOT NULL,
+    n_trials INTEGER,
+    elapsed REAL,
+    seed INTEGER,
+    fd REAL,
+    f REAL,
+    n INTEGER,
+    vel REAL,
+    snr_static REAL,
+    n_runs INTEGER,
+    sigSize REAL,
+    tolerance REAL,
+    precision TEXT
+);
+CREATE INDEX IF NOT EXISTS points_params ON points (modulation, sigSize, fd, vel, f, n, snr_static);
+CREATE INDEX IF NOT EXISTS points_sweep ON points (sweep_id, modulation, snr);
+"""
+
+# Параметры, общие для всех точек кривой
+CURVE_PARAMS = [name for name in STORE_PARAMS if name not in ("sweep_id", "modulation")]
+
+
+def normalize_filters(filters):
+    """Приведение условий выборки {параметр: значение} к типам столбцов"""
+    normalized = {}
+    for name, value in filters.items():
+        if name not in STORE_PARAMS:
+            raise ValueError(f"Unknown parameter: {name}, expected one of {', '.join(STORE_PARAMS)}")
+        value = STORE_PARAMS[name](value)
+        if name == "modulation":
+            value = MODULATION_ALIASES.get(value.upper(), value.upper())
+        normalized[name] = value
+    return normalized
+
+
+def parse_filters(text):
+    """Условия выборки из строки "modulation=BPSK sigSize=30 fd=20" """
+    filters = {}
+    for item in text.replace(",", " ").split():
+        name, sep, value = item.partition("=")
+        if not sep or not value:
+            raise ValueError(f"Invalid filter: {item}, expected name=value")
+        filters[name] = value
+    return normalize_filters(filters)
+
+
+class ResultStore:
+    """Точки исследований в базе SQLite
+
+        store = ResultStore("data/results.sqlite")
+        sweep_id = store.start_sweep(params)
+        store.add_point(sweep_id, params, "PM", snr2, {"probability": p, "n_trials": n})
+        curves = store.curves(modulation="BPSK", sigSize=30, fd=20)
+
+    Соединение общее для потоков (запись из рабочего потока GUI, чтение
+    из главного), обращения к нему выполняются под блокировкой.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def start_sweep(self, params, source="process"):
+        """Новый запуск исследования (source - process или external), возвращает sweep_id"""
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO sweeps (created, source, params) VALUES (?, ?, ?)",
+                (time.time(), source, json.dumps(params, sort_keys=True)))
+        return cursor.lastrowid
+
+    def add_point(self, sweep_id, params, mod_name, snr2, result, seed=None):
+        """Запись точки: result - {"probability": p, ["n_trials": n], ["elapsed": с]}"""
+        row = {name: cast(params[name]) for name, cast in POINT_PARAMS.items()}
+        row.update(sweep_id=sweep_id, modulation=mod_name, snr=float(snr2),
+                   probability=float(result["probability"]),
+                   n_trials=result.get("n_trials"), elapsed=result.get("elapsed"),
+                   seed=None if seed is None else int(seed),
+                   tolerance=float(params.get("tolerance", 0.)),
+                   precision=str(params.get("precision", "double")))
+
+        columns = ", ".join(row)
+        placeholders = ", ".join("?" for _ in row)
+        with self.lock, self.connection:
+            self.connection.execute(f"INSERT INTO points ({columns}) VALUES ({placeholders})",
+                                    tuple(row.values()))
+
+    def query(self, **filters):
+        """Точки, удовлетворяющие условиям {параметр: значение}, список словарей
+
+        Упорядочены по sweep_id, модуляции и SNR.
+        """
+        filters = normalize_filters(filters)
+        where = " AND ".join(f"{name} = ?" for name in filters) or "1"
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT * FROM points WHERE {where} ORDER BY sweep_id, modulation, snr",
+                tuple(filters.values())).fetchall()
+        return [dict(row) for row in rows]
+
+    def curves(self, **filters):
+        """Кривые (по запуску и модуляции), удовлетворяющие условиям
+
+        Каждая кривая - {"sweep_id", "modulation", "params", "snr",
+        "probability", "n_trials"}, последние три - массивы по SNR.
+        """
+        curves = []
+        last_key = None
+        for row in self.query(**filters):
+            key = (row["sweep_id"], row["modulation"])
+            if key != last_key:
+                last_key = key
+                curves.append({"sweep_id": row["sweep_id"], "modulation": row["modulation"],
+                               "params": {name: row[name] for name in CURVE_PARAMS},
+                               "snr": [], "probability": [], "n_trials": []})
+            curve = curves[-1]
+            curve["snr"].append(row["snr"])
+            curve["probability"].append(row["probability"])
+            curve["n_trials"].append(row["n_trials"])
+
+        for curve in curves:
+            for field in ("snr", "probability", "n_trials"):
+                curve[field] = np.array(curve[field], dtype=float)
+        return curves
+
+    def sweeps(self):
+        """Все запуски: список {"id", "created", "source", "params"}"""
+        with self.lock:
+            rows = self.connection.execute("SELECT * FROM sweeps ORDER BY id").fetchall()
+        return [dict(row, params=json.loads(row["params"])) for row in rows]
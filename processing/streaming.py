@@ -0,0 +1,186 @@
+"""Потоковый поиск шаблона в длинной записи методом overlap-save
+
+Принимаемый сигнал обрабатывается блоками длины БПФ с перекрытием в
+len(template) - 1 отсчетов, поэтому память не зависит от длины записи:
+источником может быть np.memmap (см. fileio.load_array) или генератор
+кусков произвольной длины.
+
+Метрика - модуль корреляции с центрированным шаблоном, нормированный на
+энергию шаблона и центрированную энергию окна записи под ним (значения в
+[0, 1]). В отличие от Correlator, нормировка локальная и не зависит от
+длины записи, а учитываются только сдвиги, при которых шаблон целиком
+лежит внутри записи.
+"""
+
+import numpy as np
+
+from .correlator import Correlator, PreparedTemplate, fft_backend
+from .profiling import tracer
+
+# Минимальная длина БПФ блока, меньшие блоки упираются в накладные расходы
+MIN_BLOCK_FFT = 1 << 16
+
+
+def iter_chunks(data, chunk_size):
+    """Куски массива (в том числе np.memmap) длиной chunk_size"""
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+def pick_peaks(scores, offset, top_k, min_separation):
+    """До top_k максимумов scores, разнесенных не менее чем на min_separation
+
+    Возвращает список (индекс + offset, значение) по убыванию значения.
+    """
+    scores = scores.copy()
+    peaks = []
+    for _ in range(min(top_k, len(scores))):
+        index = int(np.argmax(scores))
+        if scores[index] < 0:
+            break
+        peaks.append((index + offset, float(scores[index])))
+        scores[max(0, index - min_separation + 1):index + min_separation] = -1.
+    return peaks
+
+
+def merge_peaks(peaks, top_k, min_separation):
+    """Объединение кандидатов: из близких (ближе min_separation) остается больший"""
+    merged = []
+    for index, score in sorted(peaks, key=lambda peak: -peak[1]):
+        if all(abs(index - other) >= min_separation for other, _ in merged):
+            merged.append((index, score))
+            if len(merged) == top_k:
+                break
+    return merged
+
+
+def block_scores(block, n_lags, template, template_norm):
+    """Нормированная метрика первых n_lags сдвигов блока (overlap-save)
+
+    template - PreparedTemplate с длиной БПФ не меньше len(block),
+    template_norm - корень энергии шаблона.
+    """
+    fft = fft_backend()
+    size = template.size
+
+    with tracer.stage("fft", n_fft=template.n_fft):
+        spectrum = fft.fft(block, template.n_fft)
+        spectrum *= template.spectrum
+        corr = np.abs(fft.ifft(spectrum)[:n_lags])
+
+    with tracer.stage("normalize"):
+        # Центрированная энергия окон [k, k + size) по накопленным суммам
+        window = block[:n_lags + size - 1]
+        sums = np.concatenate(([0.], np.cumsum(window, dtype=np.complex128)))
+        powers = np.concatenate(([0.], np.cumsum(window.real ** 2 + window.imag ** 2, dtype=np.float64)))
+        window_sum = sums[size:] - sums[:-size]
+        window_energy = powers[size:] - powers[:-size] - np.abs(window_sum) ** 2 / size
+        window_norm = np.sqrt(np.maximum(window_energy, 0.))
+
+        return corr / np.maximum(window_norm * template_norm, Correlator.min_normalizer)
+
+
+class StreamingCorrelator:
+    """Поиск template в потоке отсчетов с глобальным максимумом и top_k кандидатами
+
+        search = StreamingCorrelator(template)
+        for chunk in source:
+            search.feed(chunk)
+        search.finish()
+        index, score = search.peak
+
+    Кандидаты ближе min_separation отсчетов (по умолчанию длина шаблона)
+    считаются одним совпадением. template может быть PreparedTemplate
+    (тогда длина БПФ берется из него), а с template_cache (TemplateCache)
+    спектр шаблона переиспользуется между поисками. dtype - комплексный тип
+    блоков и БПФ (у PreparedTemplate берется его собственный); энергия окон
+    накапливается в double независимо от dtype.
+    """
+
+    def __init__(self, template, top_k=10, n_fft=None, min_separation=None, template_cache=None,
+                 dtype=np.complex128):
+        if not isinstance(template, PreparedTemplate):
+            template = np.asarray(template, dtype=dtype)
+            if template.ndim != 1 or len(template) == 0:
+                raise ValueError("Template must be a non-empty 1-D array")
+
+            n_fft = n_fft or Correlator.fft_length(max(8 * len(template), MIN_BLOCK_FFT))
+            if template_cache is not None:
+                template = template_cache.get(template, n_fft, dtype=dtype)
+            else:
+                template = PreparedTemplate(template, n_fft, dtype=dtype)
+
+        self.template = template
+        self.dtype = template.dtype
+        self.template_size = template.size
+        self.template_norm = max(float(np.sqrt(template.energy[0])), Correlator.min_normalizer)
+        self.top_k = top_k
+        self.min_separation = min_separation or self.template_size
+        self.n_fft = template.n_fft
+        if self.n_fft < 2 * self.template_size:
+            raise ValueError(f"FFT length {self.n_fft} is too small for template of {self.template_size} samples")
+
+        # Число новых отсчетов (и сдвигов) на блок
+        self.step = self.n_fft - self.template_size + 1
+
+        self.buffer = np.empty(0, dtype=self.dtype)
+        # Индекс первого отсчета буфера в записи
+        self.position = 0
+        self.candidates = []
+
+    @property
+    def peak(self):
+        """Глобальный максимум (индекс сдвига, значение) или None"""
+        return self.candidates[0] if self.candidates else None
+
+    @property
+    def samples_seen(self):
+        return self.position + len(self.buffer)
+
+    def feed(self, chunk):
+        """Добавление очередного куска записи"""
+        chunk = np.asarray(chunk, dtype=self.dtype)
+        self.buffer = np.concatenate((self.buffer, chunk)) if len(self.buffer) else chunk
+
+        while len(self.buffer) >= self.n_fft:
+            self.process_block(self.buffer[:self.n_fft], self.step)
+            # Последние template_size - 1 отсчетов блока - перекрытие со следующим
+            self.buffer = self.buffer[self.step:]
+            self.position += self.step
+
+    def finish(self):
+        """Обработка остатка буфера после последнего куска"""
+        n_lags = len(self.buffer) - self.template_size + 1
+        if n_lags > 0:
+            self.process_block(self.buffer, n_lags)
+        self.position += len(self.buffer)
+        self.buffer = np.empty(0, dtype=self.dtype)
+        return self.candidates
+
+    def process_block(self, block, n_lags):
+        """Метрика для первых n_lags сдвигов блока и обновление кандидатов"""
+        scores = block_scores(block, n_lags, self.template, self.template_norm)
+
+        with tracer.stage("peak"):
+            peaks = pick_peaks(scores, self.position, self.top_k, self.min_separation)
+            self.candidates = merge_peaks(self.candidates + peaks, self.top_k, self.min_separation)
+
+
+def stream_search(source, template, top_k=10, n_fft=None, min_separation=None, progress=None,
+                  template_cache=None, dtype=np.complex128):
+    """Поиск template в source: массив (np.memmap) или итерируемый набор кусков
+
+    progress(done) вызывается после каждого куска с числом прочитанных отсчетов.
+    Возвращает список кандидатов (индекс сдвига, значение) по убыванию значения.
+    """
+    search = StreamingCorrelator(template, top_k, n_fft, min_separation, template_cache, dtype)
+
+    if isinstance(source, np.ndarray):
+        source = iter_chunks(source, search.step)
+
+    for chunk in source:
+        search.feed(chunk)
+        if progress is not None:
+            progress(search.samples_seen)
+
+    return search.finish()
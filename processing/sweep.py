@@ -0,0 +1,202 @@
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from .cache import key_digest, point_key
+from .generator import MODULATION_NAMES
+from .profiling import tracer
+from .research import ResearchEngine
+
+
+class SweepCancelled(Exception):
+    """Исследование прервано через событие cancel"""
+
+
+def snr_grid(snr_min, snr_max, n_points):
+    """Значения SNR для точек исследования (правая граница не включается)"""
+    snr_step = (snr_max - snr_min) / n_points
+    return [snr_min + i * snr_step for i in range(n_points)]
+
+
+def point_seed(key):
+    """Независимый поток ГСЧ точки, определяемый только ее ключом
+
+    Ключ (параметры точки) входит в spawn_key дочерней SeedSequence, поэтому
+    результат точки не зависит от состава и порядка остальных точек сетки.
+    """
+    digest = key_digest(key)
+    spawn_key = tuple(int(digest[i:i + 8], 16) for i in range(0, len(digest), 8))
+    return np.random.SeedSequence(key["seed"], spawn_key=spawn_key)
+
+
+def run_sweep_point(params, signal_type, snr2, seed, trace=False):
+    """Расчет одной точки (модуляция, SNR) в рабочем процессе
+
+    При params["tolerance"] > 0 число испытаний подбирается адаптивно,
+    а n_runs служит верхней границей.
+    Возвращает (модуляция, snr, {"probability": p, "n_trials": n, "elapsed": с}, события).
+    При trace=True события - замеры этапов рабочего процесса, иначе [].
+    """
+    tracer.enabled = trace
+    tracer.reset()
+    start = time.perf_counter()
+
+    engine = ResearchEngine(rng=np.random.default_rng(seed), precision=params.get("precision", "double"))
+    tolerance = params.get("tolerance", 0.)
+
+    if tolerance > 0:
+        probability, n_trials = engine.adaptive_detection_probability(
+            params, signal_type, params["snr_static"], snr2, tolerance, params["n_runs"])
+    else:
+        n_trials = params["n_runs"]
+        probability = engine.detection_probability(params, signal_type, params["snr_static"],
+                                                   snr2, n_trials)
+
+    result = {"probability": probability, "n_trials": n_trials, "elapsed": time.perf_counter() - start}
+    return MODULATION_NAMES[signal_type], snr2, result, tracer.events
+
+
+def record_worker_pid(pids):
+    """Инициализатор процесса пула: PID в очередь pids, чтобы при отмене его можно было завершить"""
+    pids.put(os.getpid())
+
+
+def terminate_workers(pids):
+    """Завершение процессов пула, записавших PID в pids (record_worker_pid)"""
+    while not pids.empty():
+        try:
+            os.kill(pids.get(), signal.SIGTERM)
+        except OSError:
+            pass
+
+
+class SweepScheduler:
+    """Параллельный расчет точек исследования на пуле процессов
+
+    Каждая пара (модуляция, SNR) - отдельная задача со своим независимым
+    потоком случайных чисел (см. point_seed). Результаты индексируются
+    по (модуляция, SNR), поэтому порядок завершения задач не важен.
+    Точки, найденные в cache (ResultCache), повторно не считаются.
+    Если общий tracer включен, замеры рабочих процессов сливаются в него.
+    """
+
+    def __init__(self, max_workers=None, seed=None, cache=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.seed = np.random.SeedSequence().entropy if seed is None else int(seed)
+        self.cache = cache
+
+    # Период проверки события отмены, с
+    cancel_poll = 0.1
+
+    def run(self, params, snr_values, on_result=None, cancel=None):
+        """Расчет всех точек, {(модуляция, snr): {"probability": p, "n_trials": n, "elapsed": с}}
+
+        on_result(mod_name, snr, result, done, total) вызывается по мере
+        готовности точек в потоке, запустившем run. Если установлено событие
+        cancel (threading.Event), ожидающие точки снимаются, рабочие
+        процессы завершаются и run выбрасывает SweepCancelled (готовые
+        точки остаются в кэше).
+        """
+        tasks = [(params, signal_type, snr2) for snr2 in snr_values for signal_type in MODULATION_NAMES]
+
+        on_task = None
+        if on_result is not None:
+            def on_task(index, result, done, total):
+                _, signal_type, snr2 = tasks[index]
+                on_result(MODULATION_NAMES[signal_type], snr2, result, done, total)
+
+        results = self.run_tasks(tasks, on_task, cancel)
+        return {(MODULATION_NAMES[signal_type], snr2): result
+                for (_, signal_type, snr2), result in zip(tasks, results)}
+
+    def run_tasks(self, tasks, on_task=None, cancel=None):
+        """Расчет произвольного набора точек (params, signal_type, snr2)
+
+        Возвращает список результатов в порядке tasks, on_task(index, result,
+        done, total) вызывается по мере готовности. Результаты из кэша
+        помечены "cached": True (elapsed в них - время исходного расчета).
+        Отмена - как в run.
+        """
+        results = [None] * len(tasks)
+        done = 0
+        pending = []
+
+        def add_result(index, result):
+            nonlocal done
+            results[index] = result
+            done += 1
+            if on_task is not None:
+                on_task(index, result, done, len(tasks))
+
+        for index, (params, signal_type, snr2) in enumerate(tasks):
+            key = point_key(params, MODULATION_NAMES[signal_type], snr2, self.seed)
+            result = self.cache.get(key) if self.cache is not None else None
+
+            if result is None:
+                pending.append((index, key))
+            else:
+                add_result(index, dict(result, cached=True))
+
+        if pending:
+            self.execute(tasks, pending, add_result, cancel)
+        return results
+
+    def execute(self, tasks, pending, add_result, cancel):
+        """Расчет точек pending [(индекс в tasks, ключ)] на пуле процессов
+
+        add_result(индекс, результат) вызывается в потоке run_tasks, готовые
+        точки записываются в кэш. Точка расширения для других исполнителей
+        (см. distributed.DistributedScheduler).
+        """
+        context = multiprocessing.get_context()
+        pids = context.SimpleQueue()
+        executor = ProcessPoolExecutor(max_workers=min(self.max_workers, len(pending)), mp_context=context,
+                                       initializer=record_worker_pid, initargs=(pids,))
+        try:
+            futures = {}
+            for index, key in pending:
+                params, signal_type, snr2 = tasks[index]
+                future = executor.submit(run_sweep_point, params, signal_type, snr2, point_seed(key),
+                                         tracer.enabled)
+                futures[future] = (index, key)
+
+            not_done = set(futures)
+            while not_done:
+                if cancel is not None and cancel.is_set():
+                    raise SweepCancelled("Sweep cancelled")
+
+                finished, not_done = wait(not_done, timeout=self.cancel_poll if cancel is not None else None,
+                                          return_when=FIRST_COMPLETED)
+                for future in finished:
+                    _, _, result, events = future.result()
+                    tracer.merge(events)
+
+                    index, key = futures[future]
+                    if self.cache is not None:
+                        self.cache.put(key, result)
+
+                    add_result(index, result)
+
+            executor.shutdown()
+        except BaseException:
+            # Пул не умеет прерывать запущенные задачи, поэтому рабочие
+            # процессы (их PID записал инициализатор) завершаются напрямую
+            # и отмена не ждет их окончания
+            executor.shutdown(wait=False, cancel_futures=True)
+            terminate_workers(pids)
+            raise
+        finally:
+            pids.close()
+
+
+def sweep_curves(results, snr_values, field="probability"):
+    """Кривые {модуляция: массив значений field} в порядке snr_values
+
+    field="n_trials" дает число испытаний, выполненных в каждой точке.
+    """
+    return {mod_name: np.array([results[(mod_name, snr2)][field] for snr2 in snr_values])
+            for mod_name in MODULATION_NAMES.values()}
@@ -0,0 +1,147 @@
+"""Постоянный процесс утилиты data_processing (режим --serve)
+
+Вместо запуска утилиты на каждую точку исследования процесс запускается
+один раз и получает точки через stdin в виде двоичных кадров фиксированной
+длины, результаты возвращаются кадрами в stdout. Процесс сохраняет между
+точками планы БПФ и буферы сигналов, поэтому на точку остается только
+стоимость самих испытаний. Формат кадров (порядок байт little-endian)
+совпадает со структурами RequestFrame и ResponseHeader в cpp/main.cpp.
+"""
+
+import os
+import select
+import struct
+import subprocess
+import threading
+
+from .jobs import JobCancelled, JobTimeout
+
+# Запрос точки: magic, n_runs, fd, f, vel, snr1, snr2, sigSize, n, резерв
+REQUEST = struct.Struct("<IIddddddII")
+REQUEST_MAGIC = 0x51525044  # "DPRQ"
+
+# Заголовок ответа: magic, статус (0 - успех), длина данных; данные -
+# три вероятности (AM, PM, FM) или текст ошибки
+RESPONSE = struct.Struct("<III")
+RESPONSE_MAGIC = 0x53525044  # "DPRS"
+PROBABILITIES = struct.Struct("<3d")
+
+# Порядок вероятностей в ответе
+RESPONSE_MODULATIONS = ("AM", "PM", "FM")
+
+# Ожидание кадра готовности после запуска, с
+START_TIMEOUT = 10
+
+
+class ServeUnsupported(OSError):
+    """Утилита не поддерживает режим --serve (старая сборка)"""
+
+
+def pack_request(params, snr2):
+    """Кадр запроса точки исследования (snr1 - статическое SNR)"""
+    return REQUEST.pack(REQUEST_MAGIC, int(params["n_runs"]), float(params["fd"]), float(params["f"]),
+                        float(params["vel"]), float(params["snr_static"]), float(snr2),
+                        float(params["sigSize"]), int(params["n"]), 0)
+
+
+class UtilityWorker:
+    """Процесс data_processing --serve, считающий точки по одной
+
+        worker = UtilityWorker("build/data_processing", "build")
+        worker.run_point(params, snr2)  # {"AM": p, "PM": p, "FM": p}
+        worker.close()
+
+    Строки stderr передаются в on_output("stderr", line). kill() из другого
+    потока прерывает ожидающий run_point (JobCancelled).
+    """
+
+    def __init__(self, app_path, cwd, on_output=None):
+        self.on_output = on_output
+        self.killed = False
+        self.process = subprocess.Popen([app_path, "--serve"], cwd=cwd, stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+        self.stderr_lines = []
+        self.stderr_thread = threading.Thread(target=self._read_stderr, daemon=True)
+        self.stderr_thread.start()
+
+        try:
+            self._read_response(START_TIMEOUT)
+        except (OSError, JobTimeout, JobCancelled):
+            self.kill()
+            self.stderr_thread.join(timeout=1)
+            raise ServeUnsupported(f"{app_path} does not support --serve: {self.output.strip()}")
+
+    @property
+    def output(self):
+        return "".join(self.stderr_lines)
+
+    @property
+    def alive(self):
+        return not self.killed and self.process.poll() is None
+
+    def _read_stderr(self):
+        for line in iter(self.process.stderr.readline, b""):
+            line = line.decode("utf-8", errors="replace")
+            self.stderr_lines.append(line)
+            if self.on_output is not None:
+                self.on_output("stderr", line.rstrip())
+
+    def _read_exact(self, size, timeout):
+        fd = self.process.stdout.fileno()
+        chunks = []
+        while size:
+            ready, _, _ = select.select([fd], [], [], timeout)
+            if not ready:
+                self.kill()
+                raise JobTimeout(f"No response in {timeout} s")
+            chunk = os.read(fd, size)
+            if not chunk:
+                if self.killed:
+                    raise JobCancelled("Utility process killed")
+                self.process.wait()
+                raise BrokenPipeError(f"Utility exited with code {self.process.returncode}")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def _read_response(self, timeout):
+        magic, status, size = RESPONSE.unpack(self._read_exact(RESPONSE.size, timeout))
+        if magic != RESPONSE_MAGIC:
+            self.kill()
+            raise BrokenPipeError("Invalid response frame")
+        return status, self._read_exact(size, timeout) if size else b""
+
+    def run_point(self, params, snr2, timeout=None):
+        """Вероятности обнаружения точки {модуляция: p}
+
+        Ошибка параметров в утилите выбрасывается как ValueError, при
+        превышении timeout процесс завершается (JobTimeout).
+        """
+        try:
+            self.process.stdin.write(pack_request(params, snr2))
+        except OSError:
+            if self.killed:
+                raise JobCancelled("Utility process killed")
+            raise
+
+        status, payload = self._read_response(timeout)
+        if status != 0:
+            raise ValueError(payload.decode("utf-8", errors="replace"))
+        return dict(zip(RESPONSE_MODULATIONS, PROBABILITIES.unpack(payload)))
+
+    def kill(self):
+        """Немедленное завершение процесса"""
+        self.killed = True
+        if self.process.poll() is None:
+            self.process.kill()
+
+    def close(self):
+        """Завершение процесса: закрытие stdin, после ожидания - kill"""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+            self.process.wait()
+        self.process.stdout.close()
+        self.stderr_thread.join(timeout=1)